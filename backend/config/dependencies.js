@@ -44,7 +44,7 @@ function configureDependencies() {
   const userDAO = new UserDataAccessSQL();
   const mlDAO = new MLDataAccessHTTP(process.env.ML_API_URL || 'http://localhost:5002');
 
-  // CSV updater: used to append new game rows and trigger ML inference
+  // CSV updater: keeps the ML history CSV up to date with new game rows
   const MLCsvUpdater = require('../frameworks-drivers/data/implementations/mlCsvUpdater');
   const mlCsvUpdater = new MLCsvUpdater({
     localCsvPath: process.env.LOCAL_ML_CSV_PATH || require('path').resolve(__dirname, '../ml_injury/final_dataset/yankees.csv'),
@@ -65,7 +65,9 @@ function configureDependencies() {
   const mlPresenter = new MLPresenter(mlViewModel);
 
   // Use Cases
-  const addGameRecordUseCase = new AddGameRecordUseCase(gameDAO, gamePresenter, mlCsvUpdater, playerDAO);
+  const addGameRecordUseCase = new AddGameRecordUseCase(gameDAO, gamePresenter, mlCsvUpdater, playerDAO, mlDAO, {
+    historyPath: process.env.ML_HISTORY_PATH || '/app/backend/ml_injury/final_dataset/yankees.csv'
+  });
   const getPlayerGamesUseCase = new GetPlayerGamesUseCase(gameDAO, gamePresenter);
   const updateGameRecordUseCase = new UpdateGameRecordUseCase(gameDAO, gamePresenter);
   const deleteGameRecordUseCase = new DeleteGameRecordUseCase(gameDAO, gamePresenter);
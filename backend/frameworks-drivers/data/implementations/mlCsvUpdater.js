@@ -1,4 +1,4 @@
-const fs = require('fs');
+const fs = require('fs/promises');
 const path = require('path');
 const axios = require('axios');
 
@@ -9,16 +9,35 @@ class MLCsvUpdater {
     // Path to provide to ML service (container path); allow override via env
     this.mlCsvPath = options.mlCsvPath || process.env.ML_CSV_PATH_FOR_ML || '/app/final_dataset/yankees.csv';
     this.mlApiUrl = options.mlApiUrl || process.env.ML_API_URL || 'http://localhost:5002';
+    // Appends wait for the previous one, so their read-modify-writes can't interleave
+    this.appendQueue = Promise.resolve();
   }
 
   async appendRecordAndRun(savedRecord, { topKRatio = 0.10, startDate = '2024-04-01' } = {}) {
-    // Ensure CSV exists
-    if (!fs.existsSync(this.localCsvPath)) {
-      throw new Error(`CSV not found at local path: ${this.localCsvPath}`);
-    }
+    await this.appendRecord(savedRecord);
+    return this.runPredictions({ topKRatio, startDate });
+  }
 
+  // Insert the game as a CSV row after the player's last game, so later scoring sees it as history.
+  // The file is read and written with fs.promises, so the event loop isn't blocked on disk, and
+  // appends are queued one after another.
+  appendRecord(savedRecord) {
+    const append = this.appendQueue.then(() => this.insertRecord(savedRecord));
+    this.appendQueue = append.catch(() => {});
+    return append;
+  }
+
+  async insertRecord(savedRecord) {
     // Read CSV header and existing lines
-    const raw = fs.readFileSync(this.localCsvPath, 'utf8');
+    let raw;
+    try {
+      raw = await fs.readFile(this.localCsvPath, 'utf8');
+    } catch (err) {
+      if (err.code === 'ENOENT') {
+        throw new Error(`CSV not found at local path: ${this.localCsvPath}`);
+      }
+      throw err;
+    }
     const lines = raw.split(/\r?\n/);
     const header = lines[0];
     const columns = header.split(',').map(c => c.trim());
@@ -163,12 +182,29 @@ class MLCsvUpdater {
     if (lastRowIndex >= 0) {
       // Insert after the last row of this player
       lines.splice(lastRowIndex + 1, 0, line);
-      fs.writeFileSync(this.localCsvPath, lines.join('\n'), 'utf8');
+      await fs.writeFile(this.localCsvPath, lines.join('\n'), 'utf8');
     } else {
       // Player not found; append to end
-      fs.appendFileSync(this.localCsvPath, '\n' + line, 'utf8');
+      await fs.appendFile(this.localCsvPath, '\n' + line, 'utf8');
     }
+    return line;
+  }
+
+  // Map a saved game record to a row for the ML /score endpoint (game-level column names)
+  toScoreRow(savedRecord) {
+    const value = v => (v === undefined || v === '' ? null : v);
+    return {
+      player_name: this.formatPlayerName((savedRecord.player_name || '').trim()),
+      game_date: this.formatDate(savedRecord.game_date) || new Date().toISOString().split('T')[0],
+      total_pitches: value(savedRecord.total_pitches),
+      release_speed_mean_all: value(savedRecord.release_speed),
+      release_spin_rate_mean_all: value(savedRecord.spin_rate),
+      release_pos_x_mean_all: value(savedRecord.release_pos_x),
+      release_pos_y_mean_all: value(savedRecord.release_pos_y)
+    };
+  }
 
+  async runPredictions({ topKRatio = 0.10, startDate = '2024-04-01' } = {}) {
     // Trigger ML service to re-run predictions. Try multiple candidate paths to account for Docker mounts.
     const candidates = [];
     if (this.mlCsvPath) candidates.push(this.mlCsvPath);
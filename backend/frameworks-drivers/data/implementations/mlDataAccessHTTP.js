@@ -28,6 +28,29 @@ class MLDataAccessHTTP {
     }
   }
 
+  // Score game rows sent in the request body (no CSV write/read on either side).
+  // historyPath is the dataset on the ML container that supplies each player's previous games.
+  async scoreGameRows(rows, { historyPath, topKRatio = 0.10 } = {}) {
+    try {
+      const response = await axios.post(`${this.baseURL}/score`, {
+        rows,
+        history_path: historyPath,
+        top_k_ratio: topKRatio
+      });
+
+      if (response.data.success) {
+        return response.data.data;
+      } else {
+        throw new Error(response.data.error || 'ML scoring failed');
+      }
+    } catch (error) {
+      if (error.response) {
+        throw new Error(`ML Service Error: ${error.response.data.error || error.message}`);
+      }
+      throw new Error(`ML Service Error: ${error.message}`);
+    }
+  }
+
   async healthCheck() {
     try {
       const response = await axios.get(`${this.baseURL}/health`);
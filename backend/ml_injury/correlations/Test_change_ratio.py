@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from change_ratio import change_ratios, correlate_with_label
+
+
+def _past_ratio(window):
+    # The original rolling(W).apply callback
+    def ratio(x):
+        if len(x) < window or np.isnan(x).any():
+            return np.nan
+        s = x.sum()
+        if s == 0:
+            return np.nan
+        return np.diff(x).sum() / s
+    return ratio
+
+
+def _frame(seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "player_name": np.repeat(["A", "B", "C", "D"], [12, 3, 20, 9]),
+        "game_date": pd.Timestamp("2024-04-01") + pd.to_timedelta(np.tile(np.arange(20), 4)[:44], unit="D"),
+        "speed": rng.normal(94, 2, 44),
+        "spin": rng.normal(2300, 80, 44),
+        "pct_SL": rng.choice([0.0, 0.0, 0.2], 44),
+    })
+    df.loc[rng.random(44) < 0.1, "speed"] = np.nan
+    df["results"] = (rng.random(44) < 0.3).astype(float)
+    return df
+
+
+def test_change_ratios_match_rolling_apply():
+    df = _frame()
+    cols = ["speed", "spin", "pct_SL"]
+    actual = change_ratios(df, cols, windows=[3, 5])
+    g = df.groupby("player_name", sort=False)
+    for w in [3, 5]:
+        for col in cols:
+            expected = g[col].rolling(w).apply(_past_ratio(w), raw=True).reset_index(level=0, drop=True)
+            np.testing.assert_allclose(actual[f"{col}_{w}g_ratio"], expected, rtol=1e-12, equal_nan=True,
+                                       err_msg=f"{col} W={w}")
+
+
+def test_correlations_match_corrwith():
+    df = _frame(1)
+    ratios = change_ratios(df, ["speed", "spin", "pct_SL"], windows=[3])
+    expected = ratios.corrwith(df["results"])
+    np.testing.assert_allclose(correlate_with_label(ratios, df["results"]), expected, rtol=1e-12, equal_nan=True)
@@ -0,0 +1,128 @@
+# Vectorized W-game change ratios and their correlation with the injury label.
+# For a window x1..xW of one player and one feature, sum(diff(x)) telescopes to xW - x1,
+# so the ratio (xW - x1) / sum(x) needs only two shifted reads and a window sum per row.
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+EXCLUDE = {"pitcher", "results", "result"}
+
+
+def load_frame(path):
+    """Game-level data from CSV, Parquet (file or directory) or Excel."""
+    path = Path(path)
+    if path.is_dir() or path.suffix in (".parquet", ".pq"):
+        df = pd.read_parquet(path)
+    elif path.suffix in (".xlsx", ".xls"):
+        df = pd.read_excel(path)
+    else:
+        df = pd.read_csv(path)
+    df["game_date"] = pd.to_datetime(df["game_date"])
+    return df
+
+
+def feature_columns(df, label, exclude=EXCLUDE):
+    num_cols = df.select_dtypes(include=[np.number]).columns
+    return [c for c in num_cols if c not in exclude and c != label]
+
+
+def change_ratios(df, feat_cols, windows=(5,)):
+    """
+    (last - first) / window sum over each player's trailing W games, for every feature and
+    window at once. NaN when the window is incomplete, contains a NaN or sums to 0, like
+    rolling(W).apply(past_ratio) did. df must be sorted by player_name, game_date.
+    """
+    values = df[feat_cols].to_numpy(dtype=np.float64)
+    n = len(values)
+    keys = df["player_name"].to_numpy()
+    new_group = np.ones(n, dtype=bool)
+    new_group[1:] = keys[1:] != keys[:-1]
+    starts = np.flatnonzero(new_group)
+    pos = np.arange(n) - np.repeat(starts, np.diff(np.append(starts, n)))
+
+    def shifted(k):
+        out = np.full_like(values, np.nan)
+        if k < n:
+            out[k:] = values[:n - k]
+        return out
+
+    # Window sums grow one shifted array at a time, so each window reuses the previous one's sum.
+    # A NaN anywhere in the window propagates into the sum, and exact zero sums stay exact.
+    ratios = {}
+    window_sum = values.copy()
+    width = 1
+    for w in sorted(set(windows)):
+        while width < w:
+            window_sum += shifted(width)
+            width += 1
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ratio = (values - shifted(w - 1)) / window_sum
+        ratio[(window_sum == 0) | (pos < w - 1)[:, None]] = np.nan
+        for j, col in enumerate(feat_cols):
+            ratios[f"{col}_{w}g_ratio"] = ratio[:, j]
+    return pd.DataFrame(ratios, index=df.index)
+
+
+def correlate_with_label(features, label):
+    """Pearson correlation of every column with label over pairwise-complete rows, as one matrix pass."""
+    X = features.to_numpy(dtype=np.float64)
+    y = np.asarray(label, dtype=np.float64)[:, None]
+    mask = ~np.isnan(X) & ~np.isnan(y)
+    count = mask.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_mean = np.where(mask, X, 0.0).sum(axis=0) / count
+        y_mean = np.where(mask, y, 0.0).sum(axis=0) / count
+        dx = np.where(mask, X - x_mean, 0.0)
+        dy = np.where(mask, y - y_mean, 0.0)
+        corr = (dx * dy).sum(axis=0) / np.sqrt((dx * dx).sum(axis=0) * (dy * dy).sum(axis=0))
+    corr[count < 2] = np.nan
+    return pd.Series(corr, index=features.columns)
+
+
+def run_analysis(df, windows=(5,), label="results", top=20):
+    """Returns (all correlations, top-N table sorted by absolute correlation)."""
+    df = df.sort_values(["player_name", "game_date"], kind="mergesort").reset_index(drop=True)
+    ratios = change_ratios(df, feature_columns(df, label), windows)
+    corr = correlate_with_label(ratios, df[label])
+    top_corr = corr.loc[corr.abs().sort_values(ascending=False).head(top).index]
+    out = pd.DataFrame({
+        "feature": top_corr.index,
+        "corr": top_corr.values,
+        "abs_corr": top_corr.abs().values,
+    }).sort_values("abs_corr", ascending=False).reset_index(drop=True)
+    return corr, out
+
+
+def add_analysis_args(parser):
+    parser.add_argument("--path", required=True, help="game-level CSV, Parquet or Excel file")
+    parser.add_argument("--windows", type=int, nargs="+", default=[5])
+    parser.add_argument("--label", default=None, help="injury label column (default: results, else result)")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--out_dir", default=".")
+
+
+def analyze_from_args(args):
+    df = load_frame(args.path)
+    label = args.label or ("results" if "results" in df.columns else "result")
+    corr, out = run_analysis(df, args.windows, label, args.top)
+    windows = ", ".join(str(w) for w in args.windows)
+    print(f"\nTop {args.top} features correlated with injury ({windows}-game change ratio):\n")
+    print(out.to_string(index=False))
+
+    out_dir = Path(args.out_dir)
+    top_path = out_dir / f"injury_correlations_top{args.top}.csv"
+    out.to_csv(top_path, index=False)
+    corr.rename("corr").to_csv(out_dir / "injury_correlations_all.csv")
+    return top_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Correlate W-game change ratios with the injury label")
+    add_analysis_args(parser)
+    analyze_from_args(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from game_aggregation import aggregate_game_level, CORE_FEATS
+
+
+def _reference_aggregate(df, core_feats):
+    # The original per-game loop from aggregate_Dataset.py
+    df = df.dropna(subset=["player_name", "game_date", "pitch_type"])
+    records = []
+    for (player, date), sub in df.groupby(["player_name", "game_date"]):
+        row = {"player_name": player, "game_date": date, "total_pitches": len(sub)}
+        for f in core_feats:
+            row[f"{f}_mean_all"] = sub[f].mean()
+            row[f"{f}_std_all"] = sub[f].std()
+            row[f"{f}_range_all"] = sub[f].max() - sub[f].min()
+        pitch_counts = sub["pitch_type"].value_counts(normalize=True)
+        for pitch in pitch_counts.index:
+            row[f"pct_{pitch}"] = pitch_counts[pitch]
+            sub_pitch = sub[sub["pitch_type"] == pitch]
+            for f in core_feats:
+                row[f"{pitch}_{f}_mean"] = sub_pitch[f].mean()
+                row[f"{pitch}_{f}_std"] = sub_pitch[f].std()
+        records.append(row)
+    agg_df = pd.DataFrame(records)
+    return agg_df.sort_values(["player_name", "game_date"]).reset_index(drop=True)
+
+
+def _sample_pitches(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "player_name": rng.choice(["Cole, Gerrit", "Rodon, Carlos", "Gil, Luis"], n),
+        "game_date": pd.Timestamp("2024-04-01") + pd.to_timedelta(rng.integers(0, 20, n), unit="D"),
+        "pitch_type": rng.choice(["FF", "SL", "CH", "CU", "KC"], n, p=[0.5, 0.25, 0.15, 0.09, 0.01]),
+    })
+    for f in CORE_FEATS:
+        df[f] = rng.normal(0, 1, n)
+    df.loc[rng.random(n) < 0.05, "release_spin_rate"] = np.nan
+    df.loc[rng.random(n) < 0.01, "pitch_type"] = None
+    return df
+
+
+def test_matches_per_game_loop_column_for_column():
+    df = _sample_pitches()
+    expected = _reference_aggregate(df, CORE_FEATS)
+    actual = aggregate_game_level(df)
+
+    assert list(actual.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, rtol=1e-10)
+
+
+def test_missing_features_are_skipped():
+    df = _sample_pitches(200).drop(columns=["spin_axis", "delta_run_exp"])
+    actual = aggregate_game_level(df)
+
+    assert "spin_axis_mean_all" not in actual.columns
+    assert "FF_release_speed_std" in actual.columns
+
+
+def test_pitch_type_blocks_keep_first_appearance_order():
+    # The first game only throws sliders, so SL's block comes before the (more common) FF's
+    df = _sample_pitches(600, seed=1)
+    first_game = (df["player_name"] == "Cole, Gerrit") & (df["game_date"] == df["game_date"].min())
+    df.loc[first_game & df["pitch_type"].notna(), "pitch_type"] = "SL"
+    expected = _reference_aggregate(df, CORE_FEATS)
+    actual = aggregate_game_level(df)
+
+    assert [c for c in actual.columns if c.startswith("pct_")][:2] == ["pct_SL", "pct_FF"]
+    assert list(actual.columns) == list(expected.columns)
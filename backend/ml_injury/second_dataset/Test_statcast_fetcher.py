@@ -0,0 +1,144 @@
+import pandas as pd
+
+from statcast_fetcher import fetch_statcast, resolve_player_ids, TokenBucket
+
+
+class FakeStatcast:
+    """Local stand-in for statcast_pitcher: a few pitches per (pitcher, season), optional failures."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.calls = []
+
+    def __call__(self, pid, start_dt, end_dt):
+        season = int(start_dt[:4])
+        self.calls.append((pid, season))
+        if (pid, season) in self.fail:
+            raise ConnectionError("rate limited")
+        if pid == 3:
+            return pd.DataFrame()
+        return pd.DataFrame({
+            "game_date": [f"{season}-04-0{i}" for i in range(1, 4)],
+            "pitch_type": ["FF", "SL", "FF"],
+            "release_speed": [95.0 + pid, 86.0, 94.5],
+        })
+
+
+def test_fetches_all_pieces_and_streams_outputs(tmp_path):
+    ids = {"Cole, Gerrit": 1, "Rodon, Carlos": 2, "Nobody, Found": None}
+    fake = FakeStatcast()
+
+    report = fetch_statcast(ids, [2023, 2024], out_dir=tmp_path, cache_dir=tmp_path / "cache",
+                            fetcher=fake, workers=3, rate=1000, retries=0)
+
+    assert report == {"fetched": 4, "cached": 0, "failed": {}}
+    merged = pd.read_csv(tmp_path / "statcast_pitcher_game_features_2023_2024.csv")
+    assert len(merged) == 12
+    assert set(merged["player_name"]) == {"Cole, Gerrit", "Rodon, Carlos"}
+    assert len(pd.read_csv(tmp_path / "statcast_pitcher_game_features_2024.csv")) == 6
+
+
+def test_rerun_only_fetches_missing_pieces(tmp_path):
+    ids = {"Cole, Gerrit": 1, "Rodon, Carlos": 2, "Empty, Season": 3}
+    first = FakeStatcast(fail={(2, 2024)})
+    report = fetch_statcast(ids, [2023, 2024], out_dir=tmp_path, cache_dir=tmp_path / "cache",
+                            fetcher=first, workers=2, rate=1000, retries=0)
+    assert list(report["failed"]) == ["2:2024"]
+
+    second = FakeStatcast()
+    report = fetch_statcast(ids, [2023, 2024], out_dir=tmp_path, cache_dir=tmp_path / "cache",
+                            fetcher=second, workers=2, rate=1000, retries=0)
+
+    assert second.calls == [(2, 2024)]
+    assert report == {"fetched": 1, "cached": 5, "failed": {}}
+    assert len(pd.read_csv(tmp_path / "statcast_pitcher_game_features_2023_2024.csv")) == 12
+
+
+def test_retries_transient_failures(tmp_path):
+    class Flaky(FakeStatcast):
+        def __call__(self, pid, start_dt, end_dt):
+            if not self.calls:
+                self.calls.append(None)
+                raise ConnectionError("temporary")
+            return super().__call__(pid, start_dt, end_dt)
+
+    report = fetch_statcast({"Cole, Gerrit": 1}, [2024], out_dir=tmp_path, cache_dir=tmp_path / "cache",
+                            fetcher=Flaky(), workers=1, rate=1000, retries=1, backoff=0)
+    assert report["fetched"] == 1
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+    import time
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_later_columns_are_kept_and_output_is_ordered(tmp_path):
+    class Varying(FakeStatcast):
+        def __call__(self, pid, start_dt, end_dt):
+            data = super().__call__(pid, start_dt, end_dt).iloc[::-1]
+            # Only one pitcher's pieces carry this column
+            return data.assign(spin_axis=200.0) if pid == 1 else data
+
+    ids = {"Rodon, Carlos": 2, "Cole, Gerrit": 1}
+    fetch_statcast(ids, [2023, 2024], out_dir=tmp_path, cache_dir=tmp_path / "cache",
+                   fetcher=Varying(), workers=2, rate=1000, retries=0)
+
+    merged = pd.read_csv(tmp_path / "statcast_pitcher_game_features_2023_2024.csv")
+    assert merged["spin_axis"].notna().sum() == 6
+    assert list(merged["player_name"]) == ["Cole, Gerrit"] * 6 + ["Rodon, Carlos"] * 6
+    assert merged.groupby("player_name")["game_date"].apply(lambda d: d.is_monotonic_increasing).all()
+
+
+def test_resolves_exact_names_from_register_and_looks_up_the_rest(tmp_path, monkeypatch):
+    import sys
+    import types
+    register = pd.DataFrame({
+        "name_last": ["Cole", "Cole"], "name_first": ["Gerrit", "Gerrit"],
+        "key_mlbam": [543037, 111], "mlb_played_last": [2024, 1990],
+    })
+    looked_up = []
+
+    def playerid_lookup(last, first):
+        looked_up.append((last, first))
+        return pd.DataFrame({"key_mlbam": [605400]})
+
+    fake = types.SimpleNamespace(chadwick_register=lambda: register, playerid_lookup=playerid_lookup)
+    monkeypatch.setitem(sys.modules, "pybaseball", fake)
+
+    ids = resolve_player_ids(["cole, gerrit", "Nola, Aaron", "no comma"], cache_path=tmp_path / "ids.json")
+    assert ids == {"cole, gerrit": 543037, "Nola, Aaron": 605400, "no comma": None}
+    assert looked_up == [("Nola", "Aaron")]
+
+
+def test_failed_lookups_are_not_cached(tmp_path, monkeypatch):
+    import json
+    import sys
+    import types
+    register = pd.DataFrame({"name_last": ["Cole"], "name_first": ["Gerrit"],
+                             "key_mlbam": [543037], "mlb_played_last": [2024]})
+    responses = [ConnectionError("timed out"), pd.DataFrame({"key_mlbam": [605400]})]
+    looked_up = []
+
+    def playerid_lookup(last, first):
+        looked_up.append((last, first))
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    fake = types.SimpleNamespace(chadwick_register=lambda: register, playerid_lookup=playerid_lookup)
+    monkeypatch.setitem(sys.modules, "pybaseball", fake)
+    cache_path = tmp_path / "ids.json"
+
+    names = ["Cole, Gerrit", "Nola, Aaron"]
+    assert resolve_player_ids(names, cache_path) == {"Cole, Gerrit": 543037, "Nola, Aaron": None}
+    assert json.loads(cache_path.read_text()) == {"Cole, Gerrit": 543037}
+
+    assert resolve_player_ids(names, cache_path) == {"Cole, Gerrit": 543037, "Nola, Aaron": 605400}
+    assert looked_up == [("Nola", "Aaron")] * 2
+    assert resolve_player_ids(names, cache_path)["Nola, Aaron"] == 605400
+    assert len(looked_up) == 2
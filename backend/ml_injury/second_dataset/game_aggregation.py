@@ -0,0 +1,90 @@
+# Columnar game-level aggregation of pitch-level Statcast data.
+# Produces the same columns as the original per-game loop in aggregate_Dataset.py,
+# but with two grouped reductions (player/date and player/date/pitch_type) and a pivot.
+import argparse
+import numpy as np
+import pandas as pd
+
+KEYS = ["player_name", "game_date"]
+
+# Features of interest
+CORE_FEATS = [
+    "release_speed",
+    "release_spin_rate",
+    "release_extension",
+    "release_pos_x",
+    "release_pos_y",
+    "release_pos_z",
+    "pfx_x",
+    "pfx_z",
+    "spin_axis",
+    "delta_run_exp",
+]
+
+
+def aggregate_game_level(df, core_feats=CORE_FEATS):
+    df = df.dropna(subset=KEYS + ["pitch_type"])
+    core_feats = [c for c in core_feats if c in df.columns]
+
+    # Overall mechanical consistency (all pitches)
+    by_game = df.groupby(KEYS, sort=True)
+    total = by_game.size().rename("total_pitches")
+    overall = by_game[core_feats].agg(["mean", "std", "max", "min"])
+    game_cols = {"total_pitches": total}
+    for f in core_feats:
+        game_cols[f"{f}_mean_all"] = overall[(f, "mean")]
+        game_cols[f"{f}_std_all"] = overall[(f, "std")]
+        game_cols[f"{f}_range_all"] = overall[(f, "max")] - overall[(f, "min")]
+    game_df = pd.DataFrame(game_cols)
+
+    # Pitch-type mix and per-type mechanics, pivoted to one column per (type, feature, stat)
+    by_type = df.groupby(KEYS + ["pitch_type"], sort=True)
+    type_counts = by_type.size()
+    pct = type_counts.unstack("pitch_type").div(total, axis=0)
+    type_stats = by_type[core_feats].agg(["mean", "std"]).unstack("pitch_type")
+
+    # Pitch-type blocks in the order the original per-game loop created them: by the first
+    # game (in player/date order) a type appears in, then by its count in that game, ties by
+    # the type's first pitch (value_counts order)
+    first_pitch = df.assign(_row=np.arange(len(df))).groupby(KEYS + ["pitch_type"], sort=True)["_row"].min()
+    appearance = pd.DataFrame({
+        "game": type_counts.index.droplevel("pitch_type").factorize()[0],
+        "count": type_counts.to_numpy(),
+        "first_pitch": first_pitch.to_numpy(),
+    }, index=type_counts.index)
+    appearance = appearance.sort_values(["game", "count", "first_pitch"], ascending=[True, False, True])
+    pitch_order = appearance.index.get_level_values("pitch_type").unique()
+    type_cols = {}
+    for pitch in pitch_order:
+        type_cols[f"pct_{pitch}"] = pct[pitch]
+        for f in core_feats:
+            type_cols[f"{pitch}_{f}_mean"] = type_stats[(f, "mean", pitch)]
+            type_cols[f"{pitch}_{f}_std"] = type_stats[(f, "std", pitch)]
+    type_df = pd.DataFrame(type_cols, index=pct.index)
+
+    agg_df = pd.concat([game_df, type_df.reindex(game_df.index)], axis=1)
+    return agg_df.reset_index()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--in_path", default="statcast_pitcher_game_features_2021_2024.csv")
+    parser.add_argument("--out_path", default="statcast_pitcher_game_aggregated_smart_2021_2024.csv")
+    args = parser.parse_args()
+
+    wanted = set(KEYS + ["pitch_type"] + CORE_FEATS)
+    df = pd.read_csv(args.in_path, usecols=lambda c: c in wanted)
+    df["game_date"] = pd.to_datetime(df["game_date"])
+    print(f"Aggregating over features: {[c for c in CORE_FEATS if c in df.columns]}")
+
+    agg_df = aggregate_game_level(df)
+    if args.out_path.endswith(".parquet"):
+        # Columnar copy for the training pipeline (see training_pipeline/dataset_store.py)
+        agg_df.to_parquet(args.out_path, index=False)
+    else:
+        agg_df.to_csv(args.out_path, index=False)
+    print(f"✅ Saved {len(agg_df)} game-level rows with {agg_df.shape[1]} columns.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+# Concurrent, resumable Statcast download.
+# Every (pitcher, season) piece is fetched by a bounded worker pool behind a shared
+# token-bucket rate limit and cached on disk as soon as it arrives, so reruns only fetch
+# what is still missing. The season / merged output files are then streamed from the
+# cache one piece at a time.
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+
+class TokenBucket:
+    """Thread-safe token bucket: on average `rate` acquisitions per second, bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class StatcastCache:
+    """One CSV per (pitcher, season) under cache_dir/<season>/; empty pieces get a marker file."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, pid, season, suffix='csv'):
+        return self.cache_dir / str(season) / f"{pid}.{suffix}"
+
+    def has(self, pid, season):
+        return self._path(pid, season).exists() or self._path(pid, season, 'empty').exists()
+
+    def load(self, pid, season):
+        path = self._path(pid, season)
+        if not path.exists():
+            return pd.DataFrame()
+        return pd.read_csv(path, low_memory=False)
+
+    def save(self, pid, season, data):
+        path = self._path(pid, season)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if data.empty:
+            self._path(pid, season, 'empty').touch()
+            return
+        # Write then rename so an interrupted run never leaves a truncated piece behind
+        tmp = path.with_suffix('.tmp')
+        data.to_csv(tmp, index=False)
+        os.replace(tmp, path)
+
+
+class ChunkWriter:
+    """Appends DataFrame chunks to one CSV laid out as `columns` (missing ones are left empty)."""
+
+    def __init__(self, path, columns):
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.rows = 0
+
+    def write(self, chunk):
+        if chunk.empty:
+            return
+        unknown = [c for c in chunk.columns if c not in self.columns]
+        if unknown:
+            raise ValueError(f"{self.path.name}: columns {unknown} are not in the output layout")
+        chunk.reindex(columns=self.columns).to_csv(self.path, mode='a' if self.rows else 'w',
+                                                   header=not self.rows, index=False)
+        self.rows += len(chunk)
+
+
+def pybaseball_fetcher(pid, start_dt, end_dt):
+    from pybaseball import statcast_pitcher
+    return statcast_pitcher(start_dt, end_dt, pid)
+
+
+def _lookup_player_id(last, first):
+    # The original per-name lookup; pybaseball falls back to the closest names when there is no exact one
+    from pybaseball import playerid_lookup
+    found = playerid_lookup(last, first)
+    if found.empty or pd.isna(found.iloc[0]["key_mlbam"]):
+        return None
+    return int(found.iloc[0]["key_mlbam"])
+
+
+def resolve_player_ids(names, cache_path=None):
+    """
+    Map 'Last, First' names to MLBAM ids (cached as JSON). Names are matched exactly
+    (case-insensitive) against one Chadwick register download, preferring the most recently
+    active player; only names without an exact match go through playerid_lookup one by one,
+    which returns its closest match as the original script did. Names that don't resolve
+    (including lookups that failed on a network error) are not cached and are tried again
+    on the next call; malformed names map to None without a lookup.
+    """
+    ids = {}
+    if cache_path and Path(cache_path).exists():
+        ids = json.loads(Path(cache_path).read_text())
+    missing = [n for n in names if ids.get(n) is None and len(n.split(",")) == 2]
+    if missing:
+        from pybaseball import chadwick_register
+        register = chadwick_register()
+        register = register[register['key_mlbam'] > 0]
+        register = register.sort_values('mlb_played_last', ascending=False, na_position='last')
+        lookup = {}
+        for last, first, mlbam in zip(register['name_last'], register['name_first'], register['key_mlbam']):
+            lookup.setdefault((str(last).lower(), str(first).lower()), int(mlbam))
+        for name in missing:
+            last, first = [x.strip() for x in name.split(",")]
+            pid = lookup.get((last.lower(), first.lower()))
+            if pid is None:
+                try:
+                    pid = _lookup_player_id(last, first)
+                except Exception as e:
+                    print(f"Could not resolve {name}: {e}")
+            ids[name] = pid
+        if cache_path:
+            Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+            resolved = {name: pid for name, pid in ids.items() if pid is not None}
+            Path(cache_path).write_text(json.dumps(resolved, indent=2))
+    return {name: ids.get(name) for name in names}
+
+
+def _fetch_with_retry(fetcher, limiter, pid, season, retries, backoff):
+    for attempt in range(retries + 1):
+        limiter.acquire()
+        try:
+            return fetcher(pid, f"{season}-03-01", f"{season}-11-30")
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * (2 ** attempt) * (1 + random.random()))
+
+
+def _output_columns(cache, pieces):
+    """Union of the cached pieces' columns in first-appearance order, plus the added player_name/season."""
+    columns = {}
+    for _, pid, season in pieces:
+        path = cache._path(pid, season)
+        if path.exists():
+            columns.update(dict.fromkeys(pd.read_csv(path, nrows=0).columns))
+    columns.update(dict.fromkeys(["player_name", "season"]))
+    return list(columns)
+
+
+def fetch_statcast(pitcher_ids, years, out_dir='.', cache_dir='statcast_cache', fetcher=pybaseball_fetcher,
+                   workers=4, rate=1.0, retries=2, backoff=2.0, merged_name=None):
+    """
+    Fetch every missing (pitcher, season) piece into the cache, then write
+    statcast_pitcher_game_features_<year>.csv and a merged file from it, ordered by player
+    and game_date. Returns {'fetched', 'cached', 'failed'} where failed maps 'pid:season'
+    to the error; failed pieces aren't cached, so the next run retries them.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cache = StatcastCache(cache_dir)
+    limiter = TokenBucket(rate, capacity=max(1, workers))
+    merged_name = merged_name or f"statcast_pitcher_game_features_{min(years)}_{max(years)}.csv"
+
+    report = {'fetched': 0, 'cached': 0, 'failed': {}}
+    pieces = [(name, pid, year) for name, pid in sorted(pitcher_ids.items()) if pid is not None for year in years]
+    pending = []
+    for name, pid, year in pieces:
+        if cache.has(pid, year):
+            report['cached'] += 1
+        else:
+            pending.append((name, pid, year))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_fetch_with_retry, fetcher, limiter, pid, year, retries, backoff): (name, pid, year)
+            for name, pid, year in pending
+        }
+        for future in as_completed(futures):
+            name, pid, year = futures[future]
+            try:
+                data = future.result()
+            except Exception as e:
+                print(f"Failed {name} {year}: {e}")
+                report['failed'][f"{pid}:{year}"] = str(e)
+                continue
+            cache.save(pid, year, data if data is not None else pd.DataFrame())
+            report['fetched'] += 1
+
+    # Columns that only appear in later pieces are kept: every file gets the union of them all
+    columns = _output_columns(cache, pieces)
+    season_writers = {year: ChunkWriter(out_dir / f"statcast_pitcher_game_features_{year}.csv", columns)
+                      for year in years}
+    merged_writer = ChunkWriter(out_dir / merged_name, columns)
+    for name, pid, year in pieces:
+        data = cache.load(pid, year)
+        if data.empty:
+            continue
+        if "game_date" in data.columns:
+            data = data.sort_values("game_date", kind="stable")
+        data["player_name"] = name
+        data["season"] = year
+        season_writers[year].write(data)
+        merged_writer.write(data)
+    return report
@@ -0,0 +1,72 @@
+import json
+import logging
+import runpy
+import subprocess
+import sys
+from pathlib import Path
+
+from flask import Flask
+
+import model_registry
+from model_registry import ModelRegistry
+
+HERE = Path(__file__).parent
+ARTIFACTS = HERE.parent / 'artifacts'
+
+
+def test_importing_app_does_not_build_it():
+    code = ("import logging, app, model_registry; "
+            "print(hasattr(app, 'app'), model_registry._registry is None, logging.getLogger('ml_api').handlers == [])")
+    out = subprocess.run([sys.executable, '-c', code], cwd=HERE, capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ['False', 'True', 'True']
+
+
+def test_create_app_registers_routes_and_warms_the_model(monkeypatch):
+    registry = ModelRegistry(ARTIFACTS)
+    monkeypatch.setattr(model_registry, '_registry', registry)
+    from app import create_app
+    app = create_app()
+
+    routes = {rule.rule for rule in app.url_map.iter_rules()}
+    assert {'/predict', '/score', '/health', '/metrics'} <= routes
+    assert registry._bundle is not None
+    assert app.test_client().get('/health').get_json()['model_loaded'] is True
+
+
+def test_wsgi_module_builds_the_app(monkeypatch):
+    monkeypatch.setattr(model_registry, '_registry', ModelRegistry(ARTIFACTS))
+    monkeypatch.delitem(sys.modules, 'wsgi', raising=False)
+    import wsgi
+    assert isinstance(wsgi.app, Flask)
+
+
+def test_json_log_lines(capsys):
+    from app import configure_logging, logger
+    configure_logging('INFO', 'json')
+    logger.info("predict", extra={'fields': {'rows': 3, 'csv_path': 'games.csv'}})
+    logger.debug("hidden")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed")
+
+    lines = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+    assert len(lines) == 2
+    assert lines[0]['msg'] == 'predict' and lines[0]['level'] == 'INFO' and lines[0]['logger'] == 'ml_api'
+    assert lines[0]['rows'] == 3 and lines[0]['csv_path'] == 'games.csv' and 'ts' in lines[0]
+    assert lines[1]['level'] == 'ERROR' and 'ValueError: boom' in lines[1]['exc']
+
+    configure_logging('WARNING', 'text')
+    logger.warning("plain")
+    assert capsys.readouterr().err.rstrip().endswith('WARNING ml_api plain')
+    assert logger.level == logging.WARNING
+
+
+def test_gunicorn_config_reads_environment(monkeypatch):
+    monkeypatch.setenv('ML_PORT', '6001')
+    monkeypatch.setenv('ML_WORKERS', '3')
+    monkeypatch.setenv('ML_THREADS', '2')
+    config = runpy.run_path(str(HERE / 'gunicorn.conf.py'))
+    assert config['bind'] == '0.0.0.0:6001'
+    assert (config['workers'], config['threads'], config['worker_class']) == (3, 2, 'gthread')
+    assert config['preload_app'] is True
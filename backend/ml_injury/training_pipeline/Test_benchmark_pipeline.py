@@ -0,0 +1,54 @@
+import numpy as np
+
+from benchmark_pipeline import compare, run_benchmarks
+from synthetic_data import load_schema, synthetic_games
+from train_injury_precise import build_dataset
+
+
+def test_synthetic_games_have_the_training_schema():
+    df = synthetic_games(n_teams=2, n_seasons=1, seed=1)
+    assert list(df.columns[:2]) == ['player_name', 'game_date'] and 'result' in df.columns
+    assert set(load_schema()) <= set(df.columns)
+    assert df['player_name'].nunique() == 26 and 0 < df['result'].mean() < 0.2
+    X, y, features, _ = build_dataset(df, None)
+    assert len(X) > 0 and not np.isnan(X).any()
+
+
+def test_regressions_beyond_threshold_are_reported():
+    results = run_benchmarks(repeat=1, only=['enrich_features'])
+    stage = results['stages']['enrich_features']
+    assert stage['rows'] == results['scale']['games'] and stage['peak_mb'] > 0
+
+    baseline = {'stages': {'enrich_features': dict(stage, seconds=1.0, peak_mb=stage['peak_mb'])}}
+    slower = {'stages': {'enrich_features': dict(stage, seconds=1.5, peak_mb=stage['peak_mb'] * 2)}}
+    assert compare(results, baseline) == []
+    assert len(compare(slower, baseline, threshold=0.25)) == 2
+
+
+def test_only_the_selected_stages_build_their_inputs(monkeypatch):
+    import benchmark_pipeline
+
+    def no_model(*args, **kwargs):
+        raise AssertionError("model loaded for a run without predict_risk")
+
+    monkeypatch.setattr(benchmark_pipeline, 'ModelRegistry', no_model)
+    monkeypatch.setattr(benchmark_pipeline, 'apply_dtype_policy', no_model)
+    games = synthetic_games(n_teams=1, n_seasons=1, seed=0)
+    assert list(benchmark_pipeline.build_stages(games, None, None, only=['enrich_features'])) == ['enrich_features']
+
+
+def test_predict_risk_stage_fails_instead_of_timing_the_fallback(monkeypatch):
+    import types
+    import pytest
+    import benchmark_pipeline
+
+    class Broken:
+        def predict_proba(self, X):
+            raise ValueError("feature mismatch")
+
+    bundle = types.SimpleNamespace(clf=Broken(), preprocessor=None, features=['total_pitches'])
+    monkeypatch.setattr(benchmark_pipeline, 'ModelRegistry', lambda path: types.SimpleNamespace(get=lambda: bundle))
+    games = synthetic_games(n_teams=1, n_seasons=1, seed=0)
+    fn, make_input, _ = benchmark_pipeline.build_stages(games, None, None, only=['predict_risk'])['predict_risk']
+    with pytest.raises(RuntimeError, match='fell back'):
+        fn(make_input())
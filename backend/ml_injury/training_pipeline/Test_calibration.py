@@ -0,0 +1,26 @@
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from calibration import fit_calibrated
+
+
+class CountingModel(LogisticRegression):
+    fits = 0
+
+    def fit(self, X, y, **kwargs):
+        CountingModel.fits += 1
+        return super().fit(X, y, **kwargs)
+
+
+def test_prefit_trains_one_model_and_cv_trains_three():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 4))
+    y = (X[:, 0] + rng.normal(size=600) > 1).astype(int)
+
+    for mode, expected_fits in [('prefit', 1), ('cv', 3)]:
+        CountingModel.fits = 0
+        model, timings = fit_calibrated(CountingModel, X, y, method='isotonic', mode=mode)
+        assert CountingModel.fits == expected_fits
+        probs = model.predict_proba(X)[:, 1]
+        assert probs.min() >= 0 and probs.max() <= 1
+        assert 'total' in timings
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from dataset_store import load_game_frame, write_dataset
+
+DATA_PATH = Path(__file__).parent.parent / 'final_dataset' / 'yankees.csv'
+
+
+def _two_season_frame():
+    df = pd.read_csv(DATA_PATH, parse_dates=['game_date'])
+    older = df.copy()
+    older['game_date'] = older['game_date'] - pd.DateOffset(years=1)
+    return pd.concat([older, df], ignore_index=True)
+
+
+def test_parquet_roundtrip_is_float32_and_partitioned(tmp_path):
+    df = _two_season_frame()
+    out = write_dataset(df, tmp_path / 'games')
+
+    assert sorted(p.name for p in out.iterdir()) == ['season=2024', 'season=2025']
+    loaded = load_game_frame(out)
+    assert len(loaded) == len(df)
+    assert 'season' not in loaded.columns
+    assert loaded['release_speed_mean_all'].dtype == np.float32
+    assert loaded['player_name'].dtype == df['player_name'].dtype
+    np.testing.assert_allclose(
+        loaded.sort_values(['player_name', 'game_date'])['release_speed_mean_all'].to_numpy(dtype=float),
+        df.sort_values(['player_name', 'game_date'])['release_speed_mean_all'].to_numpy(dtype=float),
+        rtol=1e-6,
+    )
+
+
+def test_projection_and_filters_match_csv(tmp_path):
+    df = _two_season_frame()
+    csv_path = tmp_path / 'games.csv'
+    df.to_csv(csv_path, index=False)
+    parquet_path = write_dataset(df, tmp_path / 'games', by_player=True)
+
+    columns = ['total_pitches', 'release_speed_mean_all', 'not_a_column']
+    from_csv = load_game_frame(csv_path, columns=columns, start_date='2025-05-01', players=['Fried, Max', 'Gil, Luis'])
+    from_parquet = load_game_frame(parquet_path, columns=columns, start_date='2025-05-01', players=['Fried, Max', 'Gil, Luis'])
+
+    assert list(from_csv.columns) == ['player_name', 'game_date', 'total_pitches', 'release_speed_mean_all']
+    assert set(from_parquet.columns) == set(from_csv.columns)
+    assert len(from_parquet) == len(from_csv) > 0
+    assert from_parquet['game_date'].min() >= pd.Timestamp('2025-05-01')
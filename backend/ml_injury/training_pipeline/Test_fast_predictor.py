@@ -0,0 +1,52 @@
+import joblib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from fast_predictor import FastPredictor
+from preprocessing import FeaturePipeline
+from feature_engineering import enrich_features
+from train_injury_precise import add_trend_features
+
+ARTIFACTS = Path(__file__).parent.parent / 'artifacts'
+DATA_PATH = Path(__file__).parent.parent / 'final_dataset' / 'yankees.csv'
+
+
+def _pipeline_and_features():
+    clf = joblib.load(ARTIFACTS / 'injury_xgb_final.joblib')
+    imputer, scaler, features = joblib.load(ARTIFACTS / 'injury_preprocessors.joblib')
+    df = add_trend_features(enrich_features(pd.read_csv(DATA_PATH, parse_dates=['game_date'])))
+    X = df[features].to_numpy(dtype=float)
+    # Knock out some values so the fused imputation is exercised too
+    X[::7, 0] = np.nan
+    X[::11, 3] = np.nan
+    return clf, imputer, scaler, features, X
+
+
+def test_fast_predictor_matches_joblib_pipeline(tmp_path):
+    clf, imputer, scaler, features, X = _pipeline_and_features()
+    expected = clf.predict_proba(scaler.transform(imputer.transform(X)))
+
+    predictor = FastPredictor.from_pipeline(clf, FeaturePipeline.from_sklearn(imputer, scaler, features))
+    np.testing.assert_allclose(predictor.predict_proba(X), expected, rtol=0, atol=1e-7)
+
+    predictor.save(tmp_path / 'fast.npz')
+    loaded = FastPredictor.load(tmp_path / 'fast.npz')
+    assert loaded.features == list(features)
+    np.testing.assert_allclose(loaded.predict_proba(X), expected, rtol=0, atol=1e-7)
+    np.testing.assert_allclose(loaded.predict_proba(X[:1]), expected[:1], rtol=0, atol=1e-7)
+
+
+def test_fast_predictor_matches_sigmoid_calibration():
+    from sklearn.calibration import CalibratedClassifierCV
+    from xgboost import XGBClassifier
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4))
+    y = (X[:, 0] + rng.normal(size=300) > 1).astype(int)
+    pipeline = FeaturePipeline(['a', 'b', 'c', 'd'], dtype=np.float64).fit(X)
+    clf = CalibratedClassifierCV(XGBClassifier(n_estimators=20, max_depth=2), method='sigmoid', cv=3)
+    clf.fit(pipeline.transform(X), y)
+
+    predictor = FastPredictor.from_pipeline(clf, pipeline)
+    np.testing.assert_allclose(predictor.predict_proba(X), clf.predict_proba(pipeline.transform(X)), rtol=0, atol=1e-7)
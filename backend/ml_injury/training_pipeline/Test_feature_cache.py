@@ -0,0 +1,44 @@
+import numpy as np
+
+from feature_cache import cached_dataset, evict
+
+
+def _build(calls):
+    def build():
+        calls.append(1)
+        return np.arange(1000, dtype=np.float32), ['f1']
+    return build
+
+
+def test_hits_skip_the_build_until_input_code_or_params_change(tmp_path):
+    data = tmp_path / 'games.csv'
+    data.write_text('player_name,game_date\nA,2024-04-01\n')
+    code = tmp_path / 'trainer.py'
+    code.write_text('FEATURES = 1\n')
+    cache_dir = tmp_path / 'cache'
+    calls = []
+
+    def run(**kwargs):
+        return cached_dataset(data, _build(calls), [code], {'feature_cap': 9}, cache_dir=cache_dir, **kwargs)
+
+    first = run()
+    X, names = run()
+    assert len(calls) == 1 and names == ['f1'] and np.array_equal(X, first[0])
+
+    run(rebuild=True)
+    run(use_cache=False)
+    assert len(calls) == 3
+
+    code.write_text('FEATURES = 2\n')
+    run()
+    data.write_text('player_name,game_date\nB,2024-04-01\n')
+    run()
+    assert len(calls) == 5 and len(list(cache_dir.glob('*.joblib'))) == 3
+
+
+def test_eviction_keeps_the_directory_under_its_cap(tmp_path):
+    for i in range(5):
+        (tmp_path / f'{i}.joblib').write_bytes(b'x' * 100)
+    evict(tmp_path, 250, keep='0.joblib')
+    left = sorted(p.name for p in tmp_path.glob('*.joblib'))
+    assert '0.joblib' in left and len(left) == 2
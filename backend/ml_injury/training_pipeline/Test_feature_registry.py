@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from feature_engineering import enrich_features
+from feature_registry import FEATURE_REGISTRY, compute_features
+from rolling_engine import GroupedRolling
+from train_injury_precise import FEATURES, add_trend_features
+
+
+def test_computes_only_the_model_features_and_matches_full_enrichment(sample_frame):
+    df = sample_frame
+    full = add_trend_features(enrich_features(df))
+    actual = compute_features(df, FEATURES)
+
+    added = [c for c in actual.columns if c not in df.columns]
+    assert added == [f for f in FEATURES if f not in df.columns]
+    assert 'acute_workload' not in actual.columns and 'pitch_count_rolling_3' not in actual.columns
+    assert list(actual.index) == list(full.index)
+    pd.testing.assert_frame_equal(actual[FEATURES], full[FEATURES])
+
+
+def test_plan_resolves_dependencies_and_inputs():
+    order, raw = FEATURE_REGISTRY.plan(['short_rest', 'acwr'])
+    assert order == ['days_rest', 'short_rest', 'pitch_count_rolling_3', 'acwr']
+    assert raw == ['game_date', 'total_pitches']
+    assert FEATURE_REGISTRY.input_columns(['release_var']) == [
+        'player_name', 'game_date', 'release_pos_x_mean_all', 'release_pos_y_mean_all']
+    assert FEATURE_REGISTRY.window(FEATURE_REGISTRY.names) == 10
+    assert FEATURE_REGISTRY.window(FEATURES) == 5
+
+
+def test_shared_windows_are_computed_once(monkeypatch, sample_frame):
+    calls = []
+    mean = GroupedRolling.mean
+    monkeypatch.setattr(GroupedRolling, 'mean', lambda self, values, w: calls.append(w) or mean(self, values, w))
+    compute_features(sample_frame, ['acute_workload', 'pitch_count_rolling_3', 'acwr'])
+    assert calls == [3]
+
+
+def test_legacy_module_keeps_player_id_api(sample_frame):
+    import advanced_features
+    df = sample_frame.rename(columns={'player_name': 'player_id', 'total_pitches': 'pitches_thrown',
+                                         'release_speed_mean_all': 'release_speed'})
+    actual = advanced_features.compute_velocity_deltas(advanced_features.compute_acwr(df))
+
+    expected = df.sort_values(['player_id', 'game_date'])
+    g = expected.groupby('player_id')
+    acute = g['pitches_thrown'].transform(lambda x: x.rolling(3, min_periods=1).mean())
+    velo = expected['release_speed'] - g['release_speed'].transform(lambda x: x.rolling(5, min_periods=1).mean())
+    assert 'player_id' in actual.columns and 'player_name' not in actual.columns
+    np.testing.assert_allclose(actual['acute_workload'], acute)
+    np.testing.assert_allclose(actual['velo_delta'], velo)
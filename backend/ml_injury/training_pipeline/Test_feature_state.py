@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from feature_engineering import enrich_features
+from train_injury_precise import add_trend_features
+from feature_state import FeatureStateStore, FEATURE_COLUMNS
+
+DATA_PATH = Path(__file__).parent.parent / 'final_dataset' / 'yankees.csv'
+
+
+def _full_recompute(df):
+    return add_trend_features(enrich_features(df))
+
+
+def _assert_same_features(expected, actual):
+    actual = actual.loc[expected.index]
+    for col in FEATURE_COLUMNS:
+        np.testing.assert_allclose(
+            actual[col].to_numpy(dtype=float), expected[col].to_numpy(dtype=float),
+            rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=col
+        )
+
+
+def test_replay_matches_full_recompute():
+    df = pd.read_csv(DATA_PATH, parse_dates=['game_date'])
+
+    expected = _full_recompute(df)
+    actual = FeatureStateStore().enrich_rows(df)
+
+    assert list(expected.columns) == list(actual.columns)
+    _assert_same_features(expected, actual)
+
+
+def test_incremental_update_matches_full_recompute():
+    df = pd.read_csv(DATA_PATH, parse_dates=['game_date'])
+    df = df.sort_values(['player_name', 'game_date'])
+
+    # Hold back the last game of every player and feed it in afterwards
+    is_last = ~df.duplicated('player_name', keep='last')
+    store = FeatureStateStore.from_frame(df[~is_last])
+    new_games = store.enrich_rows(df[is_last])
+
+    expected = _full_recompute(df)
+    _assert_same_features(expected.loc[df.index[is_last]], new_games)
+
+
+def test_from_frame_matches_full_replay():
+    df = pd.read_csv(DATA_PATH, parse_dates=['game_date'])
+
+    replayed = FeatureStateStore()
+    replayed.enrich_rows(df, commit=True)
+    seeded = FeatureStateStore.from_frame(df)
+
+    assert set(seeded.players) == set(replayed.players)
+    for name, state in replayed.players.items():
+        assert seeded.players[name].last_date == state.last_date
+        for col, values in state.windows.items():
+            np.testing.assert_array_equal(list(seeded.players[name].windows[col]), list(values), err_msg=col)
+
+
+def test_enrich_without_commit_leaves_state_untouched():
+    df = pd.DataFrame({
+        'player_name': ['A', 'A', 'A'],
+        'game_date': pd.to_datetime(['2024-04-01', '2024-04-06', '2024-04-09']),
+        'total_pitches': [90, 80, 100],
+        'release_speed_mean_all': [95.0, 94.5, np.nan],
+        'release_spin_rate_mean_all': [2300.0, 2280.0, 2310.0],
+        'release_pos_x_mean_all': [-2.0, -2.1, -1.9],
+        'release_pos_y_mean_all': [54.0, 54.2, 53.9],
+    })
+    store = FeatureStateStore.from_frame(df.iloc[:1])
+
+    scored = store.enrich_rows(df.iloc[1:], commit=False)
+    _assert_same_features(_full_recompute(df).iloc[1:], scored)
+    assert store.players['A'].last_date == pd.Timestamp('2024-04-01')
@@ -0,0 +1,43 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import hyperparam_search
+from hyperparam_search import TRAINERS, sample_params, successive_halving
+
+DATA_PATH = Path(__file__).parent.parent / 'final_dataset' / 'yankees.csv'
+
+
+def test_successive_halving_keeps_best_and_grows_budget():
+    rng = np.random.default_rng(0)
+    configs = [sample_params(rng) for _ in range(9)]
+
+    def run(trial_id, params, n_estimators):
+        # Higher learning rate scores better; budget is echoed back
+        return {'trial': trial_id, 'n_estimators': n_estimators, 'val_pr_auc': params['learning_rate']}
+
+    all_rows, finalists = successive_halving(run, configs, 10, 1000, 3, 'val_pr_auc', n_jobs=1)
+    assert [r['n_estimators'] for r in all_rows] == [10] * 9 + [30] * 3 + [90]
+    best = int(np.argmax([c['learning_rate'] for c in configs]))
+    assert [r['trial'] for r in finalists] == [best]
+    assert finalists[0]['rung'] == 2
+
+
+@pytest.mark.parametrize('trainer', sorted(TRAINERS))
+def test_search_runs_end_to_end_on_real_data(trainer, tmp_path, monkeypatch):
+    out_path = tmp_path / 'leaderboard.csv'
+    monkeypatch.setattr('sys.argv', ['hyperparam_search.py', '--path', str(DATA_PATH), '--trainer', trainer,
+                                     '--n_trials', '3', '--min_estimators', '5', '--max_estimators', '15',
+                                     '--n_jobs', '1', '--out_path', str(out_path)])
+    hyperparam_search.main()
+
+    board = pd.read_csv(out_path)
+    assert sorted(board.loc[board['rung'] == 0, 'trial']) == [0, 1, 2]
+    final = board[board['rung'] == board['rung'].max()]
+    assert len(final) == 1 and final['n_estimators'].iloc[0] == 15
+    # Only the finalist is refit (calibrated) and scored on the test rows
+    assert final[['test_brier', 'test_precision_at_k']].notna().all().all()
+    assert board.loc[board['rung'] == 0, 'test_brier'].isna().all()
+    assert (board['best_iteration'] < board['n_estimators']).all()
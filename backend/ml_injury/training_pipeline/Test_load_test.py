@@ -0,0 +1,16 @@
+import numpy as np
+
+from load_test import run_load_test, summarize
+
+
+def test_summary_percentiles():
+    summary = summarize(np.arange(1, 101) / 1000.0, [200] * 99 + [500], wall=2.0)
+    assert summary['errors'] == 1 and summary['throughput_rps'] == 50.0
+    assert summary['p50_ms'] == 50.5 and summary['p99_ms'] == 99.01 and summary['max_ms'] == 100.0
+
+
+def test_thread_server_handles_concurrent_predict_requests(monkeypatch):
+    monkeypatch.setattr('model_registry._registry', None)
+    results = run_load_test(concurrency=[2], n_requests=6, warmup=1, top_k_ratios=[0.05, 0.2])
+    assert results[0]['requests'] == 6 and results[0]['errors'] == 0
+    assert 0 < results[0]['p50_ms'] <= results[0]['p99_ms']
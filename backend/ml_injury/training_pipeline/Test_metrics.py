@@ -0,0 +1,38 @@
+from pathlib import Path
+
+from metrics import REGISTRY, FALLBACKS, STAGE_ROWS, STAGE_SECONDS, timed, timing_summary
+from model_registry import ModelRegistry
+
+ARTIFACTS = Path(__file__).parent.parent / 'artifacts'
+DATA_PATH = Path(__file__).parent.parent / 'final_dataset' / 'yankees.csv'
+
+
+def test_timed_records_histogram_and_rows():
+    REGISTRY.reset()
+    for n in (10, 20):
+        with timed('unit_stage') as span:
+            span.rows = n
+    count, total = STAGE_SECONDS.snapshot()[('unit_stage',)]
+    assert count == 2 and total > 0 and STAGE_ROWS.value(stage='unit_stage') == 30
+    text = REGISTRY.render()
+    assert 'ml_stage_seconds_bucket{stage="unit_stage",le="+Inf"} 2' in text
+    assert 'ml_stage_rows_total{stage="unit_stage"} 30' in text
+    assert timing_summary()[1].startswith('unit_stage')
+
+
+def test_metrics_endpoint_reports_predict_stages(monkeypatch):
+    monkeypatch.setattr('model_registry._registry', ModelRegistry(ARTIFACTS))
+    from app import create_app
+    import flag_injury_risks
+    flag_injury_risks.prediction_cache.clear()
+    REGISTRY.reset()
+
+    client = create_app().test_client()
+    for _ in range(2):
+        assert client.post('/predict', json={'csv_path': str(DATA_PATH)}).status_code == 200
+    text = client.get('/metrics').get_data(as_text=True)
+    for stage in ('load_csv', 'compute_features', 'predict_proba', 'serialize'):
+        assert f'ml_stage_seconds_count{{stage="{stage}"}}' in text
+    assert 'ml_cache_requests_total{cache="prediction",result="hit"} 1' in text
+    assert 'ml_request_seconds_count{endpoint="ml_api.predict_injury_risk"} 2' in text
+    assert FALLBACKS.value(reason='predict_error') == 0
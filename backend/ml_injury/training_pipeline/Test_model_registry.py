@@ -0,0 +1,87 @@
+import os
+import shutil
+from pathlib import Path
+
+import joblib
+
+import model_registry
+from model_registry import MODEL_FILE, PREPROCESSOR_FILE, ModelRegistry
+
+ARTIFACTS = Path(__file__).parent.parent / 'artifacts'
+
+
+def _copy_artifacts(tmp_path):
+    for name in (MODEL_FILE, PREPROCESSOR_FILE):
+        shutil.copy(ARTIFACTS / name, tmp_path / name)
+
+
+def _bump_mtime(path, seconds=10):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + seconds * 10**9))
+
+
+def _count_calls(monkeypatch, name):
+    calls = []
+    original = getattr(model_registry, name)
+    monkeypatch.setattr(model_registry, name, lambda *a, **k: calls.append(a) or original(*a, **k))
+    return calls
+
+
+def test_reloads_when_the_model_is_retrained(tmp_path):
+    _copy_artifacts(tmp_path)
+    registry = ModelRegistry(tmp_path, use_fast=False)
+    first = registry.get()
+    assert registry.get() is first
+
+    # Same model, different bytes: a re-trained artifact as far as the registry can tell
+    joblib.dump(first.clf, tmp_path / MODEL_FILE, compress=3)
+    _bump_mtime(tmp_path / MODEL_FILE)
+    second = registry.get()
+    assert second is not first
+    assert second.version != first.version
+
+
+def test_touch_without_retrain_keeps_the_bundle(tmp_path, monkeypatch):
+    _copy_artifacts(tmp_path)
+    registry = ModelRegistry(tmp_path, use_fast=False)
+    first = registry.get()
+    loads = []
+    monkeypatch.setattr(model_registry.joblib, 'load', lambda *a, **k: loads.append(a))
+
+    _bump_mtime(tmp_path / MODEL_FILE)
+    assert registry.get() is first
+    assert loads == []
+
+
+def test_unreadable_artifact_keeps_old_model_and_is_not_retried(tmp_path, monkeypatch):
+    _copy_artifacts(tmp_path)
+    registry = ModelRegistry(tmp_path, use_fast=False)
+    first = registry.get()
+    good = (tmp_path / MODEL_FILE).read_bytes()
+
+    (tmp_path / MODEL_FILE).write_bytes(b'not a pickle')
+    _bump_mtime(tmp_path / MODEL_FILE)
+    hashes = _count_calls(monkeypatch, '_content_hash')
+    for _ in range(3):
+        assert registry.get() is first
+    assert len(hashes) == 1
+
+    # Fixed files change the signature again and are picked up
+    (tmp_path / MODEL_FILE).write_bytes(good)
+    _bump_mtime(tmp_path / MODEL_FILE, 20)
+    assert registry.get() is first  # same content as before: touched, not re-trained
+    assert len(hashes) == 2
+
+
+def test_switches_to_fast_predictor_exported_after_first_load(tmp_path):
+    from fast_predictor import FastPredictor, export_fast_predictor
+    _copy_artifacts(tmp_path)
+    registry = ModelRegistry(tmp_path, use_fast=True)
+    first = registry.get()
+    assert not isinstance(first.clf, FastPredictor)
+
+    # train_injury_precise writes the joblib files first and the .npz afterwards
+    export_fast_predictor(tmp_path)
+    bundle = registry.get()
+    assert isinstance(bundle.clf, FastPredictor)
+    assert bundle.version == first.version
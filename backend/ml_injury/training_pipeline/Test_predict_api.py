@@ -0,0 +1,132 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import flag_injury_risks
+from model_registry import ModelRegistry
+from prediction_cache import PredictionCache
+
+ARTIFACTS = Path(__file__).parent.parent / 'artifacts'
+DATA_PATH = Path(__file__).parent.parent / 'final_dataset' / 'yankees.csv'
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr('model_registry._registry', ModelRegistry(ARTIFACTS))
+    monkeypatch.setattr(flag_injury_risks, 'prediction_cache', PredictionCache())
+    monkeypatch.delenv('ML_HISTORY_PATH', raising=False)
+    import app
+    monkeypatch.setattr(app, 'DATA_DIR', DATA_PATH.parent)
+    return app.create_app().test_client()
+
+
+def _predict(client, **body):
+    return client.post('/predict', json=dict(body, csv_path=str(DATA_PATH)))
+
+
+def test_filters_and_pagination(client):
+    full = _predict(client).get_json()
+    rows = full['data']
+    assert full['total'] == len(rows)
+
+    page = _predict(client, offset=5, limit=10).get_json()
+    assert page['total'] == full['total'] and page['data'] == rows[5:15]
+    assert _predict(client, top_k=3).get_json()['data'] == rows[:3]
+
+    player = rows[0]['player_name']
+    by_player = _predict(client, player_name=player).get_json()['data']
+    assert by_player == [r for r in rows if r['player_name'] == player]
+    high = _predict(client, risk_level=['high']).get_json()['data']
+    assert high and all(r['risk_level'] == 'high' for r in high)
+
+
+def test_ndjson_stream_matches_json_body(client):
+    rows = _predict(client, limit=20).get_json()['data']
+    response = _predict(client, limit=20, stream=True)
+
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.headers['X-Total-Count'] == str(_predict(client).get_json()['total'])
+    streamed = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert streamed == rows
+    assert len(rows[0]['game_date']) == 10  # YYYY-MM-DD in both formats
+
+
+@pytest.mark.parametrize('body', [{'limit': 'abc'}, {'offset': -1}, {'top_k': 2.5}, {'top_k': True},
+                                  {'player_name': 3}])
+def test_invalid_selection_is_a_400(client, body):
+    response = _predict(client, **body)
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+@pytest.mark.parametrize('body', [{'tier_by': 'team'}, {'tier_by': 'team', 'score_date': '2025-04-08'}])
+def test_unknown_tier_by_is_a_400(client, body):
+    response = _predict(client, **body)
+    assert response.status_code == 400
+    assert "'team'" in response.get_json()['error']
+
+
+def test_unknown_tier_by_is_a_400_for_score(client):
+    scored = client.post('/score', json={'rows': [{'player_name': 'A', 'game_date': '2025-04-08'}], 'tier_by': 'team',
+                                         'history_path': str(DATA_PATH)})
+    assert scored.status_code == 400
+    assert "'team'" in scored.get_json()['error']
+
+
+def test_cli_rejects_unknown_tier_by(monkeypatch, capsys, tmp_path):
+    monkeypatch.setattr('model_registry._registry', ModelRegistry(ARTIFACTS))
+    monkeypatch.setattr(flag_injury_risks, 'prediction_cache', PredictionCache())
+    out_path = tmp_path / 'flags.csv'
+    monkeypatch.setattr('sys.argv', ['flag_injury_risks.py', '--path', str(DATA_PATH), '--tier_by', 'team',
+                                     '--out_path', str(out_path)])
+    with pytest.raises(SystemExit) as exit_info:
+        flag_injury_risks.main()
+    assert exit_info.value.code == 2
+    assert "tier_by column 'team'" in capsys.readouterr().err
+    assert not out_path.exists()
+
+
+def _game(player_name, game_date, **values):
+    return dict({'player_name': player_name, 'game_date': game_date, 'total_pitches': 95,
+                 'release_speed_mean_all': 94.0, 'release_spin_rate_mean_all': 2250.0,
+                 'release_pos_x_mean_all': -2.0, 'release_pos_y_mean_all': 54.0}, **values)
+
+
+@pytest.mark.parametrize('history_path', [None, '/etc/passwd', str(DATA_PATH.parent / '..' / 'artifacts' / 'metadata.txt')])
+def test_score_needs_a_history_file_inside_the_data_dir(client, history_path):
+    body = {'rows': [_game('Gil, Luis', '2025-09-30')]}
+    if history_path:
+        body['history_path'] = history_path
+    response = client.post('/score', json=body)
+    assert response.status_code == 400
+    assert 'history_path' in response.get_json()['error']
+
+
+def test_score_recomputes_a_backdated_game_from_history(client, monkeypatch):
+    monkeypatch.setenv('ML_HISTORY_PATH', str(DATA_PATH))
+    history = flag_injury_risks.get_history_store(str(DATA_PATH))
+    last_date = history.players['Gil, Luis'].last_date
+    backdated = _game('Gil, Luis', (last_date - pd.Timedelta(days=20)).strftime('%Y-%m-%d'))
+
+    response = client.post('/score', json={'rows': [backdated, _game('Fried, Max', '2026-04-01')]})
+    assert response.status_code == 200
+    assert {r['player_name'] for r in response.get_json()['data']} == {'Gil, Luis', 'Fried, Max'}
+
+
+def test_single_game_is_tiered_against_the_history_scores(client, monkeypatch):
+    monkeypatch.setenv('ML_HISTORY_PATH', str(DATA_PATH))
+    clf, imputer, scaler, features = flag_injury_risks.load_model()
+    reference = flag_injury_risks.history_scores(str(DATA_PATH), clf, imputer, scaler, features)
+    high_cut = np.sort(reference)[::-1][int(len(reference) * 0.10) - 1]
+
+    levels = {}
+    for pitches in (20, 60, 110, 140):
+        row = _game('Fried, Max', '2026-04-01', total_pitches=pitches)
+        scored = client.post('/score', json={'rows': [row]}).get_json()['data'][0]
+        assert (scored['risk_level'] == 'high') == (scored['injury_risk_prob'] >= high_cut)
+        levels[pitches] = scored['risk_level']
+    # One game per request is no longer 'low' by construction
+    assert set(levels.values()) != {'low'}
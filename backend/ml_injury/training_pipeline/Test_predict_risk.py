@@ -19,9 +19,8 @@ def test_predict_risk_normal_case(monkeypatch):
     # Mock feature list
     features = ["f1", "f2"]
 
-    # Mock enrich and trend functions to return df unchanged
-    monkeypatch.setattr("flag_injury_risks.enrich_features", lambda x: x)
-    monkeypatch.setattr("flag_injury_risks.add_trend_features", lambda x: x)
+    # Mock feature computation to return df unchanged
+    monkeypatch.setattr("flag_injury_risks.compute_features", lambda x, features: x)
 
     # Mock imputer and scaler to return X unchanged
     fake_imputer = MagicMock()
@@ -56,8 +55,7 @@ def test_predict_risk_empty_after_dropna(monkeypatch):
     features = ["f1", "f2"]
 
     # Mock functions
-    monkeypatch.setattr("flag_injury_risks.enrich_features", lambda x: x)
-    monkeypatch.setattr("flag_injury_risks.add_trend_features", lambda x: x)
+    monkeypatch.setattr("flag_injury_risks.compute_features", lambda x, features: x)
 
     fake_imputer = MagicMock()
     fake_imputer.transform.return_value = np.array([[0, 0]])
@@ -74,3 +72,41 @@ def test_predict_risk_empty_after_dropna(monkeypatch):
     assert len(output) == 1
     assert "injury_risk_prob" in output.columns
     assert "risk_level" in output.columns
+
+
+def test_cohort_scoring_matches_full_history():
+    from pathlib import Path
+    from flag_injury_risks import cohort_frame
+
+    history = pd.read_csv(Path(__file__).parent.parent / 'final_dataset' / 'yankees.csv', parse_dates=['game_date'])
+    features = ['total_pitches', 'acwr', 'days_rest', 'release_var', 'release_speed_mean_all_trend']
+    identity = MagicMock()
+    identity.transform.side_effect = lambda X: np.asarray(X, dtype=float)
+    clf = MagicMock()
+    clf.predict_proba.side_effect = lambda X: np.column_stack([np.zeros(len(X)), X @ np.arange(1, X.shape[1] + 1)])
+
+    start, end = '2025-06-01', '2025-06-07'
+    full = predict_risk(history, clf, identity, None, features)
+    full = full[full['game_date'].between(start, end)]
+    cohort = cohort_frame(history, start, end)
+    scored = predict_risk(cohort, clf, identity, None, features, tier_by='game_date', score_from=start)
+
+    assert len(cohort) < len(history) and len(scored) == len(full) > 0
+    merged = full.merge(scored, on=['player_name', 'game_date'])
+    np.testing.assert_allclose(merged['injury_risk_prob_x'], merged['injury_risk_prob_y'])
+
+
+def test_small_daily_cohort_gets_every_tier(monkeypatch):
+    from pathlib import Path
+    import flag_injury_risks
+    from model_registry import ModelRegistry
+    from prediction_cache import PredictionCache
+
+    monkeypatch.setattr('model_registry._registry', ModelRegistry(Path(__file__).parent.parent / 'artifacts'))
+    monkeypatch.setattr(flag_injury_risks, 'prediction_cache', PredictionCache())
+    csv_path = Path(__file__).parent.parent / 'final_dataset' / 'yankees.csv'
+
+    # Three games that day: int(3 * ratio) would leave all of them 'low'
+    day = flag_injury_risks.run_inference_on_csv(str(csv_path), score_date='2025-04-08')
+    assert len(day) == 3
+    assert list(day['risk_level']) == ['high', 'medium', 'low']
@@ -0,0 +1,49 @@
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+import flag_injury_risks
+from model_registry import ModelRegistry
+from prediction_cache import PredictionCache
+
+ARTIFACTS = Path(__file__).parent.parent / 'artifacts'
+DATA_PATH = Path(__file__).parent.parent / 'final_dataset' / 'yankees.csv'
+
+
+def _frame(n):
+    return pd.DataFrame({'injury_risk_prob': [0.5] * n})
+
+
+def test_lru_eviction_and_size_cap(tmp_path):
+    path = tmp_path / 'games.csv'
+    path.write_text('player_name,game_date\n')
+    cache = PredictionCache(max_entries=2, max_bytes=10_000)
+    keys = [cache.key(path, 'v1', {'top_k_ratio': r}) for r in (0.1, 0.2, 0.3)]
+    cache.put(keys[0], _frame(10))
+    cache.put(keys[1], _frame(10))
+    assert cache.get(keys[0]) is not None
+    cache.put(keys[2], _frame(10))
+    assert cache.get(keys[1]) is None and cache.get(keys[0]) is not None and len(cache) == 2
+
+    cache.put(keys[1], _frame(2000))
+    assert cache.get(keys[1]) is None
+    assert cache.key(path, 'v2', {'top_k_ratio': 0.1}) != keys[0]
+
+
+def test_appending_a_row_invalidates_the_file(tmp_path, monkeypatch):
+    path = tmp_path / 'yankees.csv'
+    shutil.copy(DATA_PATH, path)
+    cache = PredictionCache()
+    monkeypatch.setattr(flag_injury_risks, 'prediction_cache', cache)
+    monkeypatch.setattr('model_registry._registry', ModelRegistry(ARTIFACTS))
+
+    first = flag_injury_risks.run_inference_on_csv(str(path))
+    assert 'injury_risk_prob' in first.columns and cache.stats()['entries'] == 1
+    assert flag_injury_risks.run_inference_on_csv(str(path)) is first
+
+    lines = path.read_text().splitlines()
+    with open(path, 'a') as f:
+        f.write(lines[-1] + '\n')
+    assert flag_injury_risks.run_inference_on_csv(str(path)) is not first
+    assert cache.stats()['entries'] == 1 and cache.stats()['hits'] == 1
@@ -0,0 +1,40 @@
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.impute import SimpleImputer
+from sklearn.preprocessing import StandardScaler
+
+from preprocessing import FeaturePipeline, load_preprocessor
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(300, 5)), columns=list('abcde'))
+    df.loc[rng.random(300) < 0.2, 'b'] = np.nan
+    df['d'] = 3.0
+    df['player_name'] = 'X'
+    return df
+
+
+def test_pipeline_matches_sklearn_imputer_and_scaler():
+    df = _frame()
+    features = ['a', 'b', 'd']
+    pipeline = FeaturePipeline(features)
+    X = pipeline.fit_transform(df)
+    assert X.dtype == np.float32 and X.shape == (300, 3)
+
+    expected = StandardScaler().fit_transform(SimpleImputer(strategy='median').fit_transform(df[features]))
+    np.testing.assert_allclose(X, expected, atol=1e-5)
+    np.testing.assert_allclose(pipeline.transform(df), X)
+
+
+def test_load_preprocessor_accepts_legacy_tuple(tmp_path):
+    df = _frame()
+    features = ['a', 'b', 'c']
+    imputer = SimpleImputer(strategy='median').fit(df[features])
+    scaler = StandardScaler().fit(imputer.transform(df[features]))
+    joblib.dump((imputer, scaler, features), tmp_path / 'pre.joblib')
+
+    pipeline = load_preprocessor(tmp_path / 'pre.joblib')
+    assert pipeline.features == features
+    np.testing.assert_array_equal(pipeline.transform(df), scaler.transform(imputer.transform(df[features])))
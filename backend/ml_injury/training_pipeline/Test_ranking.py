@@ -0,0 +1,52 @@
+import numpy as np
+
+from ranking import top_k_indices, assign_tiers, assign_tiers_by_reference
+from train_injury_prob import threshold_top_k
+
+
+def test_top_k_matches_full_sort_and_breaks_ties_by_position():
+    rng = np.random.default_rng(0)
+    scores = rng.integers(0, 20, 500) / 20.0
+    for k in [1, 7, 50, 499, 500, 900]:
+        expected = np.lexsort((np.arange(len(scores)), -scores))[:k]
+        assert list(top_k_indices(scores, k)) == list(expected)
+
+    tied = top_k_indices([0.5, 0.9, 0.5, 0.5, 0.1], 2, ties='include')
+    assert list(tied) == [1, 0, 2, 3]
+
+
+def test_zero_k_selects_nothing():
+    assert len(top_k_indices(np.ones(5), 0)) == 0
+    assert set(assign_tiers(np.linspace(0, 1, 4))) == {'low'}
+    preds, threshold = threshold_top_k(np.linspace(0, 1, 5), 0)
+    assert preds.sum() == 0 and threshold == np.inf
+
+
+def test_tiers_are_assigned_per_group():
+    scores = np.concatenate([np.linspace(0, 0.1, 10), np.linspace(0.5, 1, 10)])
+    groups = np.repeat(['2024-05-01', '2024-05-02'], 10)
+    levels = assign_tiers(scores, groups=groups)
+    for day in ['2024-05-01', '2024-05-02']:
+        day_levels = list(levels[groups == day])
+        assert day_levels.count('high') == 1 and day_levels.count('medium') == 1
+        assert day_levels[-1] == 'high' and day_levels[-2] == 'medium'
+
+
+def test_min_per_tier_fills_small_groups():
+    scores = np.array([0.2, 0.9, 0.5, 0.1, 0.7])
+    assert set(assign_tiers(scores[:3])) == {'low'}
+    assert list(assign_tiers(scores[:3], min_per_tier=1)) == ['low', 'high', 'medium']
+    assert list(assign_tiers(scores[:1], min_per_tier=1)) == ['high']
+    groups = ['a', 'a', 'b', 'b', 'b']
+    assert list(assign_tiers(scores, groups=groups, min_per_tier=1)) == ['medium', 'high', 'medium', 'low', 'high']
+    # Large groups keep their ratio sizes
+    many = np.linspace(0, 1, 50)
+    assert list(assign_tiers(many, min_per_tier=1)) == list(assign_tiers(many))
+
+
+def test_reference_tiers_a_single_row_like_the_reference_rows():
+    reference = np.linspace(0, 1, 101)
+    assert list(assign_tiers_by_reference([0.95], reference)) == ['high']
+    assert list(assign_tiers_by_reference([0.85], reference)) == ['medium']
+    assert list(assign_tiers_by_reference([0.5], reference)) == ['low']
+    assert list(assign_tiers_by_reference(reference, reference)) == list(assign_tiers(reference))
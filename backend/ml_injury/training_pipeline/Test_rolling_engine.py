@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from rolling_engine import GroupedRolling, sort_by_group
+from feature_engineering import enrich_features
+from train_injury_precise import add_trend_features
+
+
+def _reference(df):
+    # The groupby/transform(lambda ...) implementation the engine replaces
+    df = df.sort_values(['player_name', 'game_date'])
+    g = df.groupby('player_name')
+    out = pd.DataFrame(index=df.index)
+    out['days_rest'] = g['game_date'].diff().dt.days.fillna(5)
+    out['acute_workload'] = g['total_pitches'].transform(lambda x: x.rolling(3, min_periods=1).mean())
+    out['chronic_workload'] = g['total_pitches'].transform(lambda x: x.rolling(10, min_periods=1).mean())
+    for col in ['release_speed_mean_all', 'release_spin_rate_mean_all']:
+        base = g[col].transform(lambda x: x.rolling(5, min_periods=1).mean())
+        out[f'{col}_delta'] = df[col] - base
+        out[f'{col}_rolling_3'] = g[col].transform(lambda x: x.rolling(3, min_periods=1).mean())
+        out[f'{col}_trend'] = df[col] - out[f'{col}_rolling_3']
+    out['relx_std'] = g['release_pos_x_mean_all'].transform(lambda x: x.rolling(5, min_periods=1).std())
+    out['rely_std'] = g['release_pos_y_mean_all'].transform(lambda x: x.rolling(5, min_periods=1).std())
+    out['release_var'] = out['relx_std'] + out['rely_std']
+    out['pitch_count_rolling_3'] = out['acute_workload']
+    out['acwr'] = df['total_pitches'] / (out['pitch_count_rolling_3'] + 1e-5)
+    out['short_rest'] = (out['days_rest'] < 4).astype(int)
+    return out
+
+
+def test_enrich_and_trend_match_groupby_reference(sample_frame):
+    df = sample_frame
+    expected = _reference(df)
+    actual = add_trend_features(enrich_features(df))
+
+    assert list(actual.index) == list(expected.index)
+    for col in expected.columns:
+        np.testing.assert_allclose(
+            actual[col].to_numpy(dtype=float), expected[col].to_numpy(dtype=float),
+            rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=col
+        )
+
+
+def test_windows_do_not_cross_player_boundaries():
+    df = pd.DataFrame({
+        'player_name': ['A', 'A', 'B', 'B', 'B'],
+        'game_date': pd.to_datetime(['2024-04-01', '2024-04-05', '2024-04-02', '2024-04-03', '2024-04-09']),
+        'x': [1.0, 3.0, 100.0, np.nan, 104.0],
+    })
+    rolling = GroupedRolling.from_frame(sort_by_group(df))
+
+    np.testing.assert_allclose(rolling.mean(df['x'].to_numpy(), 3), [1.0, 2.0, 100.0, 100.0, 102.0])
+    np.testing.assert_allclose(rolling.std(df['x'].to_numpy(), 3), [np.nan, np.sqrt(2), np.nan, np.nan, np.sqrt(8)])
+    np.testing.assert_allclose(rolling.diff_days(df['game_date']), [np.nan, 4, np.nan, 1, 6])
+
+
+def test_input_frame_is_not_modified(sample_frame):
+    df = sample_frame.sort_values(['player_name', 'game_date'])
+    before = df.copy()
+    enrich_features(df)
+    pd.testing.assert_frame_equal(df, before)
+
+
+def test_lean_dtype_frame_gives_float32_features_matching_float64(sample_frame):
+    from dataset_store import apply_dtype_policy
+
+    df = sample_frame
+    lean = apply_dtype_policy(df)
+    assert isinstance(lean['player_name'].dtype, pd.CategoricalDtype)
+    assert lean['total_pitches'].dtype == np.int16
+    assert lean.memory_usage(deep=True).sum() < df.memory_usage(deep=True).sum()
+
+    expected = add_trend_features(enrich_features(df))
+    actual = add_trend_features(enrich_features(lean))
+    assert list(actual.index) == list(expected.index)
+    for col in ['acwr', 'release_speed_mean_all_delta', 'release_var', 'release_spin_rate_mean_all_trend', 'days_rest']:
+        assert actual[col].dtype == np.float32, col
+        np.testing.assert_allclose(actual[col].to_numpy(dtype=float), expected[col].to_numpy(dtype=float),
+                                   rtol=1e-4, atol=1e-3, equal_nan=True, err_msg=col)
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from feature_state import FeatureStateStore
+from flag_injury_risks import score_rows, assign_risk_levels
+
+DATA_PATH = Path(__file__).parent.parent / 'final_dataset' / 'yankees.csv'
+FEATURES = ['total_pitches', 'acwr', 'days_rest', 'release_var']
+
+
+def _passthrough():
+    identity = MagicMock()
+    identity.transform.side_effect = lambda X: np.asarray(X, dtype=float)
+    return identity
+
+
+def test_score_rows_uses_player_history_without_modifying_it():
+    history = pd.read_csv(DATA_PATH, parse_dates=['game_date'])
+    store = FeatureStateStore.from_frame(history)
+    last_date = store.players['Gil, Luis'].last_date
+
+    clf = MagicMock()
+    clf.predict_proba.side_effect = lambda X: np.column_stack([1 - X[:, 0] / 200, X[:, 0] / 200])
+    rows = pd.DataFrame([{
+        'player_name': 'Gil, Luis', 'game_date': last_date + pd.Timedelta(days=3), 'total_pitches': 100,
+        'release_speed_mean_all': 95.0, 'release_spin_rate_mean_all': 2300.0,
+        'release_pos_x_mean_all': -2.0, 'release_pos_y_mean_all': 54.0,
+    }])
+
+    out = score_rows(rows, clf, _passthrough(), _passthrough(), FEATURES, store=store)
+
+    X = clf.predict_proba.call_args[0][0]
+    assert X[0, FEATURES.index('days_rest')] == 3
+    assert not np.isnan(X[0, FEATURES.index('release_var')])
+    assert list(out.columns) == ['player_name', 'game_date', 'injury_risk_prob', 'risk_level']
+    assert out['injury_risk_prob'].iloc[0] == 0.5
+    assert store.players['Gil, Luis'].last_date == last_date
+
+
+def test_small_batches_are_not_all_high():
+    assert list(assign_risk_levels(np.array([0.9]))) == ['low']
+    levels = assign_risk_levels(np.linspace(0, 1, 10))
+    assert list(levels).count('high') == 1
+    assert list(levels).count('medium') == 1
+
+
+def test_backdated_game_is_recomputed_from_full_history():
+    from feature_state import FEATURE_COLUMNS
+    from feature_registry import compute_features
+
+    history = pd.read_csv(DATA_PATH, parse_dates=['game_date'])
+    store = FeatureStateStore.from_frame(history)
+    name = 'Gil, Luis'
+    game_date = store.players[name].last_date - pd.Timedelta(days=20)
+    rows = pd.DataFrame([{
+        'player_name': name, 'game_date': game_date, 'total_pitches': 100,
+        'release_speed_mean_all': 95.0, 'release_spin_rate_mean_all': 2300.0,
+        'release_pos_x_mean_all': -2.0, 'release_pos_y_mean_all': 54.0,
+    }])
+    clf = MagicMock()
+    clf.predict_proba.side_effect = lambda X: np.column_stack([np.zeros(len(X)), np.full(len(X), 0.5)])
+
+    with pytest.raises(ValueError, match='older than the last seen game'):
+        score_rows(rows, clf, _passthrough(), None, FEATURES, store=store)
+    score_rows(rows, clf, _passthrough(), None, FEATURES, store=store, history_path=str(DATA_PATH))
+
+    full = compute_features(pd.concat([history, rows], ignore_index=True), FEATURE_COLUMNS)
+    expected = full[(full['player_name'] == name) & (full['game_date'] == game_date)
+                    & (full['total_pitches'] == 100)][FEATURES]
+    np.testing.assert_allclose(clf.predict_proba.call_args[0][0], expected.to_numpy(dtype=float))
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from splits import (date_cutoff_split, walk_forward_folds, player_group_folds, holdout_split, run_folds, cv_folds,
+                    _fit_eval_fold)
+
+
+def _meta(n_players=12, n_games=20):
+    rng = np.random.default_rng(0)
+    rows = []
+    for p in range(n_players):
+        dates = pd.Timestamp('2024-04-01') + pd.to_timedelta(np.sort(rng.choice(180, n_games, replace=False)), unit='D')
+        rows += [(f'Player {p}', d) for d in dates]
+    meta = pd.DataFrame(rows, columns=['player_name', 'game_date'])
+    y = (rng.random(len(meta)) < 0.2).astype(int)
+    return meta, y
+
+
+def test_date_split_has_no_future_rows_in_train():
+    meta, _ = _meta()
+    train_idx, test_idx = date_cutoff_split(meta['game_date'], '2024-08-01')
+    assert len(train_idx) + len(test_idx) == len(meta)
+    assert meta['game_date'].iloc[train_idx].max() < pd.Timestamp('2024-08-01')
+    assert meta['game_date'].iloc[test_idx].min() >= pd.Timestamp('2024-08-01')
+
+
+def test_walk_forward_folds_respect_order_and_gap():
+    meta, _ = _meta()
+    folds = walk_forward_folds(meta['game_date'], n_folds=4, gap_days=7)
+    assert len(folds) == 4
+    for train_idx, test_idx in folds:
+        train_max = meta['game_date'].iloc[train_idx].max()
+        test_min = meta['game_date'].iloc[test_idx].min()
+        assert (test_min - train_max).days > 7
+
+
+def test_player_folds_keep_players_together():
+    meta, y = _meta()
+    folds = player_group_folds(meta['player_name'], n_folds=4)
+    seen = set()
+    for train_idx, test_idx in folds:
+        test_players = set(meta['player_name'].iloc[test_idx])
+        assert not test_players & set(meta['player_name'].iloc[train_idx])
+        assert not test_players & seen
+        seen |= test_players
+    assert seen == set(meta['player_name'])
+
+    train_idx, test_idx = holdout_split('player', meta, y, test_size=0.25)
+    assert len(train_idx) + len(test_idx) == len(meta)
+
+
+@pytest.mark.parametrize('test_size', [0.0, 1.0])
+def test_walk_forward_holdout_without_test_or_train_dates_raises(test_size):
+    meta, y = _meta()
+    with pytest.raises(ValueError, match='walk_forward'):
+        holdout_split('walk_forward', meta, y, test_size=test_size)
+
+
+
+def test_parallel_folds_fit_single_threaded_models():
+    from functools import partial
+    from xgboost import XGBClassifier
+
+    meta, y = _meta()
+    X = np.random.default_rng(1).normal(size=(len(y), 3))
+    folds = cv_folds('random', meta, y, n_folds=3)
+    make_model = partial(XGBClassifier, n_estimators=5, n_jobs=4)
+    models = []
+
+    def recorded():
+        models.append(make_model())
+        return models[-1]
+
+    assert _fit_eval_fold(recorded, X, y, *folds[0], model_threads=1) is not None
+    assert _fit_eval_fold(recorded, X, y, *folds[0]) is not None
+    assert [m.get_params()['n_jobs'] for m in models] == [1, 4]
+    assert len(run_folds(make_model, X, y, folds, n_jobs=2)) == 3
+
+
+def test_fold_preprocessing_is_fit_on_the_training_rows_only():
+    from functools import partial
+    from xgboost import XGBClassifier
+    from preprocessing import FeaturePipeline
+
+    meta, y = _meta()
+    X = np.random.default_rng(1).normal(size=(len(y), 3))
+    train_idx, test_idx = cv_folds('random', meta, y, n_folds=3)[0]
+    X[test_idx] += 100
+    pipelines = []
+
+    def preprocess():
+        pipelines.append(FeaturePipeline(['a', 'b', 'c']))
+        return pipelines[-1]
+
+    assert _fit_eval_fold(partial(XGBClassifier, n_estimators=5), X, y, train_idx, test_idx,
+                          preprocess=preprocess) is not None
+    np.testing.assert_allclose(pipelines[0].mean_, X[train_idx].mean(axis=0), rtol=1e-5)
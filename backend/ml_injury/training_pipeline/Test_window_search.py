@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from window_search import games_from_end, window_masks
+
+
+def test_window_masks_match_groupby_tail():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'player_name': rng.choice(['A', 'B', 'C', 'D'], 200),
+        'game_date': pd.Timestamp('2024-04-01') + pd.to_timedelta(rng.permutation(200), unit='D'),
+    })
+    df = df.sort_values(['player_name', 'game_date']).reset_index(drop=True)
+    masks = window_masks(games_from_end(df), [3, 7, 60])
+    for w, mask in masks.items():
+        expected = df.groupby('player_name').tail(w)
+        assert df.index[mask].tolist() == expected.index.tolist()
+
+
+def test_custom_target_col_is_not_a_feature(monkeypatch):
+    import window_search
+    from synthetic_data import synthetic_games
+
+    df = synthetic_games(2, 1, seed=1).rename(columns={'result': 'label'})
+    seen = {}
+
+    def fake_evaluate(X, y, groups, masks, **kwargs):
+        seen['X'], seen['y'] = X, y
+        return {w: 0.5 for w in masks}
+
+    monkeypatch.setattr(window_search, 'evaluate_windows', fake_evaluate)
+    window_search.select_best_window(df, [5], target_col='label')
+
+    X, y = seen['X'], seen['y']
+    assert X.shape[1] == df.select_dtypes(include='number').shape[1] - 1
+    assert not any(np.array_equal(X[:, j], y) for j in range(X.shape[1]))
+
+
+def test_cli_search_records_best_window_in_metadata(tmp_path, monkeypatch):
+    import json
+    import window_search
+    from synthetic_data import synthetic_games
+
+    csv_path = tmp_path / 'games.csv'
+    synthetic_games(2, 1, seed=1).to_csv(csv_path, index=False)
+    metadata_path = tmp_path / 'metadata.txt'
+    metadata_path.write_text(json.dumps({'test_cutoff_date': '2024-08-01'}))
+    # No --target_col: the default has to be a column the datasets have
+    monkeypatch.setattr('sys.argv', ['window_search.py', '--path', str(csv_path), '--windows', '5', '20', '60',
+                                     '--n_folds', '3', '--n_jobs', '1', '--metadata_path', str(metadata_path)])
+    window_search.main()
+
+    metadata = json.loads(metadata_path.read_text())
+    assert metadata['test_cutoff_date'] == '2024-08-01'
+    assert metadata['windows_summary'] and set(metadata['windows_summary']) <= {'5', '20', '60'}
+    assert str(metadata['best_W']) in metadata['windows_summary']
+    assert metadata['windows_summary'][str(metadata['best_W'])] == max(metadata['windows_summary'].values())
@@ -1,58 +1,62 @@
-# This is a revised and expanded version of our injury modeling framework.
-# Core changes:
-# - Introduced ACWR and velocity/spin deltas
-# - Enriched workload and fatigue signals
-# - Created personalized player baselines for deviation analysis
-# - Replaced fragmented block insertions with optimized pd.concat approach
+# Legacy feature API, kept for old scripts and imports. The features are declared once in
+# feature_registry; this module only maps the old column names (player_id, pitches_thrown,
+# per-pitch release columns, velo_delta/spin_delta) onto them.
+
+from functools import wraps
 
 import pandas as pd
-import numpy as np
+
+import feature_engineering
+
+LEGACY_KEY = 'player_id'
 
 
+def _legacy(compute):
+    @wraps(compute)
+    def wrapper(df, *args, **kwargs):
+        # The registry groups players by player_name
+        keyed = LEGACY_KEY in df.columns and 'player_name' not in df.columns
+        if keyed:
+            df = df.rename(columns={LEGACY_KEY: 'player_name'})
+        df = compute(df, *args, **kwargs)
+        return df.rename(columns={'player_name': LEGACY_KEY}) if keyed else df
+    return wrapper
+
+
+@_legacy
 def compute_acwr(df, pitch_col='pitches_thrown', acute_w=3, chronic_w=10):
     """
     Compute Acute:Chronic Workload Ratio per player using rolling pitch counts.
     """
-    df = df.sort_values(['player_id', 'game_date'])
-    df['acute_workload'] = df.groupby('player_id')[pitch_col].transform(lambda x: x.rolling(acute_w, min_periods=1).mean())
-    df['chronic_workload'] = df.groupby('player_id')[pitch_col].transform(lambda x: x.rolling(chronic_w, min_periods=1).mean())
-    df['acwr'] = df['acute_workload'] / (df['chronic_workload'] + 1e-6)
-    return df
+    return feature_engineering.compute_acwr(df, pitch_col, acute_w, chronic_w)
 
- 
+
+@_legacy
 def compute_velocity_deltas(df, velo_col='release_speed', window=5):
     """
     For each pitcher, compute deviation in velocity from rolling baseline.
     """
-    df = df.sort_values(['player_id', 'game_date'])
-    rolling_mean = df.groupby('player_id')[velo_col].transform(lambda x: x.rolling(window, min_periods=1).mean())
-    df['velo_delta'] = df[velo_col] - rolling_mean
-    return df
+    df = feature_engineering.compute_deltas(df, velo_col, window)
+    return df.rename(columns={f'{velo_col}_delta': 'velo_delta'})
 
 
+@_legacy
 def compute_spin_deltas(df, spin_col='release_spin_rate', window=5):
-    df = df.sort_values(['player_id', 'game_date'])
-    rolling_mean = df.groupby('player_id')[spin_col].transform(lambda x: x.rolling(window, min_periods=1).mean())
-    df['spin_delta'] = df[spin_col] - rolling_mean
-    return df
+    df = feature_engineering.compute_deltas(df, spin_col, window)
+    return df.rename(columns={f'{spin_col}_delta': 'spin_delta'})
 
 
+@_legacy
 def compute_release_consistency(df, relx='release_pos_x', rely='release_pos_y', window=5):
     """
     Compute release point consistency: rolling std of x and y release locations.
     """
-    df = df.sort_values(['player_id', 'game_date'])
-    df['relx_std'] = df.groupby('player_id')[relx].transform(lambda x: x.rolling(window, min_periods=1).std())
-    df['rely_std'] = df.groupby('player_id')[rely].transform(lambda x: x.rolling(window, min_periods=1).std())
-    df['release_var'] = df['relx_std'] + df['rely_std']
-    return df
+    return feature_engineering.compute_release_consistency(df, relx, rely, window)
 
 
+@_legacy
 def compute_rest_days(df):
-    df = df.sort_values(['player_id', 'game_date'])
-    df['game_date'] = pd.to_datetime(df['game_date'])
-    df['days_rest'] = df.groupby('player_id')['game_date'].diff().dt.days.fillna(0)
-    return df
+    return feature_engineering.compute_rest_days(df)
 
 
 def enrich_features(df):
@@ -1,62 +1,294 @@
 # backend/ml_injury/training_pipeline/app.py
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Response, g, request, jsonify
 from flask_cors import CORS
+import json
+import logging
 import os
 import sys
+import time
+from pathlib import Path
+
+import pandas as pd
 
 # Import your ML functions
-from flag_injury_risks import run_inference_on_csv
+from flag_injury_risks import (run_inference_on_csv, score_rows, get_history_store, history_scores, load_model,
+                               prediction_cache)
+from metrics import REGISTRY, REQUEST_SECONDS, timed
+from model_registry import get_registry
+
+logger = logging.getLogger('ml_api')
+bp = Blueprint('ml_api', __name__)
+
+STREAM_CHUNK_ROWS = 1000
+DATE_FORMAT = '%Y-%m-%d'
+# Directory a /score request's history_path must be inside; ML_HISTORY_PATH (set by the
+# operator) isn't restricted
+DATA_DIR = Path(os.environ.get('ML_DATA_DIR', '/app/backend/ml_injury/final_dataset'))
+
+@bp.before_request
+def _start_timer():
+    g.started = time.perf_counter()
+
+@bp.after_request
+def _record_latency(response):
+    # Streamed bodies are still being sent at this point; this measures time to first byte
+    if 'started' in g:
+        REQUEST_SECONDS.observe(time.perf_counter() - g.started, endpoint=request.endpoint or 'unknown')
+    return response
+
+def _non_negative_int(params, name):
+    value = params.get(name)
+    if value is None:
+        return None
+    if isinstance(value, (int, str)) and not isinstance(value, bool):
+        try:
+            number = int(value)
+        except ValueError:
+            number = -1
+        if number >= 0:
+            return number
+    raise ValueError(f"{name} must be a non-negative integer, got {value!r}")
+
+def _name_list(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    values = [value] if isinstance(value, str) else value
+    if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+        raise ValueError(f"{name} must be a string or a list of strings")
+    return values
+
+def _selection(params):
+    """The optional /predict filters, validated up front; raises ValueError for a 400."""
+    return {
+        'player_name': _name_list(params, 'player_name'),
+        'risk_level': _name_list(params, 'risk_level'),
+        'top_k': _non_negative_int(params, 'top_k'),
+        'offset': _non_negative_int(params, 'offset') or 0,
+        'limit': _non_negative_int(params, 'limit'),
+    }
+
+def _select_results(result_df, selection):
+    """
+    Apply the /predict filters to the (probability-sorted) results:
+    player_name, risk_level, top_k, then offset/limit.
+    """
+    if selection['player_name']:
+        result_df = result_df[result_df['player_name'].isin(selection['player_name'])]
+    if selection['risk_level'] and 'risk_level' in result_df.columns:
+        result_df = result_df[result_df['risk_level'].isin(selection['risk_level'])]
+    if selection['top_k'] is not None:
+        result_df = result_df.head(selection['top_k'])
+    offset, limit = selection['offset'], selection['limit']
+    return result_df.iloc[offset:None if limit is None else offset + limit]
+
+def _format_dates(result_df):
+    # game_date goes out as ISO 8601 (YYYY-MM-DD) in JSON and NDJSON bodies alike
+    if 'game_date' in result_df.columns and pd.api.types.is_datetime64_any_dtype(result_df['game_date']):
+        return result_df.assign(game_date=result_df['game_date'].dt.strftime(DATE_FORMAT))
+    return result_df
 
-app = Flask(__name__)
-CORS(app)
+def _ndjson_chunks(result_df):
+    # Serialize a chunk at a time so the response starts immediately and memory stays flat
+    for start in range(0, len(result_df), STREAM_CHUNK_ROWS):
+        records = _format_dates(result_df.iloc[start:start + STREAM_CHUNK_ROWS]).to_dict(orient='records')
+        # Same values (full float precision) as the JSON body
+        yield ''.join(json.dumps(record) + '\n' for record in records)
 
-@app.route('/predict', methods=['POST'])
+@bp.route('/predict', methods=['POST'])
 def predict_injury_risk():
     try:
-        print("=== /predict endpoint called ===", file=sys.stderr, flush=True)
-        data = request.get_json()
-        print(f"Request data: {data}", file=sys.stderr, flush=True)
+        data = request.get_json(silent=True) or {}
+        # Request bodies are only formatted when debug logging is on, keeping it off the hot path
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("predict request", extra={'fields': {'body': data}})
         
         csv_path = data.get('csv_path')
         top_k_ratio = data.get('top_k_ratio', 0.10)
         start_date = data.get('start_date', '2024-04-01')
         
-        print(f"CSV path: {csv_path}", file=sys.stderr, flush=True)
-        
         if not csv_path:
             return jsonify({'error': 'csv_path is required'}), 400
+        try:
+            selection = _selection(data)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
         # Check if file exists
         if not os.path.exists(csv_path):
-            print(f"File not found: {csv_path}", file=sys.stderr, flush=True)
+            logger.warning("csv not found", extra={'fields': {'csv_path': csv_path}})
             return jsonify({'error': f'CSV file not found: {csv_path}'}), 404
         
-        print(f"File found, running inference...", file=sys.stderr, flush=True)
         # Run inference
-        result_df = run_inference_on_csv(csv_path, top_k_ratio, start_date)
-        
-        print(f"Inference complete, converting to dict...", file=sys.stderr, flush=True)
+        started = time.perf_counter()
+        result_df = run_inference_on_csv(csv_path, top_k_ratio, start_date, data.get('tier_by'),
+                                         data.get('score_date'), data.get('end_date'))
+        total = len(result_df)
+        result_df = _select_results(result_df, selection)
+
+        if data.get('stream') or data.get('format') == 'ndjson':
+            _log_inference(csv_path, total, len(result_df), started, streamed=True)
+            return Response(_ndjson_chunks(result_df), mimetype='application/x-ndjson',
+                            headers={'X-Total-Count': str(total)})
+
         # Convert to dict format
-        results = result_df.to_dict(orient='records')
+        with timed('serialize', len(result_df)):
+            results = _format_dates(result_df).to_dict(orient='records')
+            response = jsonify({
+                'success': True,
+                'total': total,
+                'data': results
+            })
+        _log_inference(csv_path, total, len(results), started, streamed=False)
+        return response
         
-        print(f"Returning {len(results)} results", file=sys.stderr, flush=True)
+    except ValueError as e:
+        # e.g. a tier_by column the file doesn't have
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.exception("Error in predict_injury_risk: %s", e)
         return jsonify({
-            'success': True,
-            'data': results
-        })
-        
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def _parse_rows():
+    # JSON body {"rows": [...], ...} or newline-delimited JSON rows (params in the query string)
+    if request.mimetype in ('application/x-ndjson', 'application/ndjson'):
+        lines = request.get_data(as_text=True).splitlines()
+        return [json.loads(line) for line in lines if line.strip()], request.args
+    data = request.get_json() or {}
+    return data.get('rows') or [], data
+
+def _history_path(params):
+    """The /score history file: the request's history_path, inside DATA_DIR, or ML_HISTORY_PATH."""
+    requested = params.get('history_path')
+    if not requested:
+        configured = os.environ.get('ML_HISTORY_PATH')
+        if not configured:
+            raise ValueError('history_path is required (or set ML_HISTORY_PATH)')
+        return configured
+    path = Path(requested).resolve()
+    if not path.is_relative_to(DATA_DIR.resolve()):
+        raise ValueError(f'history_path must be inside {DATA_DIR}')
+    return str(path)
+
+@bp.route('/score', methods=['POST'])
+def score_game_rows():
+    try:
+        rows, params = _parse_rows()
+        if not rows:
+            return jsonify({'error': 'rows are required'}), 400
+
+        df = pd.DataFrame.from_records(rows)
+        missing = [c for c in ('player_name', 'game_date') if c not in df.columns]
+        if missing:
+            return jsonify({'error': f'rows are missing required fields: {missing}'}), 400
+        df['game_date'] = pd.to_datetime(df['game_date'])
+
+        clf, imputer, scaler, features = load_model()
+        if clf is None:
+            return jsonify({'success': False, 'error': 'model not loaded'}), 503
+
+        # Per-player history for the rolling features: without it every game would be scored as
+        # a player's first
+        history_path = _history_path(params)
+        if not os.path.exists(history_path):
+            return jsonify({'error': f'history file not found: {history_path}'}), 404
+        store = get_history_store(history_path)
+
+        top_k_ratio = float(params.get('top_k_ratio', 0.10))
+        # Tiered against the model's scores over the history, not just the rows in this request
+        reference = history_scores(history_path, clf, imputer, scaler, features)
+        result_df = score_rows(df, clf, imputer, scaler, features, store=store, top_k_ratio=top_k_ratio,
+                               tier_by=params.get('tier_by'), history_path=history_path, reference=reference)
+        with timed('serialize', len(result_df)):
+            return jsonify({
+                'success': True,
+                'model_version': get_registry().version(),
+                'data': _format_dates(result_df).to_dict(orient='records')
+            })
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
-        print(f"Error in predict_injury_risk: {str(e)}", file=sys.stderr, flush=True)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        logger.exception("Error in score_game_rows: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
-@app.route('/health', methods=['GET'])
+@bp.route('/metrics', methods=['GET'])
+def metrics():
+    # Prometheus text exposition of the stage timers, row counts, cache and fallback counters
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+@bp.route('/health', methods=['GET'])
 def health_check():
-    return jsonify({'status': 'ok'}), 200
+    registry = get_registry()
+    bundle = registry.get()
+    return jsonify({
+        'status': 'ok',
+        'model_loaded': bundle is not None,
+        'model_version': bundle.version if bundle is not None else None,
+        'prediction_cache': prediction_cache.stats(),
+        'artifacts_dir': str(registry.artifacts_dir)
+    }), 200
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the message, level, logger and any extra 'fields'."""
+
+    def format(self, record):
+        payload = {
+            'ts': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        payload.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            payload['exc'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def configure_logging(level=None, fmt=None):
+    """ML_LOG_LEVEL (default INFO) and ML_LOG_FORMAT ('json' or 'text') control service logging."""
+    level = level or os.environ.get('ML_LOG_LEVEL', 'INFO')
+    fmt = fmt or os.environ.get('ML_LOG_FORMAT', 'json')
+    handler = logging.StreamHandler(sys.stderr)
+    if fmt == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s %(message)s'))
+    logger.handlers[:] = [handler]
+    logger.setLevel(level.upper())
+    logger.propagate = False
+
+
+def _log_inference(csv_path, total, returned, started, streamed):
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("predict", extra={'fields': {
+            'csv_path': csv_path, 'rows': total, 'returned': returned, 'streamed': streamed,
+            'ms': round((time.perf_counter() - started) * 1000, 1),
+        }})
+
+
+def create_app():
+    """
+    Build the Flask app and warm the model cache.
+
+    Under gunicorn with preload_app (see gunicorn.conf.py) this runs once in the master, so
+    every forked worker shares the loaded model pages copy-on-write.
+    """
+    configure_logging()
+    flask_app = Flask(__name__)
+    CORS(flask_app)
+    flask_app.register_blueprint(bp)
+    # Warm the model cache once at startup instead of on the first request
+    get_registry().load()
+    return flask_app
+
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5002, debug=True)
\ No newline at end of file
+    # Development server; production runs `gunicorn -c gunicorn.conf.py wsgi:app`
+    create_app().run(host='0.0.0.0', port=int(os.environ.get('ML_PORT', 5002)),
+            debug=os.environ.get('FLASK_DEBUG') == '1', threaded=True)
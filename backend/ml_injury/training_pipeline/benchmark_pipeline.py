@@ -0,0 +1,169 @@
+import argparse
+import importlib
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from dataset_store import apply_dtype_policy
+from feature_engineering import enrich_features
+from feature_registry import compute_features
+from model_registry import ARTIFACTS_DIR, ModelRegistry
+from synthetic_data import synthetic_games, synthetic_pitches
+
+# game_aggregation.py lives with the Statcast scripts; the stage is skipped where it isn't shipped
+AGGREGATION_DIR = Path(__file__).parent.parent / 'second_dataset'
+BASELINE_PATH = Path(__file__).parent.parent / 'artifacts' / 'benchmark_baseline.json'
+DEFAULT_THRESHOLD = 0.25
+# Stages faster than this are too noisy to compare times on
+MIN_SECONDS = 0.02
+# Trainer module -> the feature_cap its CLI uses by default
+TRAINERS = {'train_injury_baseline': 300, 'train_injury_prob': 300, 'train_injury_precise': None}
+
+
+def measure(fn, make_input, rows, repeat=3):
+    """Best-of-repeat wall time, then one tracemalloc run for peak memory; input building is not counted."""
+    seconds = float('inf')
+    for _ in range(repeat):
+        inp = make_input()
+        start = time.perf_counter()
+        fn(inp)
+        seconds = min(seconds, time.perf_counter() - start)
+    inp = make_input()
+    tracemalloc.start()
+    try:
+        fn(inp)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'rows': rows, 'seconds': round(seconds, 4), 'rows_per_s': round(rows / seconds, 1),
+            'peak_mb': round(peak / 2**20, 2)}
+
+
+def _aggregate_stage():
+    if not (AGGREGATION_DIR / 'game_aggregation.py').exists():
+        return None
+    if str(AGGREGATION_DIR) not in sys.path:
+        sys.path.append(str(AGGREGATION_DIR))
+    return importlib.import_module('game_aggregation').aggregate_game_level
+
+
+def _predict_risk_stage(bundle):
+    from flag_injury_risks import predict_risk
+
+    def run(df):
+        out = predict_risk(df, bundle.clf, bundle.preprocessor, None, bundle.features)
+        # predict_risk swallows errors and returns mock rows; timing those would hide the failure
+        if 'injury_risk_prob' not in out.columns:
+            raise RuntimeError("predict_risk fell back to mock output; see the error it printed")
+        return out
+    return run
+
+
+def build_stages(games, pitches, artifacts_dir, only=None):
+    """
+    name -> (fn, make_input, rows) for every benchmarked step, or just the ones in only;
+    the inputs (enriched frames, the model) are only built for the stages that are kept.
+    """
+    def wanted(name):
+        return only is None or name in only
+
+    stages = {}
+    if wanted('aggregate_game_level') and pitches is not None:
+        aggregate = _aggregate_stage()
+        if aggregate is not None:
+            stages['aggregate_game_level'] = (aggregate, pitches.copy, len(pitches))
+
+    trainer_precise = importlib.import_module('train_injury_precise')
+    if wanted('enrich_features'):
+        stages['enrich_features'] = (enrich_features, games.copy, len(games))
+    if wanted('add_trend_features'):
+        enriched = enrich_features(games.copy())
+        stages['add_trend_features'] = (trainer_precise.add_trend_features, enriched.copy, len(games))
+    if wanted('compute_features'):
+        # Just the features the shipped (precise) model reads, as predict_risk computes them
+        stages['compute_features'] = (lambda df: compute_features(df, trainer_precise.FEATURES), games.copy, len(games))
+
+    if wanted('predict_risk'):
+        bundle = ModelRegistry(artifacts_dir).get()
+        if bundle is not None:
+            stages['predict_risk'] = (_predict_risk_stage(bundle), games.copy, len(games))
+
+    trainers = [name for name in TRAINERS if wanted(f'{name}.build_dataset')]
+    if trainers:
+        lean = apply_dtype_policy(games)
+    for name in trainers:
+        build = importlib.import_module(name).build_dataset
+        stages[f'{name}.build_dataset'] = (lambda df, build=build, cap=TRAINERS[name]: build(df, cap), lean.copy,
+                                           len(games))
+    return stages
+
+
+def run_benchmarks(teams=1, seasons=1, seed=0, repeat=3, only=None, artifacts_dir=ARTIFACTS_DIR):
+    games = synthetic_games(teams, seasons, seed=seed)
+    wants_aggregate = only is None or 'aggregate_game_level' in only
+    pitches = synthetic_pitches(teams, seasons, seed=seed) if wants_aggregate else None
+    results = {}
+    for name, (fn, make_input, rows) in build_stages(games, pitches, artifacts_dir, only).items():
+        results[name] = measure(fn, make_input, rows, repeat)
+        r = results[name]
+        print(f"{name:40s} {r['seconds']:8.3f}s {r['rows_per_s']:>12,.0f} rows/s {r['peak_mb']:9.1f} MB peak")
+    return {'scale': {'teams': teams, 'seasons': seasons, 'seed': seed, 'games': len(games)}, 'stages': results}
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Regression messages for stages whose time or peak memory grew by more than threshold over the baseline."""
+    regressions = []
+    for name, current in results['stages'].items():
+        base = baseline['stages'].get(name)
+        if base is None:
+            continue
+        if max(current['seconds'], base['seconds']) >= MIN_SECONDS and current['seconds'] > base['seconds'] * (1 + threshold):
+            regressions.append(f"{name}: {current['seconds']:.3f}s vs {base['seconds']:.3f}s baseline")
+        if current['peak_mb'] > base['peak_mb'] * (1 + threshold):
+            regressions.append(f"{name}: {current['peak_mb']:.1f} MB peak vs {base['peak_mb']:.1f} MB baseline")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time and memory-profile the data, feature and scoring stages on synthetic data')
+    parser.add_argument('--teams', type=int, default=1, help='1 (one club) to 30 (the league)')
+    parser.add_argument('--seasons', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--stages', nargs='*', default=None, help='only these stages (default: all)')
+    parser.add_argument('--artifacts_dir', default=str(ARTIFACTS_DIR), help='model for the predict_risk stage')
+    parser.add_argument('--baseline', default=str(BASELINE_PATH))
+    parser.add_argument('--update_baseline', action='store_true', help='save this run as the baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='allowed slowdown/memory growth')
+    parser.add_argument('--out_path', default=None, help='also write this run as JSON')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.teams, args.seasons, args.seed, args.repeat, args.stages, args.artifacts_dir)
+    if args.out_path:
+        Path(args.out_path).write_text(json.dumps(results, indent=2))
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2))
+        print(f"Saved baseline to {baseline_path}")
+        return
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --update_baseline to record one")
+        return
+    baseline = json.loads(baseline_path.read_text())
+    if baseline['scale'] != results['scale']:
+        print(f"Baseline was recorded at {baseline['scale']}, not {results['scale']}; skipping comparison")
+        return
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"Regressions beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"No regressions beyond {args.threshold:.0%} against {baseline_path}")
+
+
+if __name__ == '__main__':
+    main()
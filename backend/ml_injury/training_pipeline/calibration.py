@@ -0,0 +1,69 @@
+import time
+
+import numpy as np
+from sklearn.calibration import CalibratedClassifierCV
+
+from splits import holdout_split, inner_split_scheme
+
+CALIBRATION_MODES = ['cv', 'prefit']
+
+try:
+    from sklearn.frozen import FrozenEstimator
+except ImportError:  # scikit-learn < 1.6
+    FrozenEstimator = None
+
+
+def prefit_calibrator(model, method):
+    """CalibratedClassifierCV around an already fitted model, so it is not refit."""
+    if FrozenEstimator is not None:
+        return CalibratedClassifierCV(estimator=FrozenEstimator(model), method=method)
+    return CalibratedClassifierCV(estimator=model, method=method, cv='prefit')
+
+
+def fit_calibrated(make_model, X, y, method='isotonic', mode='cv', calib_size=0.2, meta=None, scheme='random',
+                   random_state=42):
+    """
+    Fit make_model() and calibrate its probabilities. Returns (model, timings).
+
+    mode='cv'     - CalibratedClassifierCV(cv=3): three boosters, each calibrated on its held-out third.
+    mode='prefit' - one booster fitted on all but a calib_size slice, which fits the calibration map.
+                    With meta (player_name, game_date rows) the slice follows the given split scheme.
+    method=None skips calibration and fits the bare model on all rows.
+    """
+    y = np.asarray(y)
+    timings = {}
+    start = time.perf_counter()
+    if not method:
+        model = make_model()
+        model.fit(X, y)
+        timings['fit'] = time.perf_counter() - start
+    elif mode == 'cv':
+        model = CalibratedClassifierCV(estimator=make_model(), method=method, cv=3)
+        model.fit(X, y)
+        timings['fit'] = time.perf_counter() - start
+    elif mode == 'prefit':
+        if meta is None:
+            fit_idx, cal_idx = holdout_split('random', np.arange(len(y)), y, calib_size, random_state=random_state)
+        else:
+            fit_idx, cal_idx = holdout_split(inner_split_scheme(scheme), meta, y, calib_size, random_state=random_state)
+        base = make_model()
+        base.fit(X[fit_idx], y[fit_idx])
+        timings['fit'] = time.perf_counter() - start
+        model = prefit_calibrator(base, method)
+        model.fit(X[cal_idx], y[cal_idx])
+        timings['calibrate'] = time.perf_counter() - start - timings['fit']
+    else:
+        raise ValueError(f"Unknown calibration mode: {mode}")
+    timings['total'] = time.perf_counter() - start
+    return model, timings
+
+
+def report_timings(timings, mode):
+    parts = ', '.join(f"{name} {seconds:.1f}s" for name, seconds in timings.items())
+    print(f"Training time ({mode}): {parts}")
+
+
+def add_calibration_args(parser):
+    parser.add_argument('--calibration_mode', choices=CALIBRATION_MODES, default='cv',
+                        help="'prefit' fits one booster and calibrates on a held-out slice")
+    parser.add_argument('--calib_size', type=float, default=0.2, help='held-out share for --calibration_mode prefit')
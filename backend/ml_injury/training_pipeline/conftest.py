@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def sample_frame():
+    """Six pitchers' game rows in shuffled order, with some missing release values."""
+    return _sample_frame()
+
+
+def _sample_frame(n_players=6, n_games=25, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for p in range(n_players):
+        dates = pd.Timestamp('2024-04-01') + pd.to_timedelta(np.sort(rng.choice(180, n_games, replace=False)), unit='D')
+        for d in dates:
+            rows.append({
+                'player_name': f'Pitcher {p}',
+                'game_date': d,
+                'total_pitches': int(rng.integers(10, 110)),
+                'release_speed_mean_all': rng.normal(94, 2),
+                'release_spin_rate_mean_all': rng.normal(2300, 80),
+                'release_pos_x_mean_all': rng.normal(-2, 0.1),
+                'release_pos_y_mean_all': rng.normal(54, 0.1),
+            })
+    df = pd.DataFrame(rows)
+    # Sprinkle missing values and shuffle so the engine has to sort
+    for col in ['release_speed_mean_all', 'release_pos_x_mean_all']:
+        df.loc[rng.random(len(df)) < 0.1, col] = np.nan
+    return df.sample(frac=1, random_state=seed)
@@ -0,0 +1,170 @@
+import argparse
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+KEY_COLS = ['player_name', 'game_date']
+LABEL_COL = 'result'
+SEASON_COL = 'season'
+INT16 = np.iinfo(np.int16)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError("pyarrow is required for Parquet/Feather storage (pip install pyarrow)") from e
+
+
+def storage_format(path):
+    path = Path(path)
+    if path.is_dir() or path.suffix in ('.parquet', '.pq'):
+        return 'parquet'
+    if path.suffix in ('.feather', '.arrow'):
+        return 'feather'
+    return 'csv'
+
+
+def to_storage_types(df):
+    """float32 feature columns and datetime game_date; the label and integer counts are kept as-is."""
+    float_cols = [c for c in df.select_dtypes(include=['float64']).columns if c != LABEL_COL]
+    # Cast the float columns as one block so the result isn't a frame of single-column blocks
+    df = pd.concat([df.drop(columns=float_cols), df[float_cols].astype(np.float32)], axis=1)[df.columns]
+    if 'game_date' in df.columns:
+        df['game_date'] = pd.to_datetime(df['game_date'])
+    return df
+
+
+def apply_dtype_policy(df):
+    """
+    Memory-lean dtypes for the wide game-level frame: float32 features (the label stays float64),
+    categorical player_name, int16 integer counts that fit and datetime64 game_date.
+    """
+    dtypes = {c: np.float32 for c in df.select_dtypes(include=['float64']).columns if c != LABEL_COL}
+    for col in df.select_dtypes(include=['integer']).columns:
+        values = df[col]
+        if len(values) and values.min() >= INT16.min and values.max() <= INT16.max:
+            dtypes[col] = np.int16
+    if 'player_name' in df.columns:
+        dtypes['player_name'] = 'category'
+    df = df.astype(dtypes)
+    if 'game_date' in df.columns:
+        df['game_date'] = pd.to_datetime(df['game_date'])
+    # One block per dtype, so the feature columns added later don't fragment the frame
+    return df.copy()
+
+
+def memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 2 ** 20
+
+
+def write_dataset(df, path, partition_by=(SEASON_COL,), by_player=False):
+    """
+    Write the game-level dataset as Parquet (partitioned by season, optionally by player),
+    Feather or CSV depending on the path. Existing output at path is replaced.
+    """
+    fmt = storage_format(path) if Path(path).suffix else 'parquet'
+    path = Path(path)
+    if fmt == 'csv':
+        df.to_csv(path, index=False)
+        return path
+    _require_pyarrow()
+    df = to_storage_types(df)
+    if fmt == 'feather':
+        df.reset_index(drop=True).to_feather(path)
+        return path
+
+    partition_cols = list(partition_by or [])
+    if SEASON_COL in partition_cols and SEASON_COL not in df.columns:
+        df = df.assign(**{SEASON_COL: df['game_date'].dt.year.astype('int16')})
+    if by_player and 'player_name' not in partition_cols:
+        partition_cols.append('player_name')
+    if path.exists():
+        shutil.rmtree(path) if path.is_dir() else path.unlink()
+    df.to_parquet(path, index=False, partition_cols=partition_cols or None)
+    return path
+
+
+def _parquet_filters(start_date, end_date, players, partitioned_by_season):
+    filters = []
+    if start_date is not None:
+        start = pd.Timestamp(start_date)
+        filters.append(('game_date', '>=', start))
+        if partitioned_by_season:
+            filters.append((SEASON_COL, '>=', start.year))
+    if end_date is not None:
+        end = pd.Timestamp(end_date)
+        filters.append(('game_date', '<=', end))
+        if partitioned_by_season:
+            filters.append((SEASON_COL, '<=', end.year))
+    if players is not None:
+        filters.append(('player_name', 'in', list(players)))
+    return filters or None
+
+
+def load_game_frame(path, columns=None, start_date=None, end_date=None, players=None, lean=False):
+    """
+    Load the game-level dataset from CSV, Feather or (partitioned) Parquet.
+
+    columns projects the read to the given columns (names missing from the file are ignored),
+    and start_date/end_date/players filter rows. For Parquet the filters are pushed down, so
+    only matching season/player partitions and row groups are read. lean=True applies
+    apply_dtype_policy and prints the before/after memory footprint.
+    """
+    fmt = storage_format(path)
+    wanted = None if columns is None else list(dict.fromkeys(list(KEY_COLS) + list(columns)))
+
+    if fmt == 'csv':
+        usecols = None if wanted is None else (lambda c: c in wanted)
+        df = pd.read_csv(path, usecols=usecols, parse_dates=['game_date'])
+    else:
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+        if fmt == 'feather':
+            import pyarrow.ipc as ipc
+            with ipc.open_file(path) as reader:
+                available = reader.schema.names
+            df = pd.read_feather(path, columns=None if wanted is None else [c for c in wanted if c in available])
+        else:
+            available = pq.ParquetDataset(path).schema.names
+            read_cols = None if wanted is None else [c for c in wanted if c in available]
+            df = pd.read_parquet(path, columns=read_cols,
+                                 filters=_parquet_filters(start_date, end_date, players, SEASON_COL in available))
+            # Partition keys come back as categoricals; the rest of the pipeline expects plain values
+            if SEASON_COL in df.columns and (columns is None or SEASON_COL not in columns):
+                df = df.drop(columns=[SEASON_COL])
+            if isinstance(df['player_name'].dtype, pd.CategoricalDtype) and not lean:
+                df['player_name'] = df['player_name'].astype(str)
+        df['game_date'] = pd.to_datetime(df['game_date'])
+
+    if start_date is not None:
+        df = df[df['game_date'] >= pd.to_datetime(start_date)]
+    if end_date is not None:
+        df = df[df['game_date'] <= pd.to_datetime(end_date)]
+    if players is not None:
+        df = df[df['player_name'].isin(list(players))]
+    if lean:
+        before = memory_mb(df)
+        df = apply_dtype_policy(df)
+        print(f"Memory: {before:.1f} MB -> {memory_mb(df):.1f} MB ({len(df)} rows x {df.shape[1]} columns)")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert the game-level dataset between CSV and Parquet/Feather')
+    parser.add_argument('--src', required=True, help='CSV, Feather file or Parquet file/directory')
+    parser.add_argument('--dst', required=True, help='destination; a directory or .parquet path writes Parquet')
+    parser.add_argument('--partition_by', nargs='*', default=[SEASON_COL])
+    parser.add_argument('--by_player', action='store_true', help='also partition Parquet output by player')
+    args = parser.parse_args()
+
+    df = load_game_frame(args.src)
+    write_dataset(df, args.dst, partition_by=args.partition_by, by_player=args.by_player)
+    print(f"Wrote {len(df)} rows x {df.shape[1]} columns to {args.dst}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+import argparse
+import io
+import json
+from pathlib import Path
+
+import joblib
+import numpy as np
+import xgboost as xgb
+
+from preprocessing import FeaturePipeline, load_preprocessor
+
+FORMAT_VERSION = 1
+FAST_FILE = 'injury_fast_predictor.npz'
+
+
+def _unwrap(estimator):
+    # FrozenEstimator (prefit calibration) keeps the fitted model in .estimator
+    while not isinstance(estimator, xgb.XGBModel) and hasattr(estimator, 'estimator'):
+        estimator = estimator.estimator
+    return estimator
+
+
+def _iteration_end(model):
+    # Same tree range XGBClassifier.predict_proba uses: up to best_iteration after early stopping, else all
+    try:
+        return int(model.best_iteration) + 1
+    except AttributeError:
+        return 0
+
+
+def _calibrator_params(calibrator):
+    if hasattr(calibrator, 'X_thresholds_'):
+        return {'kind': 'isotonic', 'x': calibrator.X_thresholds_, 'y': calibrator.y_thresholds_}
+    return {'kind': 'sigmoid', 'a': float(calibrator.a_), 'b': float(calibrator.b_)}
+
+
+class FastPredictor:
+    """
+    The FeaturePipeline, XGBoost boosters and their calibration maps in one object, with the
+    same predict_proba output as the CalibratedClassifierCV + preprocessing pipeline but without
+    sklearn in the scoring path. Input is the raw (unimputed, unscaled) feature matrix in
+    `features` order, or a DataFrame holding those columns.
+    """
+
+    def __init__(self, pipeline, members, source_version=None):
+        self.pipeline = pipeline
+        # members: (booster, iteration_end, calibrator params or None)
+        self.members = members
+        self.source_version = source_version
+
+    @property
+    def features(self):
+        return self.pipeline.features
+
+    @classmethod
+    def from_pipeline(cls, clf, pipeline, source_version=None):
+        members = []
+        if hasattr(clf, 'calibrated_classifiers_'):
+            for calibrated in clf.calibrated_classifiers_:
+                model = _unwrap(calibrated.estimator)
+                members.append((model.get_booster(), _iteration_end(model), _calibrator_params(calibrated.calibrators[0])))
+        else:
+            model = _unwrap(clf)
+            members.append((model.get_booster(), _iteration_end(model), None))
+        return cls(pipeline, members, source_version)
+
+    def predict_proba(self, X):
+        X = self.pipeline.transform(X)
+        p = np.zeros(len(X))
+        for booster, iteration_end, calib in self.members:
+            raw = booster.inplace_predict(X, iteration_range=(0, iteration_end))
+            if calib is None:
+                p += raw
+            elif calib['kind'] == 'isotonic':
+                # np.interp clamps outside [x_min, x_max], like IsotonicRegression(out_of_bounds='clip')
+                p += np.interp(raw, calib['x'], calib['y'])
+            else:
+                # expit(-z) without scipy; logaddexp keeps large |z| from overflowing
+                p += np.exp(-np.logaddexp(0.0, calib['a'] * raw + calib['b']))
+        p /= len(self.members)
+        return np.column_stack([1.0 - p, p])
+
+    def save(self, path):
+        arrays = {'medians': self.pipeline.medians_, 'mean': self.pipeline.mean_, 'scale': self.pipeline.scale_}
+        manifest_members = []
+        for i, (booster, iteration_end, calib) in enumerate(self.members):
+            arrays[f'booster_{i}'] = np.frombuffer(booster.save_raw('ubj'), dtype=np.uint8)
+            entry = {'iteration_end': iteration_end, 'calibration': None}
+            if calib is not None:
+                entry['calibration'] = calib['kind']
+                if calib['kind'] == 'isotonic':
+                    arrays[f'iso_x_{i}'], arrays[f'iso_y_{i}'] = calib['x'], calib['y']
+                else:
+                    entry['a'], entry['b'] = calib['a'], calib['b']
+            manifest_members.append(entry)
+        manifest = {
+            'format_version': FORMAT_VERSION,
+            'source_version': self.source_version,
+            'features': self.features,
+            'dtype': self.pipeline.dtype.name,
+            'members': manifest_members,
+        }
+        arrays['manifest'] = np.frombuffer(json.dumps(manifest).encode(), dtype=np.uint8)
+        # Write to a buffer first so a reader never sees a half-written file
+        buf = io.BytesIO()
+        np.savez(buf, **arrays)
+        path = Path(path)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_bytes(buf.getvalue())
+        tmp.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            manifest = json.loads(data['manifest'].tobytes().decode())
+            if manifest['format_version'] != FORMAT_VERSION:
+                raise ValueError(f"Unsupported fast predictor format {manifest['format_version']}")
+            members = []
+            for i, entry in enumerate(manifest['members']):
+                booster = xgb.Booster()
+                booster.load_model(bytearray(data[f'booster_{i}'].tobytes()))
+                calib = None
+                if entry['calibration'] == 'isotonic':
+                    calib = {'kind': 'isotonic', 'x': data[f'iso_x_{i}'], 'y': data[f'iso_y_{i}']}
+                elif entry['calibration'] == 'sigmoid':
+                    calib = {'kind': 'sigmoid', 'a': entry['a'], 'b': entry['b']}
+                members.append((booster, entry['iteration_end'], calib))
+            pipeline = FeaturePipeline.from_stats(manifest['features'], data['medians'], data['mean'], data['scale'],
+                                                  dtype=manifest.get('dtype', 'float64'))
+            return cls(pipeline, members, manifest.get('source_version'))
+
+
+def export_fast_predictor(artifacts_dir):
+    """Build FAST_FILE next to the joblib artifacts in artifacts_dir; returns its path."""
+    from model_registry import MODEL_FILE, PREPROCESSOR_FILE, _content_hash
+
+    artifacts_dir = Path(artifacts_dir)
+    sources = [artifacts_dir / MODEL_FILE, artifacts_dir / PREPROCESSOR_FILE]
+    clf = joblib.load(sources[0])
+    pipeline = load_preprocessor(sources[1])
+    predictor = FastPredictor.from_pipeline(clf, pipeline, source_version=_content_hash(sources))
+    return predictor.save(artifacts_dir / FAST_FILE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the trained model to the compact fast-predictor artifact')
+    parser.add_argument('--artifacts_dir', default='artifacts')
+    args = parser.parse_args()
+    path = export_fast_predictor(args.artifacts_dir)
+    print(f"Saved fast predictor to {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import joblib
+
+from metrics import cache_result
+
+CACHE_DIR = Path(__file__).parent.parent / 'artifacts' / 'feature_cache'
+DEFAULT_MAX_MB = 2048
+# Modules whose code decides what the enriched dataset looks like; the trainer module that
+# calls cached_dataset (build_dataset, add_trend_features) is added to these
+FEATURE_MODULES = ['dataset_store.py', 'rolling_engine.py', 'feature_state.py', 'feature_registry.py',
+                   'feature_engineering.py', 'preprocessing.py']
+
+
+def file_hash(path):
+    """SHA-256 of a file, or of every file under a (partitioned Parquet) directory."""
+    path = Path(path)
+    files = sorted(p for p in path.rglob('*') if p.is_file()) if path.is_dir() else [path]
+    h = hashlib.sha256()
+    for f in files:
+        h.update(str(f.relative_to(path)).encode() if path.is_dir() else b'')
+        with open(f, 'rb') as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b''):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def code_version(extra_files=()):
+    """Hash of the feature code, so editing a feature definition invalidates the cached datasets."""
+    here = Path(__file__).parent
+    h = hashlib.sha256()
+    for f in [here / name for name in FEATURE_MODULES] + [Path(p) for p in extra_files]:
+        h.update(f.name.encode())
+        h.update(f.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def cache_key(path, code_files=(), params=None):
+    h = hashlib.sha256()
+    h.update(file_hash(path).encode())
+    h.update(code_version(code_files).encode())
+    h.update(json.dumps(params or {}, sort_keys=True, default=str).encode())
+    return h.hexdigest()[:24]
+
+
+def evict(cache_dir, max_bytes, keep=None):
+    """Delete least-recently-used entries (by mtime, refreshed on every hit) until the directory fits max_bytes."""
+    entries = sorted(Path(cache_dir).glob('*.joblib'), key=lambda p: p.stat().st_mtime)
+    total = sum(p.stat().st_size for p in entries)
+    for entry in entries:
+        if total <= max_bytes:
+            break
+        if entry.name == keep:
+            continue
+        total -= entry.stat().st_size
+        entry.unlink()
+        print(f"Feature cache: evicted {entry.name}")
+
+
+def cached_dataset(path, build, code_files=(), params=None, cache_dir=CACHE_DIR, use_cache=True, rebuild=False,
+                   max_mb=DEFAULT_MAX_MB):
+    """
+    build()'s result for the dataset at path, from the cache when the same file was built with
+    the same feature code and params before. Entries are content-addressed (input file hash,
+    feature code version, params) and stored uncompressed with joblib, so a hit is one read of
+    the numpy buffers. rebuild=True recomputes and overwrites the entry; use_cache=False
+    bypasses the cache entirely.
+    """
+    if not use_cache:
+        return build()
+    cache_dir = Path(cache_dir)
+    entry = cache_dir / f'{cache_key(path, code_files, params)}.joblib'
+    if entry.exists() and not rebuild:
+        try:
+            result = joblib.load(entry)
+            os.utime(entry)
+            cache_result('feature', True)
+            print(f"Feature cache hit: {entry.name}")
+            return result
+        except Exception as e:
+            print(f"Feature cache: unreadable {entry.name} ({e}); rebuilding")
+    cache_result('feature', False)
+    print(f"Feature cache {'rebuild' if rebuild else 'miss'}: {entry.name}")
+    result = build()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = entry.with_suffix('.tmp')
+    joblib.dump(result, tmp)
+    tmp.replace(entry)
+    evict(cache_dir, max_mb << 20, keep=entry.name)
+    return result
+
+
+def add_cache_args(parser):
+    parser.add_argument('--no-cache', dest='no_cache', action='store_true',
+                        help='always rebuild the features and do not store them')
+    parser.add_argument('--rebuild', action='store_true', help='rebuild the cached features for this input')
+    parser.add_argument('--cache_dir', default=str(CACHE_DIR))
+    parser.add_argument('--cache_max_mb', type=int, default=DEFAULT_MAX_MB)
+
+
+def dataset_from_args(args, build, code_files=(), params=None):
+    return cached_dataset(args.path, build, code_files, params, cache_dir=args.cache_dir,
+                          use_cache=not args.no_cache, rebuild=args.rebuild, max_mb=args.cache_max_mb)
@@ -0,0 +1,208 @@
+from collections import namedtuple
+
+import pandas as pd
+
+from rolling_engine import GroupedRolling, sort_by_group
+
+# A derived feature: the columns or features it reads, how many of a player's games it looks
+# at (None for same-row arithmetic) and compute(frame) -> Series aligned with frame.df
+FeatureSpec = namedtuple('FeatureSpec', ['name', 'inputs', 'window', 'compute'])
+
+KEY_COLUMNS = ['player_name', 'game_date']
+# Default window lengths (in games) of the declared features; feature_state keeps that much history
+ACUTE_W = 3
+CHRONIC_W = 10
+DELTA_W = 5
+RELEASE_W = 5
+TREND_W = 3
+SPEED_COL = 'release_speed_mean_all'
+SPIN_COL = 'release_spin_rate_mean_all'
+
+
+def prepare_rolling(df, rolling):
+    # Standalone calls sort (once) and build their own engine; enrich_features passes a shared one
+    if rolling is None:
+        if not pd.api.types.is_datetime64_any_dtype(df['game_date']):
+            # Order by real dates, not by the 'M/D/YYYY' strings read from CSV
+            df = df.assign(game_date=pd.to_datetime(df['game_date']))
+        df = sort_by_group(df)
+        rolling = GroupedRolling.from_frame(df)
+    return df, rolling
+
+
+def rolling_mean(name, col, window):
+    return FeatureSpec(name, (col,), window, lambda f: f.mean(col, window))
+
+
+def rolling_std(name, col, window):
+    return FeatureSpec(name, (col,), window, lambda f: f.std(col, window))
+
+
+def difference(name, a, b):
+    return FeatureSpec(name, (a, b), None, lambda f: f[a] - f[b])
+
+
+def rest_specs(fill):
+    # A player's first game has no previous one; enrich_features fills 0, the trend features 5
+    return [FeatureSpec('days_rest', ('game_date',), 2, lambda f: f.days_since_last().fillna(fill))]
+
+
+def acwr_specs(pitch_col='total_pitches', acute_w=ACUTE_W, chronic_w=CHRONIC_W):
+    return [
+        rolling_mean('acute_workload', pitch_col, acute_w),
+        rolling_mean('chronic_workload', pitch_col, chronic_w),
+        FeatureSpec('acwr', ('acute_workload', 'chronic_workload'), None,
+                    lambda f: f['acute_workload'] / (f['chronic_workload'] + 1e-6)),
+    ]
+
+
+def delta_specs(col, window=DELTA_W, name=None):
+    return [FeatureSpec(name or f'{col}_delta', (col,), window, lambda f: f[col] - f.mean(col, window))]
+
+
+def release_specs(relx='release_pos_x_mean_all', rely='release_pos_y_mean_all', window=RELEASE_W):
+    return [
+        rolling_std('relx_std', relx, window),
+        rolling_std('rely_std', rely, window),
+        FeatureSpec('release_var', ('relx_std', 'rely_std'), None, lambda f: f['relx_std'] + f['rely_std']),
+    ]
+
+
+def enrich_specs():
+    """What feature_engineering.enrich_features adds, in column order."""
+    return (rest_specs(0) + acwr_specs() + delta_specs(SPEED_COL) + delta_specs(SPIN_COL)
+            + release_specs())
+
+
+def trend_specs(window=TREND_W):
+    """What train_injury_precise.add_trend_features adds; acwr and days_rest replace the enrich versions."""
+    specs = []
+    for col in [SPEED_COL, SPIN_COL]:
+        specs.append(rolling_mean(f'{col}_rolling_{window}', col, window))
+        specs.append(difference(f'{col}_trend', col, f'{col}_rolling_{window}'))
+    specs.append(rolling_mean(f'pitch_count_rolling_{window}', 'total_pitches', window))
+    specs.append(FeatureSpec('acwr', ('total_pitches', f'pitch_count_rolling_{window}'), None,
+                             lambda f: f['total_pitches'] / (f[f'pitch_count_rolling_{window}'] + 1e-5)))
+    specs += rest_specs(5)
+    specs.append(FeatureSpec('short_rest', ('days_rest',), None, lambda f: (f['days_rest'] < 4).astype(int)))
+    return specs
+
+
+class FeatureFrame:
+    """
+    Lazily evaluated features over one frame sorted by player. frame[name] computes a registry
+    feature once (and, first, whatever it reads), or returns the raw column. Rolling statistics
+    are memoised per (statistic, column, window), so e.g. the 3-game pitch mean behind both
+    acute_workload and pitch_count_rolling_3 is computed once.
+    """
+
+    def __init__(self, registry, df, rolling):
+        self.registry = registry
+        self.df = df
+        self.rolling = rolling
+        self._values = {}
+        self._stats = {}
+
+    def __getitem__(self, name):
+        value = self._values.get(name)
+        if value is None:
+            spec = self.registry.specs.get(name)
+            value = self.df[name] if spec is None else spec.compute(self)
+            self._values[name] = value
+        return value
+
+    def _stat(self, key, fn):
+        value = self._stats.get(key)
+        if value is None:
+            value = self._stats[key] = pd.Series(fn(), index=self.df.index)
+        return value
+
+    def mean(self, col, window):
+        return self._stat(('mean', col, window), lambda: self.rolling.mean(self.rolling.column(self.df, col), window))
+
+    def std(self, col, window):
+        return self._stat(('std', col, window), lambda: self.rolling.std(self.rolling.column(self.df, col), window))
+
+    def days_since_last(self):
+        return self._stat(('days',), lambda: self.rolling.diff_days(pd.to_datetime(self.df['game_date'])))
+
+
+class FeatureRegistry:
+    """
+    Named feature specs; a later spec with the same name replaces the earlier one. Names that
+    aren't registered are raw columns of the frame.
+    """
+
+    def __init__(self, specs):
+        self.specs = {}
+        for spec in specs:
+            self.specs[spec.name] = spec
+
+    @property
+    def names(self):
+        return list(self.specs)
+
+    def extend(self, specs):
+        return FeatureRegistry(list(self.specs.values()) + list(specs))
+
+    def plan(self, features):
+        """(registered features to compute, dependencies first; raw columns they read)."""
+        order, raw, seen = [], [], set()
+
+        def visit(name):
+            if name in seen:
+                return
+            seen.add(name)
+            spec = self.specs.get(name)
+            if spec is None:
+                raw.append(name)
+                return
+            for dep in spec.inputs:
+                visit(dep)
+            order.append(name)
+
+        for name in features:
+            visit(name)
+        return order, raw
+
+    def input_columns(self, features):
+        """Columns to load from the dataset to compute the given features."""
+        _, raw = self.plan(features)
+        return list(dict.fromkeys(KEY_COLUMNS + raw))
+
+    def window(self, features):
+        """Games of a player's history (the current one included) the given features look at."""
+        order, _ = self.plan(features)
+        return max([self.specs[name].window or 1 for name in order], default=1)
+
+    def compute(self, df, features=None, rolling=None):
+        """
+        df with the given features (default: all of them) added as columns. Only those and the
+        features they read are computed, and only the requested ones become columns. Raw
+        columns among features are left as they are.
+        """
+        features = self.names if features is None else features
+        targets = [name for name in dict.fromkeys(features) if name in self.specs]
+        if not targets:
+            return df
+        df, rolling = prepare_rolling(df, rolling)
+        frame = FeatureFrame(self, df, rolling)
+        values = {name: frame[name] for name in targets}
+        # Features that are already columns (acwr, days_rest) are replaced where they are; the new
+        # ones are added with one concat rather than an insert each, which fragments the frame
+        replaced = {name: value for name, value in values.items() if name in df.columns}
+        added = [value.rename(name) for name, value in values.items() if name not in df.columns]
+        if replaced:
+            df = df.assign(**replaced)
+        return pd.concat([df] + added, axis=1) if added else df
+
+
+ENRICH_FEATURES = FeatureRegistry(enrich_specs())
+TREND_FEATURES = FeatureRegistry(trend_specs())
+# Every feature a model can be trained on; the trend acwr/days_rest win, as they did when
+# add_trend_features ran after enrich_features
+FEATURE_REGISTRY = ENRICH_FEATURES.extend(trend_specs())
+
+
+def compute_features(df, features, rolling=None, registry=FEATURE_REGISTRY):
+    return registry.compute(df, features, rolling)
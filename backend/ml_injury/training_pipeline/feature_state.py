@@ -0,0 +1,188 @@
+import math
+from collections import deque
+
+import pandas as pd
+
+# Window lengths of the features declared in feature_registry (enrich_features and
+# add_trend_features); the state only keeps that many past games.
+from feature_registry import ACUTE_W, CHRONIC_W, DELTA_W, RELEASE_W, TREND_W
+
+WINDOWED_COLS = {
+    'total_pitches': CHRONIC_W,
+    'release_speed_mean_all': DELTA_W,
+    'release_spin_rate_mean_all': DELTA_W,
+    'release_pos_x_mean_all': RELEASE_W,
+    'release_pos_y_mean_all': RELEASE_W,
+}
+
+# Columns added by enrich_features + add_trend_features, in the order they appear
+FEATURE_COLUMNS = [
+    'days_rest', 'acute_workload', 'chronic_workload', 'acwr',
+    'release_speed_mean_all_delta', 'release_spin_rate_mean_all_delta',
+    'relx_std', 'rely_std', 'release_var',
+    'release_speed_mean_all_rolling_3', 'release_speed_mean_all_trend',
+    'release_spin_rate_mean_all_rolling_3', 'release_spin_rate_mean_all_trend',
+    'pitch_count_rolling_3', 'short_rest',
+]
+
+
+def _to_float(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return value
+
+
+def _tail(values, w):
+    return list(values)[-w:] if len(values) > w else list(values)
+
+
+def _nanmean(values):
+    vals = [v for v in values if not math.isnan(v)]
+    return sum(vals) / len(vals) if vals else math.nan
+
+
+def _nanstd(values):
+    # Sample std (ddof=1) over the non-missing values, like pandas rolling().std()
+    vals = [v for v in values if not math.isnan(v)]
+    n = len(vals)
+    if n < 2:
+        return math.nan
+    mean = sum(vals) / n
+    return math.sqrt(max(sum((v - mean) ** 2 for v in vals) / (n - 1), 0.0))
+
+
+class PlayerFeatureState:
+    """Rolling windows and last game date for one pitcher."""
+
+    def __init__(self):
+        self.windows = {col: deque(maxlen=w - 1) for col, w in WINDOWED_COLS.items()}
+        self.last_date = None
+
+    def compute(self, row):
+        """Features for a new game given the games seen so far (does not modify the state)."""
+        current = {col: _to_float(row.get(col)) for col in WINDOWED_COLS}
+
+        def window(col, w):
+            return _tail(self.windows[col], w - 1) + [current[col]]
+
+        game_date = pd.Timestamp(row['game_date'])
+        pitches = current['total_pitches']
+        speed = current['release_speed_mean_all']
+        spin = current['release_spin_rate_mean_all']
+
+        feats = {}
+        if self.last_date is None:
+            feats['days_rest'] = 5.0
+        else:
+            feats['days_rest'] = float((game_date - self.last_date).days)
+        feats['acute_workload'] = _nanmean(window('total_pitches', ACUTE_W))
+        feats['chronic_workload'] = _nanmean(window('total_pitches', CHRONIC_W))
+        feats['release_speed_mean_all_delta'] = speed - _nanmean(window('release_speed_mean_all', DELTA_W))
+        feats['release_spin_rate_mean_all_delta'] = spin - _nanmean(window('release_spin_rate_mean_all', DELTA_W))
+        feats['relx_std'] = _nanstd(window('release_pos_x_mean_all', RELEASE_W))
+        feats['rely_std'] = _nanstd(window('release_pos_y_mean_all', RELEASE_W))
+        feats['release_var'] = feats['relx_std'] + feats['rely_std']
+        feats['release_speed_mean_all_rolling_3'] = _nanmean(window('release_speed_mean_all', TREND_W))
+        feats['release_speed_mean_all_trend'] = speed - feats['release_speed_mean_all_rolling_3']
+        feats['release_spin_rate_mean_all_rolling_3'] = _nanmean(window('release_spin_rate_mean_all', TREND_W))
+        feats['release_spin_rate_mean_all_trend'] = spin - feats['release_spin_rate_mean_all_rolling_3']
+        feats['pitch_count_rolling_3'] = _nanmean(window('total_pitches', TREND_W))
+        # add_trend_features overrides the enrich_features ACWR with pitches / 3-game mean
+        feats['acwr'] = pitches / (feats['pitch_count_rolling_3'] + 1e-5)
+        feats['short_rest'] = int(feats['days_rest'] < 4)
+        return {col: feats[col] for col in FEATURE_COLUMNS}
+
+    def copy(self):
+        clone = PlayerFeatureState()
+        clone.windows = {col: deque(values, maxlen=values.maxlen) for col, values in self.windows.items()}
+        clone.last_date = self.last_date
+        return clone
+
+    def push(self, row):
+        game_date = pd.Timestamp(row['game_date'])
+        if self.last_date is not None and game_date < self.last_date:
+            raise ValueError(f"Game on {game_date.date()} is older than the last seen game {self.last_date.date()}")
+        for col in WINDOWED_COLS:
+            self.windows[col].append(_to_float(row.get(col)))
+        self.last_date = game_date
+
+
+class FeatureStateStore:
+    """
+    Per-player feature state keyed by player_name.
+
+    Scoring a new appearance costs O(window) instead of re-running enrich_features and
+    add_trend_features over the whole history. Games must arrive in date order per player;
+    an older game raises ValueError. Callers find those rows up front with backdated() and
+    recompute them from the full history (flag_injury_risks.recompute_rows).
+    """
+
+    def __init__(self):
+        self.players = {}
+
+    def __len__(self):
+        return len(self.players)
+
+    def __contains__(self, player_name):
+        return player_name in self.players
+
+    def compute(self, row):
+        state = self.players.get(row['player_name']) or PlayerFeatureState()
+        return state.compute(row)
+
+    def update(self, row):
+        """Compute features for a new game and add it to the player's history."""
+        state = self.players.setdefault(row['player_name'], PlayerFeatureState())
+        feats = state.compute(row)
+        state.push(row)
+        return feats
+
+    def backdated(self, df):
+        """Mask of the rows whose player has a game in df older than the player's last stored one."""
+        names = df['player_name']
+        last_dates = {name: self.players[name].last_date for name in names.unique() if name in self.players}
+        older = pd.to_datetime(df['game_date']) < pd.to_datetime(names.map(last_dates))
+        return names.isin(names[older]).to_numpy()
+
+    def fork(self, player_names):
+        """Independent copy of the state for the given players (for scoring without committing)."""
+        store = FeatureStateStore()
+        for name in player_names:
+            if name in self.players:
+                store.players[name] = self.players[name].copy()
+        return store
+
+    def enrich_rows(self, df, commit=True):
+        """
+        Return df with the feature columns filled in, processing rows in (player, date) order.
+
+        Several new games for the same player are chained. With commit=False the stored
+        history is left untouched.
+        """
+        df = df.sort_values(['player_name', 'game_date'], kind='mergesort').copy()
+        df['game_date'] = pd.to_datetime(df['game_date'])
+        target = self if commit else self.fork(df['player_name'].unique())
+        records = [target.update(row) for row in df.to_dict('records')]
+        feats = pd.DataFrame.from_records(records, index=df.index, columns=FEATURE_COLUMNS)
+        for col in FEATURE_COLUMNS:
+            df[col] = feats[col]
+        return df
+
+    @classmethod
+    def from_frame(cls, df):
+        """
+        Build the state from a game-level history frame.
+
+        Only each player's last games fill the windows, so those are the only rows pushed;
+        the features of the history rows themselves are never computed.
+        """
+        keep = max(WINDOWED_COLS.values()) - 1
+        df = df.reindex(columns=['player_name', 'game_date', *WINDOWED_COLS])
+        df['game_date'] = pd.to_datetime(df['game_date'])
+        df = df.sort_values(['player_name', 'game_date'], kind='mergesort')
+        store = cls()
+        for row in df.groupby('player_name', sort=False).tail(keep).to_dict('records'):
+            store.players.setdefault(row['player_name'], PlayerFeatureState()).push(row)
+        return store
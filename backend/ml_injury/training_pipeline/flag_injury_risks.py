@@ -5,78 +5,240 @@ import joblib
 import os
 from pathlib import Path
 
+from dataset_store import load_game_frame
+from feature_state import FEATURE_COLUMNS, FeatureStateStore, WINDOWED_COLS
+from metrics import FALLBACKS, cache_result, timed, timing_summary
+from model_registry import get_registry
+from prediction_cache import PredictionCache
+from ranking import RISK_TIERS, assign_tiers, assign_tiers_by_reference
+
 # Get the directory where this script is located
 SCRIPT_DIR = Path(__file__).parent
 
+# Earlier games per player the rolling features can reach back to (the longest window minus the game itself)
+LOOKBACK_GAMES = max(WINDOWED_COLS.values()) - 1
+
 # Import your ML functions with correct paths
 try:
-    from feature_engineering import enrich_features
-    from train_injury_precise import add_trend_features
+    from feature_engineering import input_columns, ENRICH_INPUT_COLUMNS
+    from feature_registry import compute_features
 except ImportError as e:
     print(f"Warning: Could not import ML modules: {e}")
     # Fallback functions if imports fail
-    def enrich_features(df):
-        return df
-    
-    def add_trend_features(df):
+    def compute_features(df, features):
         return df
 
+    def input_columns(features):
+        return ['player_name', 'game_date'] + list(features)
+
+    ENRICH_INPUT_COLUMNS = None
+
 def load_model():
-    try:
-        # Try to load from artifacts directory
-        model_path = Path('/app/backend/ml_injury/artifacts/injury_xgb_final.joblib')
-        preprocessor_path = Path('/app/backend/ml_injury/artifacts/injury_preprocessors.joblib')
-        
-        if not model_path.exists() or not preprocessor_path.exists():
-            print(f"Warning: Model files not found at {model_path}")
-            print("Returning mock model for testing")
-            return None, None, None, None
-        
-        clf = joblib.load(model_path)
-        imputer, scaler, features = joblib.load(preprocessor_path)
-        return clf, imputer, scaler, features
-    except Exception as e:
-        print(f"Error loading model: {e}")
+    # Served from the process-level registry so repeated calls don't re-unpickle the artifacts
+    registry = get_registry()
+    bundle = registry.get()
+    if bundle is None:
+        FALLBACKS.inc(reason='model_missing')
+        print(f"Warning: Model files not found at {registry.model_path}")
+        print("Returning mock model for testing")
         return None, None, None, None
+    # The fused FeaturePipeline takes the imputer slot; it also scales, so there is no separate scaler
+    return bundle.clf, bundle.preprocessor, None, bundle.features
 
-def predict_risk(df, clf, imputer, scaler, features, top_k_ratio=0.10):
-    try:
-        df = enrich_features(df)
-        df = add_trend_features(df)
+class UnknownTierColumn(ValueError):
+    """tier_by names a column the data doesn't have."""
 
-        df = df.dropna(subset=features + ['player_name', 'game_date'])
-        X = df[features].copy()
-        X = imputer.transform(X)
-        X = scaler.transform(X)
+def check_tier_by(tier_by, columns):
+    # Checked before scoring, so a bad tier_by is reported rather than turned into mock results
+    if tier_by and tier_by not in columns:
+        raise UnknownTierColumn(f"tier_by column {tier_by!r} is not in the data (columns: {', '.join(map(str, columns))})")
 
-        probs = clf.predict_proba(X)[:, 1]
-        df['injury_risk_prob'] = probs
+def assign_risk_levels(probs, top_k_ratio=0.10, groups=None, min_per_tier=0, reference=None):
+    # Top top_k_ratio of rows are 'high', the rest of the top 20% 'medium', everything else 'low';
+    # with groups (e.g. game_date) each group is tiered on its own, and with reference (and no
+    # groups) the ratios apply to those scores instead of the rows'
+    tiers = (('high', top_k_ratio), ('medium', max(RISK_TIERS[1][1], top_k_ratio)))
+    if reference is not None and groups is None:
+        return assign_tiers_by_reference(probs, reference, tiers)
+    return assign_tiers(probs, tiers, groups=groups, min_per_tier=min_per_tier)
+
+def cohort_frame(df, score_date, end_date=None, lookback=LOOKBACK_GAMES):
+    """
+    The games on score_date..end_date plus, for the players in them, their last `lookback`
+    earlier games: enough history for the rolling features of the scored games to come out
+    exactly as they would over the full season.
+    """
+    start = pd.to_datetime(score_date)
+    end = pd.to_datetime(end_date) if end_date else start
+    target = (df['game_date'] >= start) & (df['game_date'] <= end)
+    cohort = df[target]
+    history = df[(df['game_date'] < start) & df['player_name'].isin(cohort['player_name'].unique())]
+    history = history.sort_values('game_date', kind='stable').groupby('player_name', sort=False, observed=True).tail(lookback)
+    return pd.concat([history, cohort])
 
-        df['risk_level'] = 'low'
-        top_k = int(len(df) * top_k_ratio)
-        top_indices = np.argsort(probs)[-top_k:]
-        df.iloc[top_indices, df.columns.get_loc('risk_level')] = 'high'
+def predict_risk(df, clf, imputer, scaler, features, top_k_ratio=0.10, tier_by=None, score_from=None, min_per_tier=0):
+    """
+    score_from limits scoring to games on or after that date; earlier rows only feed the rolling
+    features. min_per_tier is passed on to assign_risk_levels.
+    """
+    try:
+        # Only the model's features and what they read, not the whole enrichment
+        with timed('compute_features', len(df)):
+            df = compute_features(df, features)
+        if score_from is not None:
+            df = df[df['game_date'] >= pd.to_datetime(score_from)]
 
-        medium_cut = int(len(df) * 0.20)
-        medium_indices = np.argsort(probs)[-medium_cut:-top_k]
-        df.iloc[medium_indices, df.columns.get_loc('risk_level')] = 'medium'
+        df = df.dropna(subset=features + ['player_name', 'game_date'])
+        with timed('preprocess', len(df)):
+            X = df[features].copy()
+            # imputer may be the fused FeaturePipeline (scaler is then None), or None for a fast predictor
+            if imputer is not None:
+                X = imputer.transform(X)
+            if scaler is not None:
+                X = scaler.transform(X)
 
-        return df[['player_name', 'game_date', 'injury_risk_prob', 'risk_level', 'result']].sort_values('injury_risk_prob', ascending=False)
+        with timed('predict_proba', len(df)):
+            probs = clf.predict_proba(X)[:, 1]
+        with timed('assign_tiers', len(df)):
+            levels = assign_risk_levels(probs, top_k_ratio, df[tier_by] if tier_by else None, min_per_tier)
+
+        # Built from the output columns only; adding columns to the wide scored frame (one block per
+        # CSV column) would fragment it further
+        out = df[['player_name', 'game_date']].assign(injury_risk_prob=probs, risk_level=levels)
+        if 'result' in df.columns:
+            out['result'] = df['result']
+        return out.sort_values('injury_risk_prob', ascending=False)
     except Exception as e:
+        FALLBACKS.inc(reason='predict_error')
         print(f"Error in predict_risk: {e}")
         # Return mock data if prediction fails
         return df[['player_name', 'game_date']].head(10)
 
-def run_inference_on_csv(csv_path, top_k_ratio=0.10, start_date=None):
-    try:
-        df = pd.read_csv(csv_path, parse_dates=['game_date'])
-        if start_date:
-            df = df[df['game_date'] >= pd.to_datetime(start_date)]
+_history_stores = {}
+_history_scores = {}
+# Scored results per (input file fingerprint, model version, parameters); see prediction_cache.py
+prediction_cache = PredictionCache.from_env()
+
+def get_history_store(path):
+    """Per-player feature state for a history file, rebuilt only when the file changes."""
+    if not path:
+        return FeatureStateStore()
+    key = os.path.realpath(path)
+    st = os.stat(key)
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _history_stores.get(key)
+    cache_result('history_store', cached is not None and cached[0] == signature)
+    if cached is None or cached[0] != signature:
+        with timed('build_history_store'):
+            store = FeatureStateStore.from_frame(load_game_frame(key, columns=ENRICH_INPUT_COLUMNS))
+        cached = (signature, store)
+        _history_stores[key] = cached
+    return cached[1]
+
+def _transform(X, imputer, scaler):
+    if imputer is not None:
+        X = imputer.transform(X)
+    if scaler is not None:
+        X = scaler.transform(X)
+    return X
+
+def history_scores(path, clf, imputer, scaler, features):
+    """
+    The model's probabilities over every game in a history file: the distribution /score
+    tiers new games against. Cached per (file, model version); a few appended games barely
+    move its quantiles, so the file changing doesn't trigger a re-score.
+    """
+    key = (os.path.realpath(path), get_registry().version())
+    cached = _history_scores.get(key)
+    cache_result('history_scores', cached is not None)
+    if cached is None:
+        with timed('score_history'):
+            df = compute_features(load_game_frame(key[0], columns=input_columns(features)), features)
+            X = _transform(df.dropna(subset=features)[features], imputer, scaler)
+            cached = _history_scores[key] = clf.predict_proba(X)[:, 1]
+    return cached
+
+def recompute_rows(rows, history_path):
+    """
+    rows with the FEATURE_COLUMNS computed over their players' full history in history_path
+    plus the rows themselves: the fallback for games older than a player's last stored one,
+    which the incremental store can't score.
+    """
+    history = load_game_frame(history_path, columns=ENRICH_INPUT_COLUMNS, players=rows['player_name'].unique())
+    combined = pd.concat([history.assign(_row=-1), rows.assign(_row=np.arange(len(rows)))], ignore_index=True)
+    feats = compute_features(combined, FEATURE_COLUMNS)
+    feats = feats[feats['_row'] >= 0].sort_values('_row')
+    return rows.assign(**{col: feats[col].to_numpy() for col in FEATURE_COLUMNS})
 
+def score_rows(rows, clf, imputer, scaler, features, store=None, top_k_ratio=0.10, tier_by=None, history_path=None,
+               reference=None):
+    """
+    Score new game rows against the players' history without touching disk.
+
+    rows is a DataFrame of game-level rows (at least player_name, game_date and the columns
+    in ENRICH_INPUT_COLUMNS); the rolling features come from store, which is not modified.
+    Players with a game older than their last stored one are recomputed from history_path
+    instead (without it those rows raise ValueError). Missing feature values are imputed
+    rather than dropped, so every row gets a score. Without tier_by, reference scores (see
+    history_scores) set the tier cut-offs, so a single game isn't only ranked against itself.
+    """
+    check_tier_by(tier_by, rows.columns)
+    store = store if store is not None else FeatureStateStore()
+    backdated = store.backdated(rows) if history_path else np.zeros(len(rows), dtype=bool)
+    parts = []
+    if not backdated.all():
+        with timed('enrich_rows', int((~backdated).sum())):
+            parts.append(store.enrich_rows(rows[~backdated], commit=False))
+    if backdated.any():
+        with timed('recompute_rows', int(backdated.sum())):
+            parts.append(recompute_rows(rows[backdated], history_path))
+    df = pd.concat(parts) if len(parts) > 1 else parts[0]
+    with timed('preprocess', len(df)):
+        X = _transform(df[features], imputer, scaler)
+    with timed('predict_proba', len(df)):
+        probs = clf.predict_proba(X)[:, 1]
+    df['injury_risk_prob'] = probs
+    with timed('assign_tiers', len(df)):
+        df['risk_level'] = assign_risk_levels(probs, top_k_ratio, df[tier_by] if tier_by else None,
+                                              reference=reference)
+    return df[['player_name', 'game_date', 'injury_risk_prob', 'risk_level']].sort_values('injury_risk_prob', ascending=False)
+
+def run_inference_on_csv(csv_path, top_k_ratio=0.10, start_date=None, tier_by=None, score_date=None, end_date=None):
+    """
+    Score every game from start_date on, or with score_date (and optionally end_date) only the
+    games on those days, using lookback history for their features and tiering each day's
+    cohort separately unless tier_by says otherwise. A daily cohort is only a handful of games,
+    so there each tier gets at least one of them. Results are served from prediction_cache
+    while the file and the model are unchanged.
+    """
+    try:
         clf, imputer, scaler, features = load_model()
-        
+        cache_key = None
+        if clf is not None:
+            params = {'top_k_ratio': float(top_k_ratio), 'start_date': start_date, 'tier_by': tier_by,
+                      'score_date': score_date, 'end_date': end_date}
+            cache_key = prediction_cache.key(csv_path, get_registry().version(), params)
+            cached = prediction_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        # Only read the columns the model's features are computed from (CSV, Feather or Parquet)
+        columns = None if clf is None else input_columns(features) + ['result'] + ([tier_by] if tier_by else [])
+        with timed('load_csv') as span:
+            if score_date:
+                df = load_game_frame(csv_path, columns=columns, end_date=end_date or score_date)
+                df = cohort_frame(df, score_date, end_date)
+                tier_by = tier_by or 'game_date'
+                min_per_tier = 1
+            else:
+                df = load_game_frame(csv_path, columns=columns, start_date=start_date or None)
+                min_per_tier = 0
+            span.rows = len(df)
+        check_tier_by(tier_by, df.columns)
+
         # If model failed to load, return mock results
         if clf is None:
+            FALLBACKS.inc(reason='mock_predictions')
             print("Using mock predictions (model not loaded)")
             return pd.DataFrame({
                 'player_name': df['player_name'].head(10) if 'player_name' in df.columns else ['Player 1', 'Player 2'],
@@ -85,9 +247,16 @@ def run_inference_on_csv(csv_path, top_k_ratio=0.10, start_date=None):
                 'risk_level': np.random.choice(['low', 'medium', 'high'], 10)
             })
         
-        result_df = predict_risk(df, clf, imputer, scaler, features, top_k_ratio)
+        result_df = predict_risk(df, clf, imputer, scaler, features, top_k_ratio, tier_by,
+                                 score_from=score_date or None, min_per_tier=min_per_tier)
+        # predict_risk falls back to a frame without probabilities on errors; don't keep that
+        if 'injury_risk_prob' in result_df.columns:
+            prediction_cache.put(cache_key, result_df)
         return result_df
+    except UnknownTierColumn:
+        raise
     except Exception as e:
+        FALLBACKS.inc(reason='inference_error')
         print(f"Error in run_inference_on_csv: {e}")
         # Return mock data on error
         return pd.DataFrame({
@@ -103,11 +272,22 @@ def main():
     parser.add_argument('--top_k_ratio', type=float, default=0.10)
     parser.add_argument('--out_path', default='injury_risk_flags.csv')
     parser.add_argument('--start_date', default='2024-04-01')
+    parser.add_argument('--tier_by', default=None, help="column to tier within, e.g. game_date (default: whole file)")
+    parser.add_argument('--score_date', default=None, help="score only this day's games (tiered per day); overrides --start_date")
+    parser.add_argument('--end_date', default=None, help="with --score_date, score every day up to this one")
+    parser.add_argument('--timings', action='store_true', help='print time spent per stage')
     args = parser.parse_args()
 
-    result_df = run_inference_on_csv(args.path, args.top_k_ratio, args.start_date)
-    result_df.to_csv(args.out_path, index=False)
+    try:
+        result_df = run_inference_on_csv(args.path, args.top_k_ratio, args.start_date, args.tier_by,
+                                         args.score_date, args.end_date)
+    except UnknownTierColumn as e:
+        parser.error(str(e))
+    with timed('write_csv', len(result_df)):
+        result_df.to_csv(args.out_path, index=False)
     print(f"Saved risk flags to: {args.out_path}")
+    if args.timings:
+        print("\n".join(timing_summary()))
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,21 @@
+# Production serving for the ML API: gunicorn -c gunicorn.conf.py wsgi:app
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('ML_PORT', '5002')}"
+
+# Load wsgi.py (and the model) in the master before forking, so workers share it copy-on-write
+preload_app = True
+
+workers = int(os.environ.get('ML_WORKERS', min(4, multiprocessing.cpu_count())))
+# gthread workers let a slow CSV inference run alongside other requests in the same worker
+worker_class = 'gthread'
+threads = int(os.environ.get('ML_THREADS', 4))
+timeout = int(os.environ.get('ML_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('ML_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Access logs are off unless ML_ACCESS_LOG is set (e.g. '-' for stdout)
+accesslog = os.environ.get('ML_ACCESS_LOG') or None
+errorlog = '-'
+loglevel = os.environ.get('ML_LOG_LEVEL', 'info').lower()
@@ -0,0 +1,213 @@
+import argparse
+import importlib
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from joblib import Parallel, delayed
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.metrics import roc_auc_score, average_precision_score, brier_score_loss
+
+from dataset_store import load_game_frame
+from ranking import top_k_indices
+from splits import SPLIT_SCHEMES, holdout_split, inner_split_scheme
+
+TRAINERS = {
+    'baseline': 'train_injury_baseline',
+    'prob': 'train_injury_prob',
+    'precise': 'train_injury_precise',
+}
+
+# Sampling ranges for the --xgb_* flags shared by the trainers
+SEARCH_SPACE = {
+    'learning_rate': ('log', 0.01, 0.3),
+    'max_depth': ('int', 2, 8),
+    'subsample': ('uniform', 0.5, 1.0),
+    'colsample_bytree': ('uniform', 0.4, 1.0),
+    'min_child_weight': ('log', 1.0, 20.0),
+    'reg_lambda': ('log', 0.1, 20.0),
+    'reg_alpha': ('log', 0.001, 10.0),
+}
+
+
+def sample_params(rng, space=SEARCH_SPACE):
+    params = {}
+    for name, (kind, low, high) in space.items():
+        if kind == 'int':
+            params[name] = int(rng.integers(low, high + 1))
+        elif kind == 'log':
+            params[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+        else:
+            params[name] = float(rng.uniform(low, high))
+    return params
+
+
+def score_probs(y, probs, target_rate=0.10):
+    k = max(int(target_rate * len(y)), 1)
+    top_k_idx = top_k_indices(probs, k)
+    has_both = len(np.unique(y)) > 1
+    return {
+        'roc_auc': roc_auc_score(y, probs) if has_both else np.nan,
+        'pr_auc': average_precision_score(y, probs) if has_both else np.nan,
+        'brier': brier_score_loss(y, probs),
+        'precision_at_k': float(np.mean(y[top_k_idx] == 1)),
+    }
+
+
+def share_arrays(arrays, folder):
+    """Write arrays once as .npy so every worker memory-maps the same pages instead of unpickling copies."""
+    paths = {}
+    for name, arr in arrays.items():
+        paths[name] = str(Path(folder) / f'{name}.npy')
+        np.save(paths[name], np.ascontiguousarray(arr))
+    return paths
+
+
+def _load(paths, *names):
+    return [np.load(paths[n], mmap_mode='r') for n in names]
+
+
+def run_trial(paths, early_stopping_rounds, target_rate, xgb_threads, trial_id, params, n_estimators):
+    """Fit one configuration on the fit rows with early stopping on the validation rows."""
+    X_fit, y_fit, X_val, y_val = _load(paths, 'X_fit', 'y_fit', 'X_val', 'y_val')
+    start = time.perf_counter()
+    clf = xgb.XGBClassifier(
+        n_estimators=n_estimators,
+        early_stopping_rounds=early_stopping_rounds,
+        eval_metric='logloss',
+        n_jobs=xgb_threads,
+        verbosity=0,
+        **params,
+    )
+    clf.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+    probs = clf.predict_proba(X_val)[:, 1]
+    row = {'trial': trial_id, 'n_estimators': n_estimators, 'best_iteration': int(clf.best_iteration), **params}
+    row.update({f'val_{k}': v for k, v in score_probs(np.asarray(y_val), probs, target_rate).items()})
+    row['fit_seconds'] = time.perf_counter() - start
+    return row
+
+
+def run_final(paths, row, calibration, target_rate, xgb_threads):
+    """Refit a finalist the way the trainers do (XGB + CalibratedClassifierCV on all training rows) and test it."""
+    X_train, y_train, X_test, y_test = _load(paths, 'X_train', 'y_train', 'X_test', 'y_test')
+    params = {name: row[name] for name in SEARCH_SPACE}
+    start = time.perf_counter()
+    clf = xgb.XGBClassifier(
+        n_estimators=row['best_iteration'] + 1,
+        eval_metric='logloss',
+        n_jobs=xgb_threads,
+        verbosity=0,
+        **params,
+    )
+    if calibration:
+        clf = CalibratedClassifierCV(estimator=clf, method=calibration, cv=3)
+    clf.fit(np.asarray(X_train), np.asarray(y_train))
+    probs = clf.predict_proba(X_test)[:, 1]
+    out = {f'test_{k}': v for k, v in score_probs(np.asarray(y_test), probs, target_rate).items()}
+    out['final_fit_seconds'] = time.perf_counter() - start
+    return out
+
+
+def successive_halving(run, configs, min_estimators, max_estimators, eta, metric, n_jobs):
+    """
+    Evaluate every config at min_estimators trees, keep the best 1/eta by metric and
+    multiply the tree budget by eta, until one rung is left or max_estimators is reached.
+    Early stopping still applies inside every rung. Returns (all rows, final-rung rows).
+    """
+    higher_is_better = metric != 'val_brier'
+    candidates = list(enumerate(configs))
+    budget = min_estimators
+    rung = 0
+    all_rows = []
+    while True:
+        print(f"Rung {rung}: {len(candidates)} trials x {budget} trees")
+        rows = Parallel(n_jobs=n_jobs)(delayed(run)(trial_id, params, budget) for trial_id, params in candidates)
+        for row in rows:
+            row['rung'] = rung
+        all_rows.extend(rows)
+
+        if len(candidates) <= 1 or budget >= max_estimators:
+            return all_rows, rows
+        ranked = sorted(rows, key=lambda r: np.nan_to_num(r[metric], nan=-np.inf if higher_is_better else np.inf),
+                        reverse=higher_is_better)
+        keep = {r['trial'] for r in ranked[:max(1, len(ranked) // eta)]}
+        candidates = [(i, p) for i, p in candidates if i in keep]
+        budget = min(budget * eta, max_estimators)
+        rung += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Random search with successive halving over the XGBoost trainers')
+    parser.add_argument('--path', required=True)
+    parser.add_argument('--trainer', choices=sorted(TRAINERS), default='precise',
+                        help='whose build_dataset produces the feature matrix')
+    parser.add_argument('--feature_cap', type=int, default=None, help='default: all features')
+    parser.add_argument('--n_trials', type=int, default=27)
+    parser.add_argument('--min_estimators', type=int, default=50)
+    parser.add_argument('--max_estimators', type=int, default=800)
+    parser.add_argument('--eta', type=int, default=3)
+    parser.add_argument('--early_stopping_rounds', type=int, default=30)
+    parser.add_argument('--metric', choices=['val_pr_auc', 'val_roc_auc', 'val_brier', 'val_precision_at_k'],
+                        default='val_pr_auc')
+    parser.add_argument('--calibration', default='isotonic', help="final refit calibration; '' to skip")
+    parser.add_argument('--target_rate', type=float, default=0.10)
+    parser.add_argument('--split', choices=SPLIT_SCHEMES, default='random')
+    parser.add_argument('--test_cutoff_date', default=None)
+    parser.add_argument('--n_jobs', type=int, default=-1)
+    parser.add_argument('--xgb_threads', type=int, default=1, help='threads per trial; keep at 1 when n_jobs > 1')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out_path', default='artifacts/hyperparam_leaderboard.csv')
+    args = parser.parse_args()
+
+    print("Loading data...")
+    df = load_game_frame(args.path, lean=True)
+    trainer = importlib.import_module(TRAINERS[args.trainer])
+    print(f"Building dataset once ({args.trainer})...")
+    X, y, feature_names, pipeline, meta = trainer.build_dataset(df, feature_cap=args.feature_cap, with_meta=True)
+    y = np.asarray(y).astype(int)
+
+    train_idx, test_idx = holdout_split(args.split, meta, y, test_size=0.2, cutoff=args.test_cutoff_date)
+    X = pipeline.fit(X[train_idx]).transform(X)
+    # Early-stopping rows come out of the training rows with the same scheme, so they stay leakage-free too
+    meta_train = meta.iloc[train_idx].reset_index(drop=True)
+    fit_idx, val_idx = holdout_split(inner_split_scheme(args.split), meta_train, y[train_idx], test_size=0.2)
+    fit_idx, val_idx = train_idx[fit_idx], train_idx[val_idx]
+    print(f"Rows: fit={len(fit_idx)} val={len(val_idx)} test={len(test_idx)}, features={X.shape[1]}")
+
+    rng = np.random.default_rng(args.seed)
+    configs = [sample_params(rng) for _ in range(args.n_trials)]
+
+    with tempfile.TemporaryDirectory(prefix='hpsearch_') as folder:
+        paths = share_arrays({
+            'X_fit': X[fit_idx], 'y_fit': y[fit_idx], 'X_val': X[val_idx], 'y_val': y[val_idx],
+            'X_train': X[train_idx], 'y_train': y[train_idx], 'X_test': X[test_idx], 'y_test': y[test_idx],
+        }, folder)
+        del X
+        run = partial(run_trial, paths, args.early_stopping_rounds, args.target_rate, args.xgb_threads)
+        start = time.perf_counter()
+        all_rows, finalists = successive_halving(run, configs, args.min_estimators, args.max_estimators,
+                                                 args.eta, args.metric, args.n_jobs)
+        print(f"Search: {len(all_rows)} fits in {time.perf_counter() - start:.1f}s")
+
+        print(f"Refitting {len(finalists)} finalists on all training rows...")
+        finals = Parallel(n_jobs=args.n_jobs)(
+            delayed(run_final)(paths, row, args.calibration or None, args.target_rate, args.xgb_threads)
+            for row in finalists
+        )
+        for row, final in zip(finalists, finals):
+            row.update(final)
+
+    board = pd.DataFrame(all_rows)
+    board = board.sort_values(['rung', args.metric], ascending=[False, args.metric == 'val_brier'], kind='mergesort')
+    Path(args.out_path).parent.mkdir(parents=True, exist_ok=True)
+    board.to_csv(args.out_path, index=False)
+    print(board.head(10).to_string(index=False))
+    print(f"Saved leaderboard to {args.out_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+import argparse
+import http.client
+import itertools
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from synthetic_data import synthetic_games
+
+HERE = Path(__file__).parent
+DEFAULT_ARTIFACTS = HERE.parent / 'artifacts'
+SERVER_MODES = ['thread', 'gunicorn']
+
+
+def start_thread_server(artifacts_dir, port=0):
+    """Serve app.py from a werkzeug thread in this process; returns (host:port, stop)."""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    import model_registry
+    model_registry._registry = model_registry.ModelRegistry(artifacts_dir)
+    from app import create_app, logger
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    app = create_app()
+    # Per-request access and inference logs would dominate the output (and the timings)
+    logger.setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', port, app, threaded=True, request_handler=QuietHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def stop():
+        server.shutdown()
+        thread.join()
+    return f'127.0.0.1:{server.server_port}', stop
+
+
+def start_gunicorn(artifacts_dir, port, env=None, timeout=60):
+    """Run the production server (gunicorn.conf.py) as a subprocess; returns (host:port, stop)."""
+    env = dict(os.environ, **(env or {}), ML_PORT=str(port), ML_ARTIFACTS_DIR=str(artifacts_dir))
+    proc = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+                            cwd=HERE, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    host = f'127.0.0.1:{port}'
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with {proc.returncode}")
+        try:
+            status, _ = _request(http.client.HTTPConnection(host, timeout=5), 'GET', '/health')
+            if status == 200:
+                break
+        except OSError:
+            pass
+        time.sleep(0.2)
+    else:
+        proc.terminate()
+        raise RuntimeError(f"gunicorn did not answer on {host} within {timeout}s")
+
+    def stop():
+        proc.terminate()
+        proc.wait(timeout=30)
+    return host, stop
+
+
+def _request(conn, method, path, body=None):
+    headers = {'Content-Type': 'application/json'} if body is not None else {}
+    conn.request(method, path, body=None if body is None else json.dumps(body), headers=headers)
+    response = conn.getresponse()
+    response.read()
+    return response.status, response
+
+
+def request_mix(csv_path, top_k_ratios, start_dates, extra=None):
+    """Every combination of the given /predict parameters, as request bodies."""
+    return [dict(extra or {}, csv_path=str(csv_path), top_k_ratio=ratio, start_date=start)
+            for ratio, start in itertools.product(top_k_ratios, start_dates)]
+
+
+def drive(host, bodies, n_requests, concurrency, path='/predict'):
+    """
+    Send n_requests POSTs cycling through bodies from `concurrency` client threads, each with
+    its own keep-alive connection. Returns (per-request latencies in seconds, status codes, wall time).
+    """
+    latencies = np.zeros(n_requests)
+    statuses = [0] * n_requests
+    local = threading.local()
+
+    def one(i):
+        conn = getattr(local, 'conn', None)
+        if conn is None:
+            conn = local.conn = http.client.HTTPConnection(host, timeout=300)
+        start = time.perf_counter()
+        try:
+            statuses[i], response = _request(conn, 'POST', path, bodies[i % len(bodies)])
+            if response.will_close:
+                conn.close()
+                local.conn = None
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            local.conn = None
+            statuses[i] = -1
+        latencies[i] = time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(n_requests)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+def summarize(latencies, statuses, wall):
+    ms = latencies * 1000
+    errors = sum(1 for s in statuses if s != 200)
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99]) if len(ms) else (np.nan,) * 3
+    return {
+        'requests': len(statuses), 'errors': errors, 'seconds': round(wall, 3),
+        'throughput_rps': round(len(statuses) / wall, 2) if wall > 0 else 0.0,
+        'p50_ms': round(float(p50), 2), 'p95_ms': round(float(p95), 2), 'p99_ms': round(float(p99), 2),
+        'max_ms': round(float(ms.max()), 2) if len(ms) else np.nan,
+    }
+
+
+def run_load_test(concurrency=(1, 4, 16), n_requests=200, server='thread', artifacts_dir=DEFAULT_ARTIFACTS,
+                  csv_path=None, teams=1, seasons=1, top_k_ratios=(0.10,), start_dates=('2024-04-01',),
+                  extra=None, warmup=5, port=5102, prediction_cache=True, url=None):
+    """One summary per concurrency level against a local server (or url) scoring a synthetic CSV."""
+    with tempfile.TemporaryDirectory() as tmp:
+        if csv_path is None:
+            csv_path = Path(tmp) / 'load_test_games.csv'
+            synthetic_games(teams, seasons).to_csv(csv_path, index=False)
+        env = {} if prediction_cache else {'ML_PREDICTION_CACHE_ENTRIES': '0'}
+        if url:
+            host, stop = url, (lambda: None)
+        elif server == 'gunicorn':
+            host, stop = start_gunicorn(artifacts_dir, port, env)
+        else:
+            if not prediction_cache:
+                import flag_injury_risks
+                flag_injury_risks.prediction_cache.max_entries = 0
+            host, stop = start_thread_server(artifacts_dir)
+        try:
+            bodies = request_mix(csv_path, top_k_ratios, start_dates, extra)
+            if warmup:
+                drive(host, bodies, warmup, 1)
+            results = []
+            for level in concurrency:
+                summary = summarize(*drive(host, bodies, n_requests, level))
+                summary['concurrency'] = level
+                results.append(summary)
+                print(f"c={level:<4d} {summary['throughput_rps']:8.1f} req/s  p50 {summary['p50_ms']:8.1f} ms  "
+                      f"p95 {summary['p95_ms']:8.1f} ms  p99 {summary['p99_ms']:8.1f} ms  errors {summary['errors']}")
+            return results
+        finally:
+            stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the /predict endpoint against a synthetic CSV and the real artifacts')
+    parser.add_argument('--server', choices=SERVER_MODES, default='thread',
+                        help='in-process werkzeug thread, or the gunicorn production config')
+    parser.add_argument('--url', default=None, help='host:port of an already running service instead')
+    parser.add_argument('--port', type=int, default=5102, help='port for --server gunicorn')
+    parser.add_argument('--artifacts_dir', default=str(DEFAULT_ARTIFACTS))
+    parser.add_argument('--csv_path', default=None, help='dataset to score (default: a generated one)')
+    parser.add_argument('--teams', type=int, default=1)
+    parser.add_argument('--seasons', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--requests', type=int, default=200, help='requests per concurrency level')
+    parser.add_argument('--top_k_ratios', type=float, nargs='+', default=[0.10])
+    parser.add_argument('--start_dates', nargs='+', default=['2024-04-01'])
+    parser.add_argument('--extra', default=None, help='JSON merged into every request body, e.g. \'{"limit": 50}\'')
+    parser.add_argument('--no_prediction_cache', action='store_true', help='measure uncached scoring')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--out_path', default=None, help='write the summaries as JSON')
+    parser.add_argument('--max_p95_ms', type=float, default=None, help='exit non-zero if any level exceeds this p95')
+    args = parser.parse_args()
+
+    results = run_load_test(args.concurrency, args.requests, args.server, args.artifacts_dir, args.csv_path,
+                            args.teams, args.seasons, args.top_k_ratios, args.start_dates,
+                            json.loads(args.extra) if args.extra else None, args.warmup, args.port,
+                            not args.no_prediction_cache, args.url)
+    if args.out_path:
+        Path(args.out_path).write_text(json.dumps(results, indent=2))
+    failed = [r for r in results if r['errors'] or (args.max_p95_ms is not None and r['p95_ms'] > args.max_p95_ms)]
+    if failed:
+        print(f"Failed at concurrency {[r['concurrency'] for r in failed]}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+# Upper bounds (seconds) of the stage latency histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_text(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + '}'
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(n, '') for n in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(labels.get(n, '') for n in self.labels), 0)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            lines.append(f'{self.name}{_label_text(self.labels, key)} {value}')
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (last is +Inf), sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(n, '') for n in self.labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self):
+        """label values -> (count, sum) for every series."""
+        with self._lock:
+            return {key: (s[2], s[1]) for key, s in self._series.items()}
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = sorted((key, [list(s[0]), s[1], s[2]]) for key, s in self._series.items())
+        for key, (counts, total, count) in series:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float('inf'),), counts):
+                cumulative += n
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{self.name}_bucket{_label_text(self.labels + ("le",), key + (le,))} {cumulative}')
+            lines.append(f'{self.name}_sum{_label_text(self.labels, key)} {total}')
+            lines.append(f'{self.name}_count{_label_text(self.labels, key)} {count}')
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """
+    Process-local counters and histograms rendered in the Prometheus text format. Under
+    gunicorn each worker keeps its own registry, so a scrape reflects the worker that served it.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+
+    def counter(self, name, help_text, labels=()):
+        return self._metrics.setdefault(name, Counter(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._metrics.setdefault(name, Histogram(name, help_text, labels, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+REGISTRY = MetricsRegistry()
+STAGE_SECONDS = REGISTRY.histogram('ml_stage_seconds', 'Time spent in each inference stage', ['stage'])
+STAGE_ROWS = REGISTRY.counter('ml_stage_rows_total', 'Rows processed by each inference stage', ['stage'])
+CACHE_REQUESTS = REGISTRY.counter('ml_cache_requests_total', 'Cache lookups by cache and result', ['cache', 'result'])
+FALLBACKS = REGISTRY.counter('ml_fallbacks_total', 'Responses served from mock or fallback output', ['reason'])
+REQUEST_SECONDS = REGISTRY.histogram('ml_request_seconds', 'HTTP request latency by endpoint', ['endpoint'])
+
+
+@contextmanager
+def timed(stage, rows=None):
+    """
+    Record the block's wall time under `stage`. Rows processed are counted when given here or
+    set on the yielded span inside the block (`with timed('load_csv') as span: ... span.rows = len(df)`).
+    """
+    span = SimpleNamespace(rows=rows)
+    start = time.perf_counter()
+    try:
+        yield span
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+        if span.rows is not None:
+            STAGE_ROWS.inc(span.rows, stage=stage)
+
+
+def cache_result(cache, hit):
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def timing_summary():
+    """Per-stage call count, total and mean time and rows as printable lines, slowest stage first."""
+    rows = []
+    for (stage,), (count, total) in STAGE_SECONDS.snapshot().items():
+        rows.append((total, stage, count, STAGE_ROWS.value(stage=stage)))
+    lines = [f"{'stage':24s} {'calls':>6s} {'total s':>9s} {'mean ms':>9s} {'rows':>9s}"]
+    for total, stage, count, n_rows in sorted(rows, reverse=True):
+        lines.append(f"{stage:24s} {count:6d} {total:9.3f} {total / count * 1000:9.2f} {n_rows:9d}")
+    return lines
@@ -0,0 +1,141 @@
+import hashlib
+import os
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+import joblib
+
+from fast_predictor import FAST_FILE, FastPredictor
+from preprocessing import load_preprocessor
+
+# Default location of the trained artifacts inside the ML container; override with
+# ML_ARTIFACTS_DIR when running the service or CLI outside Docker.
+ARTIFACTS_DIR = Path(os.environ.get('ML_ARTIFACTS_DIR', '/app/backend/ml_injury/artifacts'))
+MODEL_FILE = 'injury_xgb_final.joblib'
+PREPROCESSOR_FILE = 'injury_preprocessors.joblib'
+# Set ML_FAST_PREDICTOR=0 to always score through the joblib pipeline
+USE_FAST_PREDICTOR = os.environ.get('ML_FAST_PREDICTOR', '1') != '0'
+
+# preprocessor is the fitted preprocessing.FeaturePipeline, or None when clf applies it itself
+ModelBundle = namedtuple('ModelBundle', ['clf', 'preprocessor', 'features', 'version'])
+
+
+def _file_signature(paths):
+    # (mtime, size) per file is enough to notice a re-trained artifact without reading it
+    sig = []
+    for path in paths:
+        st = path.stat()
+        sig.append((st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+
+def _content_hash(paths):
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+    return h.hexdigest()[:12]
+
+
+class ModelRegistry:
+    """
+    Process-level cache of the calibrated classifier and its preprocessing pipeline.
+
+    Artifacts are unpickled once and reused across requests. Every get() does a cheap
+    stat() of the artifact files and reloads when they changed; the new bundle is built
+    completely before it replaces the old one, so readers never see a half-loaded model.
+    If the new files can't be loaded the old model keeps being served, and they are not read
+    again until they change.
+
+    When an exported fast predictor (fast_predictor.py) built from the current joblib files
+    sits next to them, it is served instead; its bundle has no preprocessor because the
+    predictor applies it itself.
+    """
+
+    def __init__(self, artifacts_dir=ARTIFACTS_DIR, use_fast=USE_FAST_PREDICTOR):
+        self.artifacts_dir = Path(artifacts_dir)
+        self.model_path = self.artifacts_dir / MODEL_FILE
+        self.preprocessor_path = self.artifacts_dir / PREPROCESSOR_FILE
+        self.fast_path = self.artifacts_dir / FAST_FILE
+        self.use_fast = use_fast
+        self._bundle = None
+        self._signature = None
+        # Signature of artifacts that failed to load; they are retried only once they change
+        self._failed_signature = None
+        self._lock = threading.Lock()
+
+    @property
+    def paths(self):
+        return [self.model_path, self.preprocessor_path]
+
+    def get(self):
+        """Return the current ModelBundle, reloading if the artifacts changed, or None if missing."""
+        try:
+            signature = _file_signature(self.paths)
+        except FileNotFoundError:
+            return self._bundle
+        if self.use_fast and self.fast_path.exists():
+            signature += _file_signature([self.fast_path])
+        if signature != self._signature and signature != self._failed_signature:
+            self._reload(signature)
+        return self._bundle
+
+    def load(self):
+        """Eagerly load the artifacts (used to warm the cache at startup)."""
+        return self.get()
+
+    def version(self):
+        bundle = self._bundle
+        return bundle.version if bundle is not None else None
+
+    def _reload(self, signature):
+        with self._lock:
+            # Another thread may have finished the same reload while we waited
+            if signature == self._signature or signature == self._failed_signature:
+                return
+            try:
+                version = _content_hash(self.paths)
+                n = len(self.paths)
+                if (self._bundle is not None and version == self._bundle.version
+                        and signature[n:] == self._signature[n:]):
+                    # Touched but not re-trained, and the fast predictor didn't appear or change
+                    self._signature = signature
+                    return
+                bundle = self._load_fast(version)
+                if bundle is None:
+                    clf = joblib.load(self.model_path)
+                    preprocessor = load_preprocessor(self.preprocessor_path)
+                    bundle = ModelBundle(clf, preprocessor, preprocessor.features, version)
+            except Exception as e:
+                # Keep serving the previous model if a new artifact is unreadable (e.g. mid-write)
+                print(f"Error loading model: {e}")
+                self._failed_signature = signature
+                return
+            self._bundle = bundle
+            self._signature = signature
+            print(f"Loaded model version {version} from {self.artifacts_dir}")
+
+    def _load_fast(self, version):
+        if not self.use_fast or not self.fast_path.exists():
+            return None
+        predictor = FastPredictor.load(self.fast_path)
+        if predictor.source_version != version:
+            # Exported from an older model; re-run fast_predictor.py after training
+            print(f"Ignoring stale {FAST_FILE} (built from {predictor.source_version})")
+            return None
+        return ModelBundle(predictor, None, predictor.features, version)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
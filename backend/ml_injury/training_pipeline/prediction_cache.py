@@ -0,0 +1,122 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from metrics import cache_result
+
+# ML_PREDICTION_CACHE_ENTRIES=0 turns the cache off; ML_PREDICTION_CACHE_HASH=1 keys on file
+# content instead of (mtime, size), so a rewrite with identical bytes still hits
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_MAX_MB = 256
+
+
+def _stat_signature(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+class PredictionCache:
+    """
+    LRU cache of scored result frames keyed by (input file fingerprint, model version, params).
+
+    The fingerprint is the file's (mtime, size), or with content_hash=True a SHA-256 of its
+    bytes (recomputed only when the (mtime, size) changes). Appending a row, as MLCsvUpdater
+    does, changes the fingerprint, so the next request misses and the entries for the old
+    version of that file are dropped. Entries are evicted least-recently-used first once
+    there are more than max_entries or their frames take more than max_bytes.
+
+    Cached frames are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_MB << 20, content_hash=False):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.content_hash = content_hash
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._hashes = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(max_entries=int(os.environ.get('ML_PREDICTION_CACHE_ENTRIES', DEFAULT_MAX_ENTRIES)),
+                   max_bytes=int(float(os.environ.get('ML_PREDICTION_CACHE_MB', DEFAULT_MAX_MB)) * (1 << 20)),
+                   content_hash=os.environ.get('ML_PREDICTION_CACHE_HASH') == '1')
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def fingerprint(self, path):
+        signature = _stat_signature(path)
+        if not self.content_hash:
+            return signature
+        cached = self._hashes.get(path)
+        if cached is None or cached[0] != signature:
+            h = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    h.update(chunk)
+            cached = (signature, h.hexdigest())
+            self._hashes[path] = cached
+        return cached[1]
+
+    def key(self, path, model_version, params):
+        """Cache key for a request, or None when the file is gone or the cache is off."""
+        if not self.enabled:
+            return None
+        path = os.path.realpath(path)
+        try:
+            fingerprint = self.fingerprint(path)
+        except FileNotFoundError:
+            return None
+        return (path, fingerprint, model_version, tuple(sorted(params.items())))
+
+    def get(self, key):
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            cache_result('prediction', entry is not None)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, frame):
+        if key is None:
+            return
+        size = int(frame.memory_usage(index=True, deep=True).sum())
+        if size > self.max_bytes:
+            return
+        path, fingerprint = key[0], key[1]
+        with self._lock:
+            # Results for an older version of the same file can never be requested again
+            for stale in [k for k in self._entries if k[0] == path and k[1] != fingerprint]:
+                self._drop(stale)
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (frame, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        return {'entries': len(self._entries), 'bytes': self._bytes, 'hits': self.hits, 'misses': self.misses}
+
+    def _drop(self, key):
+        _, size = self._entries.pop(key)
+        self._bytes -= size
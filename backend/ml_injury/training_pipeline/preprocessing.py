@@ -0,0 +1,87 @@
+import joblib
+import numpy as np
+
+
+class FeaturePipeline:
+    """
+    Feature selection, median imputation and standard scaling as one fitted object.
+
+    transform() copies only the model's feature columns, once, into a `dtype` array and then
+    imputes and scales that array in place. Training saves this object as
+    injury_preprocessors.joblib and inference applies the same object, so both sides select,
+    impute and scale identically.
+    """
+
+    def __init__(self, features, dtype=np.float32):
+        self.features = list(features)
+        self.dtype = np.dtype(dtype)
+        self.medians_ = None
+        self.mean_ = None
+        self.scale_ = None
+
+    @classmethod
+    def from_stats(cls, features, medians, mean, scale, dtype=np.float64):
+        pipeline = cls(features, dtype)
+        pipeline.medians_ = np.asarray(medians, dtype=np.float64)
+        pipeline.mean_ = np.asarray(mean, dtype=np.float64)
+        pipeline.scale_ = np.asarray(scale, dtype=np.float64)
+        return pipeline
+
+    @classmethod
+    def from_sklearn(cls, imputer, scaler, features):
+        """Wrap a fitted (SimpleImputer, StandardScaler) pair; float64 keeps their exact output."""
+        if np.isnan(imputer.statistics_).any():
+            raise ValueError("Imputer dropped all-NaN features; re-train to get a FeaturePipeline")
+        n = len(imputer.statistics_)
+        mean = scaler.mean_ if scaler.with_mean else np.zeros(n)
+        scale = scaler.scale_ if scaler.with_std else np.ones(n)
+        return cls.from_stats(features, imputer.statistics_, mean, scale, dtype=np.float64)
+
+    def _select(self, X):
+        if hasattr(X, 'columns'):
+            return X[self.features].to_numpy(dtype=self.dtype, copy=True)
+        return np.array(X, dtype=self.dtype, copy=True)
+
+    def _impute(self, X):
+        nan = np.isnan(X)
+        if nan.any():
+            X[nan] = np.broadcast_to(self.medians_.astype(self.dtype), X.shape)[nan]
+        return X
+
+    def _scale(self, X):
+        X -= self.mean_.astype(self.dtype)
+        X /= self.scale_.astype(self.dtype)
+        return X
+
+    def fit_transform(self, X):
+        X = self._select(X)
+        medians = np.zeros(X.shape[1])
+        has_values = ~np.isnan(X).all(axis=0)
+        # All-NaN columns are kept and filled with 0 so the feature list never changes shape
+        medians[has_values] = np.nanmedian(X[:, has_values], axis=0)
+        self.medians_ = medians
+        self._impute(X)
+        self.mean_ = X.mean(axis=0, dtype=np.float64)
+        scale = X.std(axis=0, dtype=np.float64)
+        # Constant columns are left unscaled, as StandardScaler does
+        scale[scale < 10 * np.finfo(np.float64).eps] = 1.0
+        self.scale_ = scale
+        return self._scale(X)
+
+    def fit(self, X):
+        self.fit_transform(X)
+        return self
+
+    def transform(self, X):
+        if self.medians_ is None:
+            raise ValueError("FeaturePipeline is not fitted")
+        return self._scale(self._impute(self._select(X)))
+
+
+def load_preprocessor(path):
+    """Load injury_preprocessors.joblib as a FeaturePipeline, also accepting the old (imputer, scaler, features) tuple."""
+    obj = joblib.load(path)
+    if isinstance(obj, FeaturePipeline):
+        return obj
+    imputer, scaler, features = obj
+    return FeaturePipeline.from_sklearn(imputer, scaler, features)
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+# (level, ratio) from most to least severe; ratios are cumulative, so 'medium' is the top 20%
+# minus the rows already 'high'
+RISK_TIERS = (('high', 0.10), ('medium', 0.20))
+DEFAULT_LEVEL = 'low'
+
+
+def _top_k_set(scores, k, ties):
+    # Unordered top-k of a NaN-free float array: one argpartition finds the k-th score, then rows
+    # above it plus the first (or, with ties='include', all) rows equal to it
+    n = len(scores)
+    k = min(int(k), n)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    cut = scores[np.argpartition(scores, n - k)[n - k]]
+    above = np.flatnonzero(scores > cut)
+    tied = np.flatnonzero(scores == cut)
+    if ties != 'include':
+        tied = tied[:k - len(above)]
+    return np.concatenate([above, tied])
+
+
+def _clean(scores):
+    scores = np.asarray(scores, dtype=np.float64)
+    nan = np.isnan(scores)
+    return np.where(nan, -np.inf, scores) if nan.any() else scores
+
+
+def top_k_indices(scores, k, ties='first'):
+    """
+    Indices of the k highest scores, highest first, found with argpartition rather than a full
+    sort. Equal scores are ordered by position, so the result is deterministic. ties='include'
+    also returns every row tied with the k-th score (so it may return more than k rows).
+    k <= 0 returns nothing; NaN scores rank last.
+    """
+    scores = _clean(scores)
+    chosen = _top_k_set(scores, k, ties)
+    return chosen[np.lexsort((chosen, -scores[chosen]))]
+
+
+def top_k_mask(scores, k, ties='first'):
+    mask = np.zeros(len(scores), dtype=bool)
+    mask[_top_k_set(_clean(scores), k, ties)] = True
+    return mask
+
+
+def _tier_sizes(n, tiers, min_per_tier):
+    # Cumulative top-k per tier, most severe first; min_per_tier gives each tier at least that many
+    # rows beyond the one before it, so a small group's tiers don't round down to nothing
+    sizes, k = [], 0
+    for _, ratio in tiers:
+        k = max(int(n * ratio), k + min_per_tier)
+        sizes.append(min(k, n))
+    return sizes
+
+
+def assign_tiers(scores, tiers=RISK_TIERS, groups=None, default=DEFAULT_LEVEL, ties='first', min_per_tier=0):
+    """
+    Risk level per row: within each group (e.g. a scoring date; all rows when groups is None)
+    the top int(n * ratio) rows get each tier's level, most severe tier winning. With
+    min_per_tier, each tier of a non-empty group gets at least that many rows while any are left.
+    """
+    scores = _clean(scores)
+    # Tier codes: 0 is the default level, len(tiers) the most severe tier
+    codes = np.zeros(len(scores), dtype=np.int8)
+    if groups is None:
+        members = [np.arange(len(scores))]
+    else:
+        groups = pd.Series(np.asarray(groups))
+        members = groups.groupby(groups, sort=False, dropna=False).indices.values()
+    for idx in members:
+        group_scores = scores[idx]
+        sizes = _tier_sizes(len(idx), tiers, min_per_tier)
+        # Least severe first so the more severe tiers overwrite it
+        for code, k in enumerate(reversed(sizes), start=1):
+            codes[idx[_top_k_set(group_scores, k, ties)]] = code
+    names = [default] + [level for level, _ in reversed(tiers)]
+    return np.array(names, dtype=object)[codes]
+
+
+def assign_tiers_by_reference(scores, reference, tiers=RISK_TIERS, default=DEFAULT_LEVEL):
+    """
+    Risk level per row against a reference distribution (e.g. the model's scores over the
+    season) rather than the other rows: a row gets a tier's level when its score reaches the
+    int(n * ratio)-th highest of the n reference scores. A single row is tiered the way it
+    would be among the reference rows.
+    """
+    scores = _clean(scores)
+    reference = _clean(reference)
+    n = len(reference)
+    codes = np.zeros(len(scores), dtype=np.int8)
+    for code, (level, ratio) in enumerate(reversed(tiers), start=1):
+        k = min(int(n * ratio), n)
+        if k > 0:
+            codes[scores >= np.partition(reference, n - k)[n - k]] = code
+    names = [default] + [level for level, _ in reversed(tiers)]
+    return np.array(names, dtype=object)[codes]
@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+
+GROUP_COL = 'player_name'
+ORDER_COL = 'game_date'
+
+
+def _key_values(keys):
+    # Categorical keys compare by their integer codes, which is much cheaper than the strings
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        return keys.cat.codes.to_numpy()
+    return keys.to_numpy()
+
+
+def output_dtype(df, group_col=GROUP_COL):
+    # Frames loaded with the lean dtype policy (categorical keys) get float32 features
+    return np.float32 if isinstance(df[group_col].dtype, pd.CategoricalDtype) else np.float64
+
+
+def is_sorted_by_group(df, group_col=GROUP_COL, order_col=ORDER_COL):
+    """True if df is already ordered by (group_col, order_col), so sorting again can be skipped."""
+    keys = df[group_col]
+    if len(df) < 2:
+        return True
+    if keys.isna().any() or not keys.is_monotonic_increasing:
+        return False
+    keys = _key_values(keys)
+    order = df[order_col].to_numpy()
+    same_group = keys[1:] == keys[:-1]
+    return bool(np.all(order[1:][same_group] >= order[:-1][same_group]))
+
+
+def sort_by_group(df, group_col=GROUP_COL, order_col=ORDER_COL):
+    """Return a (new) frame ordered by (group_col, order_col), sorting only when needed."""
+    if is_sorted_by_group(df, group_col, order_col):
+        return df.copy()
+    return df.sort_values([group_col, order_col])
+
+
+class GroupedRolling:
+    """
+    Trailing-window statistics for every group of a frame sorted by group, in one pass.
+
+    Rows of the same group must be contiguous. Rolling sums come from cumulative sums over
+    the whole array, so a window of any length costs O(n). Values are centred on their group
+    mean first to keep the sums of squares well conditioned. Results follow pandas'
+    rolling(w, min_periods=1) semantics: NaNs are skipped, std uses ddof=1, and rows with a
+    missing group key get NaN. Sums are always accumulated in float64; results are returned
+    as out_dtype.
+    """
+
+    def __init__(self, keys, out_dtype=np.float64):
+        keys = pd.Series(keys)
+        n = len(keys)
+        values = _key_values(keys)
+        self.out_dtype = out_dtype
+        self.n = n
+        self.idx = np.arange(n)
+        self.null_key = keys.isna().to_numpy()
+        if n:
+            change = np.empty(n, dtype=bool)
+            change[0] = True
+            change[1:] = values[1:] != values[:-1]
+            change |= self.null_key
+            self.starts = np.flatnonzero(change)
+        else:
+            self.starts = np.array([], dtype=np.int64)
+        lengths = np.diff(np.append(self.starts, n))
+        self.group_id = np.repeat(np.arange(len(self.starts)), lengths)
+        self.group_start = np.repeat(self.starts, lengths)
+        self._prefix_cache = {}
+        self._columns = {}
+
+    @classmethod
+    def from_frame(cls, df, group_col=GROUP_COL):
+        return cls(df[group_col], out_dtype=output_dtype(df, group_col))
+
+    def column(self, df, col):
+        """float64 view of df[col], cached so every window over the same column shares its prefix sums."""
+        values = self._columns.get(col)
+        if values is None:
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            self._columns[col] = values
+        return values
+
+    def _prefix(self, values):
+        # Cumulative counts, sums and sums of squares of the group-centred values (with a leading 0)
+        key = id(values)
+        cached = self._prefix_cache.get(key)
+        if cached is not None and cached[0] is values:
+            return cached[1]
+        x = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnan(x)
+        filled = np.where(valid, x, 0.0)
+        counts = np.bincount(self.group_id, weights=valid, minlength=len(self.starts))
+        totals = np.bincount(self.group_id, weights=filled, minlength=len(self.starts))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            center = np.where(counts > 0, totals / np.maximum(counts, 1), 0.0)[self.group_id]
+        centred = np.where(valid, x - center, 0.0)
+        zero = np.zeros(1)
+        prefix = (
+            np.concatenate([zero, np.cumsum(valid, dtype=np.float64)]),
+            np.concatenate([zero, np.cumsum(centred)]),
+            np.concatenate([zero, np.cumsum(centred * centred)]),
+            center,
+        )
+        self._prefix_cache[key] = (values, prefix)
+        return prefix
+
+    def _window_sums(self, values, window):
+        count_cs, sum_cs, sq_cs, center = self._prefix(values)
+        lo = np.maximum(self.idx - window + 1, self.group_start)
+        hi = self.idx + 1
+        return count_cs[hi] - count_cs[lo], sum_cs[hi] - sum_cs[lo], sq_cs[hi] - sq_cs[lo], center
+
+    def mean(self, values, window):
+        count, total, _, center = self._window_sums(values, window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out = center + total / count
+        out[(count < 1) | self.null_key] = np.nan
+        return out.astype(self.out_dtype, copy=False)
+
+    def std(self, values, window):
+        count, total, sq, _ = self._window_sums(values, window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            var = (sq - total * total / count) / (count - 1)
+        out = np.sqrt(np.maximum(var, 0.0))
+        out[(count < 2) | self.null_key] = np.nan
+        return out.astype(self.out_dtype, copy=False)
+
+    def diff(self, values):
+        x = np.asarray(values, dtype=np.float64)
+        out = np.full(self.n, np.nan)
+        if self.n > 1:
+            out[1:] = x[1:] - x[:-1]
+        out[self.starts] = np.nan
+        out[self.null_key] = np.nan
+        return out.astype(self.out_dtype, copy=False)
+
+    def diff_days(self, dates):
+        # Day difference to the previous game of the same group, like .diff().dt.days
+        dates = pd.to_datetime(pd.Series(dates)).to_numpy()
+        out = np.full(self.n, np.nan)
+        if self.n > 1:
+            out[1:] = np.floor((dates[1:] - dates[:-1]) / np.timedelta64(1, 'D'))
+        out[self.starts] = np.nan
+        out[self.null_key] = np.nan
+        return out.astype(self.out_dtype, copy=False)
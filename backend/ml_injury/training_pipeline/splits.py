@@ -0,0 +1,174 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.metrics import roc_auc_score, average_precision_score, brier_score_loss
+from sklearn.model_selection import StratifiedKFold, train_test_split
+
+SPLIT_SCHEMES = ['random', 'date', 'walk_forward', 'player']
+METADATA_PATH = Path(__file__).parent.parent / 'artifacts' / 'metadata.txt'
+# run_folds fits the bare (uncalibrated) model; with fewer training rows of either class than
+# this, a fold's scores say nothing about the model, so the fold is skipped
+MIN_TRAIN_PER_CLASS = 3
+
+
+def metadata_cutoff(path=METADATA_PATH):
+    """test_cutoff_date recorded in artifacts/metadata.txt, or None."""
+    try:
+        return json.loads(Path(path).read_text()).get('test_cutoff_date')
+    except (OSError, ValueError):
+        return None
+
+
+def date_cutoff_split(dates, cutoff):
+    """Train on games before cutoff, test on games on/after it."""
+    dates = pd.to_datetime(pd.Series(dates)).to_numpy()
+    is_test = dates >= np.datetime64(pd.Timestamp(cutoff))
+    return np.flatnonzero(~is_test), np.flatnonzero(is_test)
+
+
+def walk_forward_folds(dates, n_folds=5, gap_days=0):
+    """
+    Rolling-origin folds: the distinct game dates are cut into n_folds + 1 consecutive blocks;
+    fold i trains on everything before block i + 1 and tests on that block. gap_days drops
+    training games that fall within that many days before the test block.
+    """
+    dates = pd.to_datetime(pd.Series(dates)).to_numpy()
+    unique = np.unique(dates)
+    bounds = np.linspace(0, len(unique), n_folds + 2).astype(int)
+    folds = []
+    for i in range(1, n_folds + 1):
+        if bounds[i] >= len(unique):
+            break
+        start = unique[bounds[i]]
+        test = dates >= start
+        if bounds[i + 1] < len(unique):
+            test &= dates < unique[bounds[i + 1]]
+        train_idx = np.flatnonzero(dates < start - np.timedelta64(gap_days, 'D'))
+        test_idx = np.flatnonzero(test)
+        if len(train_idx) and len(test_idx):
+            folds.append((train_idx, test_idx))
+    return folds
+
+
+def player_group_folds(groups, n_folds=5):
+    """
+    Folds that keep all of a pitcher's games together, so consecutive games of the same player
+    never sit on both sides of a split. Players are assigned largest-first to the smallest fold.
+    """
+    groups = pd.Series(groups).to_numpy()
+    names, codes, counts = np.unique(groups, return_inverse=True, return_counts=True)
+    fold_of_player = np.empty(len(names), dtype=int)
+    fold_sizes = np.zeros(n_folds, dtype=int)
+    for player in np.argsort(-counts, kind='stable'):
+        fold = int(np.argmin(fold_sizes))
+        fold_of_player[player] = fold
+        fold_sizes[fold] += counts[player]
+    row_fold = fold_of_player[codes]
+    all_idx = np.arange(len(groups))
+    return [(all_idx[row_fold != f], all_idx[row_fold == f]) for f in range(n_folds)]
+
+
+def holdout_split(scheme, meta, y, test_size=0.2, cutoff=None, random_state=42):
+    """
+    One train/test split of the rows described by meta (player_name, game_date).
+    'random' is the stratified split the trainers used so far.
+    """
+    n = len(meta)
+    if scheme == 'random':
+        return train_test_split(np.arange(n), test_size=test_size, stratify=y, random_state=random_state)
+    if scheme == 'date':
+        cutoff = cutoff or metadata_cutoff()
+        if cutoff is None:
+            raise ValueError("date split needs --test_cutoff_date (or test_cutoff_date in metadata.txt)")
+        return date_cutoff_split(meta['game_date'], cutoff)
+    if scheme == 'walk_forward':
+        # Hold out the most recent test_size share of games
+        unique = np.unique(pd.to_datetime(meta['game_date']).to_numpy())
+        cut = int(len(unique) * (1 - test_size))
+        if not 0 < cut < len(unique):
+            raise ValueError(f"walk_forward split of {len(unique)} game dates with test_size={test_size} "
+                             "leaves no train or no test dates")
+        return date_cutoff_split(meta['game_date'], unique[cut])
+    if scheme == 'player':
+        n_folds = max(2, int(round(1 / test_size)))
+        return player_group_folds(meta['player_name'], n_folds)[0]
+    raise ValueError(f"Unknown split scheme: {scheme}")
+
+
+def inner_split_scheme(scheme):
+    """Scheme for carving validation rows out of the training rows ('date' has no second cutoff)."""
+    return 'walk_forward' if scheme == 'date' else scheme
+
+
+def cv_folds(scheme, meta, y, n_folds=5, gap_days=0, random_state=42):
+    """Precomputed (train_idx, test_idx) arrays for cross-validation."""
+    if scheme == 'walk_forward' or scheme == 'date':
+        return walk_forward_folds(meta['game_date'], n_folds, gap_days)
+    if scheme == 'player':
+        return player_group_folds(meta['player_name'], n_folds)
+    skf = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=random_state)
+    return list(skf.split(np.zeros(len(y)), y))
+
+
+def _fit_eval_fold(make_model, X, y, train_idx, test_idx, model_threads=None, preprocess=None):
+    y_test = y[test_idx]
+    train_counts = np.bincount(y[train_idx].astype(int), minlength=2)
+    if train_counts.min() < MIN_TRAIN_PER_CLASS or len(np.unique(y_test)) < 2:
+        return None
+    model = make_model()
+    if model_threads is not None and 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=model_threads)
+    X_train, X_test = X[train_idx], X[test_idx]
+    if preprocess is not None:
+        pipeline = preprocess()
+        X_train, X_test = pipeline.fit_transform(X_train), pipeline.transform(X_test)
+    model.fit(X_train, y[train_idx])
+    probs = model.predict_proba(X_test)[:, 1]
+    return {
+        'roc_auc': roc_auc_score(y_test, probs),
+        'pr_auc': average_precision_score(y_test, probs),
+        'brier': brier_score_loss(y_test, probs),
+        'n_test': len(test_idx),
+    }
+
+
+def run_folds(make_model, X, y, folds, n_jobs=-1, preprocess=None):
+    """
+    Fit and score make_model() on every fold in parallel. make_model must be picklable
+    (e.g. a functools.partial); joblib memory-maps X so workers don't copy it.
+    Folds with a single class in the test rows, or too few of either class to fit, are skipped.
+    When folds run in parallel each model gets one thread, so XGBoost's own threads don't
+    oversubscribe the cores. preprocess, if given, makes an unfitted FeaturePipeline that is
+    fit on each fold's training rows, so the test rows never reach its medians or scaling.
+    """
+    X = np.asarray(X)
+    y = np.asarray(y)
+    model_threads = None if n_jobs == 1 else 1
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_eval_fold)(make_model, X, y, train_idx, test_idx, model_threads, preprocess)
+        for train_idx, test_idx in folds
+    )
+    return [r for r in results if r is not None]
+
+
+def summarize_folds(results):
+    if not results:
+        print("CV: no usable folds")
+        return {}
+    summary = {}
+    for metric in ['roc_auc', 'pr_auc', 'brier']:
+        values = np.array([r[metric] for r in results])
+        summary[metric] = (values.mean(), values.std())
+        print(f"CV {metric}: {values.mean():.3f} ± {values.std():.3f} over {len(values)} folds")
+    return summary
+
+
+def add_split_args(parser):
+    parser.add_argument('--split', choices=SPLIT_SCHEMES, default='random')
+    parser.add_argument('--test_cutoff_date', default=None, help='for --split date; defaults to metadata.txt')
+    parser.add_argument('--cv_folds', type=int, default=0, help='cross-validate on the training rows first')
+    parser.add_argument('--cv_gap_days', type=int, default=0)
+    parser.add_argument('--n_jobs', type=int, default=-1)
@@ -0,0 +1,138 @@
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SCHEMA_PATH = Path(__file__).parent.parent / 'artifacts' / 'feature_columns.csv'
+PITCHERS_PER_TEAM = 13
+# Season window and days between appearances for starters / relievers
+SEASON_START, SEASON_END = '04-01', '09-28'
+STARTER_GAP, RELIEVER_GAP = 5, 2
+STARTERS_PER_TEAM = 5
+INJURY_RATE = 0.03
+
+# Typical per-pitch value (mean, between-pitcher spread, within-game spread) of each Statcast feature
+CORE_STATS = {
+    'release_speed': (92.0, 3.0, 1.2),
+    'release_spin_rate': (2300.0, 180.0, 90.0),
+    'release_extension': (6.4, 0.3, 0.12),
+    'release_pos_x': (-1.6, 1.0, 0.15),
+    'release_pos_y': (54.1, 0.3, 0.12),
+    'release_pos_z': (5.8, 0.3, 0.1),
+    'pfx_x': (-0.3, 0.6, 0.4),
+    'pfx_z': (1.0, 0.4, 0.3),
+    'spin_axis': (180.0, 50.0, 25.0),
+    'delta_run_exp': (0.0, 0.005, 0.25),
+}
+PITCH_TYPES = ['FF', 'SI', 'SL', 'CH', 'CU', 'FC', 'ST', 'KC', 'FS', 'SV', 'FA', 'KN']
+PITCH_MIX = np.array([0.32, 0.16, 0.16, 0.11, 0.07, 0.07, 0.05, 0.02, 0.02, 0.01, 0.005, 0.005])
+
+
+def load_schema(path=SCHEMA_PATH):
+    """The game-level feature columns the models were trained on."""
+    return pd.read_csv(path)['features'].tolist()
+
+
+def appearances(n_teams=1, n_seasons=1, first_season=2024, seed=0):
+    """One row per (pitcher, game date): starters every STARTER_GAP days, relievers every RELIEVER_GAP."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for season in range(first_season, first_season + n_seasons):
+        days = pd.date_range(f'{season}-{SEASON_START}', f'{season}-{SEASON_END}')
+        for team in range(n_teams):
+            for p in range(PITCHERS_PER_TEAM):
+                gap = STARTER_GAP if p < STARTERS_PER_TEAM else RELIEVER_GAP
+                offsets = np.cumsum(rng.integers(gap, 2 * gap, len(days) // gap + 1)) - gap + p % gap
+                dates = days[offsets[offsets < len(days)]]
+                frames.append(pd.DataFrame({
+                    'player_name': f'Pitcher{p:02d}, Team{team:02d}',
+                    'game_date': dates,
+                    'starter': p < STARTERS_PER_TEAM,
+                }))
+    return pd.concat(frames, ignore_index=True).sort_values(['player_name', 'game_date'], ignore_index=True)
+
+
+def synthetic_games(n_teams=1, n_seasons=1, schema=None, seed=0):
+    """
+    Game-level rows with the real column schema (player_name, game_date, every column of
+    feature_columns.csv, result). Values are drawn per pitcher and per game around realistic
+    Statcast levels, so the rolling features and models see plausible inputs at any scale.
+    """
+    rng = np.random.default_rng(seed)
+    schema = load_schema() if schema is None else schema
+    games = appearances(n_teams, n_seasons, seed=seed)
+    n = len(games)
+    pitcher = pd.factorize(games['player_name'])[0]
+    n_pitchers = pitcher.max() + 1
+    starter = games['starter'].to_numpy()
+
+    cols = {'player_name': games['player_name'].to_numpy(), 'game_date': games['game_date'].to_numpy()}
+    cols['total_pitches'] = np.where(starter, rng.integers(60, 110, n), rng.integers(8, 35, n))
+    # Each pitcher throws a random subset of pitch types with a personal mix
+    throws = rng.random((n_pitchers, len(PITCH_TYPES))) < np.clip(PITCH_MIX * 4, 0.05, 0.95)
+    throws[:, 0] = True
+    mix = np.where(throws, rng.dirichlet(np.ones(len(PITCH_TYPES)), n_pitchers) + PITCH_MIX, 0.0)
+    mix = mix / mix.sum(axis=1, keepdims=True)
+
+    for feat, (mean, between, within) in CORE_STATS.items():
+        level = mean + between * rng.standard_normal(n_pitchers)
+        game_mean = level[pitcher] + within / 3 * rng.standard_normal(n)
+        cols[f'{feat}_mean_all'] = game_mean
+        cols[f'{feat}_std_all'] = within * rng.uniform(0.7, 1.3, n)
+        cols[f'{feat}_range_all'] = cols[f'{feat}_std_all'] * rng.uniform(2.5, 4.5, n)
+        for j, pitch in enumerate(PITCH_TYPES):
+            thrown = throws[pitcher, j]
+            cols[f'{pitch}_{feat}_mean'] = np.where(thrown, game_mean + within * rng.standard_normal(n), np.nan)
+            cols[f'{pitch}_{feat}_std'] = np.where(thrown, within * rng.uniform(0.5, 1.2, n), np.nan)
+    for j, pitch in enumerate(PITCH_TYPES):
+        cols[f'pct_{pitch}'] = np.where(throws[pitcher, j], mix[pitcher, j], np.nan)
+
+    df = pd.DataFrame({c: cols[c] for c in ['player_name', 'game_date']})
+    feature_data = {c: cols.get(c, np.full(n, np.nan)) for c in schema if c not in df.columns}
+    df = pd.concat([df, pd.DataFrame(feature_data)], axis=1)
+    # Injuries are more likely after heavy, fast outings
+    risk = INJURY_RATE * np.exp(0.015 * (df['total_pitches'] - 60) + 0.3 * (df['release_speed_mean_all'] - 92) / 3)
+    df['result'] = (rng.random(n) < np.clip(risk, 0, 0.5)).astype(float)
+    return df
+
+
+def synthetic_pitches(n_teams=1, n_seasons=1, seed=0):
+    """Pitch-level rows (player_name, game_date, pitch_type, Statcast features) as aggregate_Dataset.py reads them."""
+    rng = np.random.default_rng(seed)
+    games = appearances(n_teams, n_seasons, seed=seed)
+    counts = np.where(games['starter'], rng.integers(60, 110, len(games)), rng.integers(8, 35, len(games)))
+    idx = np.repeat(np.arange(len(games)), counts)
+    n = len(idx)
+    pitcher = pd.factorize(games['player_name'])[0][idx]
+    df = pd.DataFrame({
+        'player_name': games['player_name'].to_numpy()[idx],
+        'game_date': games['game_date'].to_numpy()[idx],
+        'pitch_type': np.array(PITCH_TYPES)[rng.choice(len(PITCH_TYPES), n, p=PITCH_MIX / PITCH_MIX.sum())],
+    })
+    for feat, (mean, between, within) in CORE_STATS.items():
+        level = mean + between * rng.standard_normal(pitcher.max() + 1)
+        df[feat] = level[pitcher] + within * rng.standard_normal(n)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic game-level (or pitch-level) data with the real schema')
+    parser.add_argument('--teams', type=int, default=1)
+    parser.add_argument('--seasons', type=int, default=1)
+    parser.add_argument('--pitches', action='store_true', help='pitch-level rows instead of game-level')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out_path', default='synthetic_games.csv')
+    args = parser.parse_args()
+
+    make = synthetic_pitches if args.pitches else synthetic_games
+    df = make(args.teams, args.seasons, seed=args.seed)
+    if args.out_path.endswith('.parquet'):
+        df.to_parquet(args.out_path, index=False)
+    else:
+        df.to_csv(args.out_path, index=False)
+    print(f"Saved {len(df)} rows x {df.shape[1]} columns to {args.out_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,40 +1,42 @@
 import argparse
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from sklearn.impute import SimpleImputer
-from sklearn.calibration import CalibratedClassifierCV
 from sklearn.metrics import roc_auc_score, average_precision_score, brier_score_loss, confusion_matrix
 import xgboost as xgb
 import joblib
+from functools import partial
 
+from calibration import add_calibration_args, fit_calibrated, report_timings
+from dataset_store import load_game_frame
+from feature_cache import add_cache_args, dataset_from_args
 from feature_engineering import enrich_features
+from preprocessing import FeaturePipeline
+from ranking import top_k_indices
+from splits import add_split_args, holdout_split, cv_folds, run_folds, summarize_folds
 
-def build_dataset(df, feature_cap=300):
+def build_dataset(df, feature_cap=300, with_meta=False):
     df = df.sort_values(['player_name', 'game_date'])
     df = enrich_features(df)
     df = df.dropna(subset=['result'])
 
-    X = df.drop(columns=['player_name', 'game_date', 'result', 'result'])
+    candidates = df.drop(columns=['player_name', 'game_date', 'result'])
     y = df['result']
 
     # Drop constant or high-null features
-    X = X.loc[:, X.isnull().mean() < 0.95]
-    nunique = X.nunique()
-    X = X.loc[:, nunique > 1]
-
-    imputer = SimpleImputer(strategy='median')
-    scaler = StandardScaler()
-
-    X = imputer.fit_transform(X)
-    X = scaler.fit_transform(X)
-
-    feature_names = df.drop(columns=['player_name', 'game_date', 'result', 'result']).columns[:X.shape[1]]
-    return X, y.values, feature_names, imputer, scaler
-
-def train_model(X, y, args):
-    clf = xgb.XGBClassifier(
+    keep = (candidates.isnull().mean() < 0.95) & (candidates.nunique() > 1)
+    feature_names = list(candidates.columns[keep.to_numpy()])
+
+    # Unfitted: main fits it on the training rows only, so held-out rows never reach the medians or scaling
+    pipeline = FeaturePipeline(feature_names)
+    X = df[feature_names].to_numpy(dtype=pipeline.dtype)
+    if with_meta:
+        # Row-aligned player/date for time- and player-aware splits
+        meta = df[['player_name', 'game_date']].reset_index(drop=True)
+        return X, y.values, feature_names, pipeline, meta
+    return X, y.values, feature_names, pipeline
+
+def make_model(args):
+    return xgb.XGBClassifier(
         n_estimators=args.xgb_n_estimators,
         learning_rate=args.xgb_learning_rate,
         max_depth=args.xgb_max_depth,
@@ -47,8 +49,6 @@ def train_model(X, y, args):
         eval_metric='logloss',
         verbosity=0,
     )
-    clf.fit(X, y)
-    return clf
 
 def evaluate_model(clf, X_test, y_test):
     probas = clf.predict_proba(X_test)[:, 1]
@@ -57,11 +57,11 @@ def evaluate_model(clf, X_test, y_test):
     brier = brier_score_loss(y_test, probas)
 
     top_k = int(len(y_test) * 0.10)
-    top_idx = np.argsort(probas)[-top_k:][::-1]
+    top_idx = top_k_indices(probas, top_k)
     y_pred_topk = np.zeros_like(y_test)
     y_pred_topk[top_idx] = 1
 
-    precision = (y_test[top_idx] == 1).sum() / top_k
+    precision = (y_test[top_idx] == 1).sum() / top_k if top_k > 0 else 0.0
     recall = (y_pred_topk * y_test).sum() / max(y_test.sum(), 1)
     tn, fp, fn, tp = confusion_matrix(y_test, y_pred_topk).ravel()
 
@@ -87,26 +87,40 @@ def main():
     parser.add_argument('--xgb_min_child_weight', type=float, default=8)
     parser.add_argument('--xgb_reg_lambda', type=float, default=5.0)
     parser.add_argument('--xgb_reg_alpha', type=float, default=1.0)
+    add_split_args(parser)
+    add_calibration_args(parser)
+    add_cache_args(parser)
     args = parser.parse_args()
 
-    print("Loading data...")
-    df = pd.read_csv(args.path)
-    print("Generating advanced features...")
-    X, y, feature_names, imputer, scaler = build_dataset(df, feature_cap=args.feature_cap)
-
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, stratify=y, random_state=42)
+    def build():
+        print("Loading data...")
+        df = load_game_frame(args.path, lean=True)
+        print("Generating advanced features...")
+        return build_dataset(df, feature_cap=args.feature_cap, with_meta=True)
+
+    X, y, feature_names, pipeline, meta = dataset_from_args(args, build, [__file__], {'feature_cap': args.feature_cap})
+
+    train_idx, test_idx = holdout_split(args.split, meta, y, test_size=0.25, cutoff=args.test_cutoff_date)
+    y_train, y_test = y[train_idx], y[test_idx]
+    if args.cv_folds:
+        print(f"Cross-validating ({args.split}, {args.cv_folds} folds)...")
+        folds = cv_folds(args.split, meta.iloc[train_idx].reset_index(drop=True), y_train, args.cv_folds, args.cv_gap_days)
+        summarize_folds(run_folds(partial(make_model, args), X[train_idx], y_train, folds, args.n_jobs,
+                                  preprocess=partial(FeaturePipeline, feature_names)))
+    X = pipeline.fit(X[train_idx]).transform(X)
+    X_train, X_test = X[train_idx], X[test_idx]
     print("Training model...")
-    clf = train_model(X_train, y_train, args)
-
-    if args.calibration == 'isotonic':
-        print("Calibrating probabilities...")
-        clf = CalibratedClassifierCV(estimator=clf, method='isotonic', cv=3)
-        clf.fit(X_train, y_train)
+    method = 'isotonic' if args.calibration == 'isotonic' else None
+    clf, timings = fit_calibrated(partial(make_model, args), X_train, y_train, method=method,
+                                  mode=args.calibration_mode, calib_size=args.calib_size,
+                                  meta=meta.iloc[train_idx].reset_index(drop=True), scheme=args.split)
+    report_timings(timings, args.calibration_mode)
 
     print("Evaluating on test set...")
     evaluate_model(clf, X_test, y_test)
 
     joblib.dump(clf, 'artifacts/injury_xgb_final.joblib')
+    joblib.dump(pipeline, 'artifacts/injury_preprocessors.joblib')
     print("Saved model to artifacts/injury_xgb_final.joblib")
 
 if __name__ == "__main__":
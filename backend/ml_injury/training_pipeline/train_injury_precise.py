@@ -2,49 +2,64 @@ import pandas as pd
 import numpy as np
 import argparse
 import joblib
-from sklearn.model_selection import train_test_split
-from sklearn.impute import SimpleImputer
-from sklearn.preprocessing import StandardScaler
-from sklearn.calibration import CalibratedClassifierCV
+from functools import partial
 from sklearn.metrics import roc_auc_score, average_precision_score, brier_score_loss, confusion_matrix
 from xgboost import XGBClassifier
-from feature_engineering import enrich_features
-
-
-def add_trend_features(df):
-    df = df.sort_values(['player_name', 'game_date'])
-    for col in ['release_speed_mean_all', 'release_spin_rate_mean_all']:
-        df[f'{col}_rolling_3'] = df.groupby('player_name')[col].transform(lambda x: x.rolling(window=3, min_periods=1).mean())
-        df[f'{col}_trend'] = df[col] - df[f'{col}_rolling_3']
-    df['pitch_count_rolling_3'] = df.groupby('player_name')['total_pitches'].transform(lambda x: x.rolling(3, min_periods=1).mean())
-    df['acwr'] = df['total_pitches'] / (df['pitch_count_rolling_3'] + 1e-5)
-    df['days_rest'] = df.groupby('player_name')['game_date'].diff().dt.days.fillna(5)
-    df['short_rest'] = (df['days_rest'] < 4).astype(int)
-    return df
-
-
-def build_dataset(df, feature_cap):
-    df = enrich_features(df)
-    df = add_trend_features(df)
-
-    features = [
-        'release_speed_mean_all', 'release_spin_rate_mean_all',
-        'total_pitches', 'acwr', 'days_rest', 'short_rest',
-        'release_var', 'release_speed_mean_all_trend', 'release_spin_rate_mean_all_trend'
-    ]
+from calibration import add_calibration_args, fit_calibrated, report_timings
+from dataset_store import load_game_frame
+from feature_cache import add_cache_args, dataset_from_args
+from fast_predictor import export_fast_predictor
+from feature_registry import TREND_FEATURES, compute_features, prepare_rolling
+from preprocessing import FeaturePipeline
+from ranking import top_k_indices
+from splits import add_split_args, holdout_split, cv_folds, run_folds, summarize_folds
+
+
+def add_trend_features(df, rolling=None):
+    return TREND_FEATURES.compute(df, rolling=rolling)
+
+
+FEATURES = [
+    'release_speed_mean_all', 'release_spin_rate_mean_all',
+    'total_pitches', 'acwr', 'days_rest', 'short_rest',
+    'release_var', 'release_speed_mean_all_trend', 'release_spin_rate_mean_all_trend'
+]
+
+
+def build_dataset(df, feature_cap, with_meta=False):
+    features = list(FEATURES)
     if feature_cap:
         features = features[:feature_cap]
+    # Only these features (and what they read) are computed, not the whole enrichment
+    df, rolling = prepare_rolling(df, None)
+    df = compute_features(df, features, rolling=rolling)
 
     df = df.dropna(subset=features + ['result'])
-    X = df[features].copy()
     y = df['result']
 
-    imputer = SimpleImputer(strategy='median')
-    scaler = StandardScaler()
-    X = imputer.fit_transform(X)
-    X = scaler.fit_transform(X)
+    # Unfitted: main fits it on the training rows only, so held-out rows never reach the medians or scaling
+    pipeline = FeaturePipeline(features)
+    X = df[features].to_numpy(dtype=pipeline.dtype)
+
+    if with_meta:
+        meta = df[['player_name', 'game_date']].reset_index(drop=True)
+        return X, y, features, pipeline, meta
+    return X, y, features, pipeline
+
 
-    return X, y, features, imputer, scaler
+def make_model(args):
+    return XGBClassifier(
+        n_estimators=args.xgb_n_estimators,
+        learning_rate=args.xgb_learning_rate,
+        max_depth=args.xgb_max_depth,
+        subsample=args.xgb_subsample,
+        colsample_bytree=args.xgb_colsample_bytree,
+        min_child_weight=args.xgb_min_child_weight,
+        reg_lambda=args.xgb_reg_lambda,
+        reg_alpha=args.xgb_reg_alpha,
+        use_label_encoder=False,
+        eval_metric='logloss'
+    )
 
 
 def evaluate_model(model, X_test, y_test, top_k):
@@ -53,8 +68,7 @@ def evaluate_model(model, X_test, y_test, top_k):
     pr = average_precision_score(y_test, probs)
     brier = brier_score_loss(y_test, probs)
 
-    sorted_idx = np.argsort(probs)[::-1]
-    top_k_idx = sorted_idx[:top_k]
+    top_k_idx = top_k_indices(probs, top_k)
 
     precision = (y_test[top_k_idx] == 1).sum() / top_k if top_k > 0 else 0.0
     recall = (y_test[top_k_idx] == 1).sum() / y_test.sum() if y_test.sum() > 0 else 0.0
@@ -87,31 +101,33 @@ def main():
     parser.add_argument('--xgb_min_child_weight', type=int, default=5)
     parser.add_argument('--xgb_reg_lambda', type=float, default=1.0)
     parser.add_argument('--xgb_reg_alpha', type=float, default=0.0)
+    add_split_args(parser)
+    add_calibration_args(parser)
+    add_cache_args(parser)
     args = parser.parse_args()
 
-    print("Loading data...")
-    df = pd.read_csv(args.path, parse_dates=['game_date'])
-
-    print("Building dataset...")
-    X, y, feature_names, imputer, scaler = build_dataset(df, args.feature_cap)
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, stratify=y, random_state=42)
+    def build():
+        print("Loading data...")
+        df = load_game_frame(args.path, lean=True)
+        print("Building dataset...")
+        return build_dataset(df, args.feature_cap, with_meta=True)
+
+    X, y, feature_names, pipeline, meta = dataset_from_args(args, build, [__file__], {'feature_cap': args.feature_cap})
+    train_idx, test_idx = holdout_split(args.split, meta, y, test_size=0.2, cutoff=args.test_cutoff_date)
+    y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
+    if args.cv_folds:
+        print(f"Cross-validating ({args.split}, {args.cv_folds} folds)...")
+        folds = cv_folds(args.split, meta.iloc[train_idx].reset_index(drop=True), y_train, args.cv_folds, args.cv_gap_days)
+        summarize_folds(run_folds(partial(make_model, args), X[train_idx], y_train, folds, args.n_jobs,
+                                  preprocess=partial(FeaturePipeline, feature_names)))
+    X = pipeline.fit(X[train_idx]).transform(X)
+    X_train, X_test = X[train_idx], X[test_idx]
 
     print("Training model...")
-    clf = XGBClassifier(
-        n_estimators=args.xgb_n_estimators,
-        learning_rate=args.xgb_learning_rate,
-        max_depth=args.xgb_max_depth,
-        subsample=args.xgb_subsample,
-        colsample_bytree=args.xgb_colsample_bytree,
-        min_child_weight=args.xgb_min_child_weight,
-        reg_lambda=args.xgb_reg_lambda,
-        reg_alpha=args.xgb_reg_alpha,
-        use_label_encoder=False,
-        eval_metric='logloss'
-    )
-
-    clf = CalibratedClassifierCV(estimator=clf, method=args.calibration, cv=3)
-    clf.fit(X_train, y_train)
+    clf, timings = fit_calibrated(partial(make_model, args), X_train, y_train, method=args.calibration,
+                                  mode=args.calibration_mode, calib_size=args.calib_size,
+                                  meta=meta.iloc[train_idx].reset_index(drop=True), scheme=args.split)
+    report_timings(timings, args.calibration_mode)
 
     print("Evaluating on test set...")
     top_k = int(args.target_rate * len(y_test))
@@ -119,7 +135,8 @@ def main():
 
     print("Saving model...")
     joblib.dump(clf, 'artifacts/injury_xgb_final.joblib')
-    joblib.dump((imputer, scaler, feature_names), 'artifacts/injury_preprocessors.joblib')
+    joblib.dump(pipeline, 'artifacts/injury_preprocessors.joblib')
+    print(f"Exported {export_fast_predictor('artifacts')}")
 
 
 if __name__ == '__main__':
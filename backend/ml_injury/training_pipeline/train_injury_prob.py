@@ -2,40 +2,62 @@
 # and a more stable modeling pipeline with better calibration and thresholding logic.
 
 import argparse
+from functools import partial
 import pandas as pd
 import numpy as np
 import xgboost as xgb
-from sklearn.model_selection import train_test_split
-from sklearn.calibration import CalibratedClassifierCV
 from sklearn.metrics import roc_auc_score, average_precision_score, brier_score_loss, confusion_matrix
-from sklearn.preprocessing import StandardScaler
-from sklearn.impute import SimpleImputer
 from joblib import dump
 
+from calibration import add_calibration_args, fit_calibrated, report_timings
+from dataset_store import load_game_frame
+from feature_cache import add_cache_args, dataset_from_args
 from feature_engineering import enrich_features
+from preprocessing import FeaturePipeline
+from ranking import top_k_indices
+from splits import add_split_args, holdout_split, cv_folds, run_folds, summarize_folds
 
 
-def build_dataset(df, feature_cap=300):
+def build_dataset(df, feature_cap=300, with_meta=False):
     df = enrich_features(df)
     df = df.dropna(subset=['result'])
     y = df['result'].astype(int)
 
     feature_cols = [col for col in df.columns if col not in ['player_name', 'game_date', 'result']]
-    X = df[feature_cols]
+    # Cap before preprocessing so only the kept columns are imputed and scaled
+    feature_names = feature_cols[:feature_cap]
 
-    imputer = SimpleImputer(strategy='median')
-    X_imputed = imputer.fit_transform(X)
+    # Unfitted: main fits it on the training rows only, so held-out rows never reach the medians or scaling
+    pipeline = FeaturePipeline(feature_names)
+    X = df[feature_names].to_numpy(dtype=pipeline.dtype)
+    if with_meta:
+        meta = df[['player_name', 'game_date']].reset_index(drop=True)
+        return X, y, feature_names, pipeline, meta
+    return X, y, feature_names, pipeline
 
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X_imputed)
 
-    feature_names = feature_cols[:feature_cap]
-    return X_scaled[:, :feature_cap], y, feature_names, imputer, scaler
+def make_model(args):
+    return xgb.XGBClassifier(
+        n_estimators=args.xgb_n_estimators,
+        learning_rate=args.xgb_learning_rate,
+        max_depth=args.xgb_max_depth,
+        subsample=args.xgb_subsample,
+        colsample_bytree=args.xgb_colsample_bytree,
+        min_child_weight=args.xgb_min_child_weight,
+        reg_lambda=args.xgb_reg_lambda,
+        reg_alpha=args.xgb_reg_alpha,
+        use_label_encoder=False,
+        eval_metric='logloss'
+    )
 
 
 def threshold_top_k(pred_probs, k):
-    threshold = np.sort(pred_probs)[-k] if k < len(pred_probs) else 0.0
-    return (pred_probs >= threshold).astype(int), threshold
+    # Rows tied with the k-th probability are flagged too, as a >= threshold would
+    top_idx = top_k_indices(pred_probs, k, ties='include')
+    preds = np.zeros(len(pred_probs), dtype=int)
+    preds[top_idx] = 1
+    threshold = pred_probs[top_idx[-1]] if len(top_idx) else np.inf
+    return preds, threshold
 
 
 def main():
@@ -53,35 +75,34 @@ def main():
     parser.add_argument('--xgb_min_child_weight', type=float, default=3)
     parser.add_argument('--xgb_reg_lambda', type=float, default=1.0)
     parser.add_argument('--xgb_reg_alpha', type=float, default=0.1)
+    add_split_args(parser)
+    add_calibration_args(parser)
+    add_cache_args(parser)
     args = parser.parse_args()
 
-    print("Loading data...")
-    df = pd.read_csv(args.path)
+    def build():
+        print("Loading data...")
+        df = load_game_frame(args.path, lean=True)
+        print("Generating advanced features...")
+        return build_dataset(df, feature_cap=args.feature_cap, with_meta=True)
 
-    print("Generating advanced features...")
-    X, y, feature_names, imputer, scaler = build_dataset(df, feature_cap=args.feature_cap)
+    X, y, feature_names, pipeline, meta = dataset_from_args(args, build, [__file__], {'feature_cap': args.feature_cap})
 
-    X_train, X_test, y_train, y_test = train_test_split(X, y, stratify=y, test_size=0.25, random_state=42)
+    train_idx, test_idx = holdout_split(args.split, meta, y, test_size=0.25, cutoff=args.test_cutoff_date)
+    y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
+    if args.cv_folds:
+        print(f"Cross-validating ({args.split}, {args.cv_folds} folds)...")
+        folds = cv_folds(args.split, meta.iloc[train_idx].reset_index(drop=True), y_train, args.cv_folds, args.cv_gap_days)
+        summarize_folds(run_folds(partial(make_model, args), X[train_idx], y_train, folds, args.n_jobs,
+                                  preprocess=partial(FeaturePipeline, feature_names)))
+    X = pipeline.fit(X[train_idx]).transform(X)
+    X_train, X_test = X[train_idx], X[test_idx]
 
     print("Training model...")
-    clf = xgb.XGBClassifier(
-        n_estimators=args.xgb_n_estimators,
-        learning_rate=args.xgb_learning_rate,
-        max_depth=args.xgb_max_depth,
-        subsample=args.xgb_subsample,
-        colsample_bytree=args.xgb_colsample_bytree,
-        min_child_weight=args.xgb_min_child_weight,
-        reg_lambda=args.xgb_reg_lambda,
-        reg_alpha=args.xgb_reg_alpha,
-        use_label_encoder=False,
-        eval_metric='logloss'
-    )
-    clf.fit(X_train, y_train)
-
-    if args.calibration:
-        print("Calibrating probabilities...")
-        clf = CalibratedClassifierCV(estimator=clf, method=args.calibration, cv=3)
-        clf.fit(X_train, y_train)
+    clf, timings = fit_calibrated(partial(make_model, args), X_train, y_train, method=args.calibration or None,
+                                  mode=args.calibration_mode, calib_size=args.calib_size,
+                                  meta=meta.iloc[train_idx].reset_index(drop=True), scheme=args.split)
+    report_timings(timings, args.calibration_mode)
 
     print("Evaluating on test set...")
     probas = clf.predict_proba(X_test)[:, 1]
@@ -106,8 +127,7 @@ def main():
     print(f"Confusion Matrix [TN FP; FN TP]: [{tn}, {fp}, {fn}, {tp}]")
 
     dump(clf, 'artifacts/injury_xgb_final.joblib')
-    dump(imputer, 'artifacts/imputer.joblib')
-    dump(scaler, 'artifacts/scaler.joblib')
+    dump(pipeline, 'artifacts/injury_preprocessors.joblib')
     print("Saved model to artifacts/injury_xgb_final.joblib")
 
 
@@ -1,39 +1,116 @@
-import pandas as pd
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import roc_auc_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
 
-# Dummy window selector for illustrative purposes
-def select_best_window(df, windows=[5, 7, 9], target_col='injury_next_game'):
-    best_auc = -1
-    best_window = None
-    best_subset = None
+from dataset_store import load_game_frame
+from feature_engineering import enrich_features
+from splits import METADATA_PATH, player_group_folds
+
+NON_FEATURE_COLS = ['player_name', 'game_date', 'result', 'injury_next_game']
+MIN_POSITIVES = 5
+# The label column of the game-level datasets, as in the trainers
+TARGET_COL = 'result'
+
+
+def games_from_end(df):
+    """0 for each player's most recent game, 1 for the one before, ... (df sorted by player/date)."""
+    return df.groupby('player_name', sort=False, observed=True).cumcount(ascending=False).to_numpy()
 
-    for w in windows:
-        subset = df.groupby('player_name').tail(w)
-        if subset[target_col].sum() < 5:
-            print(f"W={w} ROC AUC (val): NA (too few positives)")
-            continue
 
-        X = subset.drop(columns=['player_name', 'game_date', 'result', 'injury_next_game'])
-        y = subset[target_col]
-        X = X.fillna(X.median())
-
-        try:
-            from sklearn.linear_model import LogisticRegression
-            model = LogisticRegression()
-            model.fit(X, y)
-            probas = model.predict_proba(X)[:, 1]
-            auc = roc_auc_score(y, probas)
-            print(f"W={w} ROC AUC (val): {auc:.3f}")
-            if auc > best_auc:
-                best_auc = auc
-                best_window = w
-                best_subset = subset
-        except:
-            print(f"W={w} ROC AUC (val): ERROR")
+def window_masks(rank_from_end, windows):
+    """Row masks for the last-w-games subset of every window; they are nested, so one rank array serves all."""
+    return {w: rank_from_end < w for w in sorted(windows)}
+
+
+def _fit_eval_fold(X, y, train_idx, test_idx):
+    y_train, y_test = y[train_idx], y[test_idx]
+    if len(np.unique(y_train)) < 2 or len(np.unique(y_test)) < 2:
+        return np.nan
+    # Imputation and scaling are fitted on the training fold only
+    model = make_pipeline(SimpleImputer(strategy='median'), StandardScaler(), LogisticRegression(max_iter=1000))
+    model.fit(X[train_idx], y_train)
+    return roc_auc_score(y_test, model.predict_proba(X[test_idx])[:, 1])
+
+
+def evaluate_windows(X, y, groups, masks, n_folds=5, n_jobs=-1):
+    """
+    Mean held-out ROC AUC per window. Each window's rows are split into player-group folds and
+    every (window, fold) fit runs in parallel over the one shared feature matrix.
+    Windows with fewer than MIN_POSITIVES positives get NaN.
+    """
+    jobs = []
+    for w, mask in masks.items():
+        rows = np.flatnonzero(mask)
+        if y[rows].sum() < MIN_POSITIVES:
             continue
+        for train_pos, test_pos in player_group_folds(groups[rows], n_folds):
+            jobs.append((w, rows[train_pos], rows[test_pos]))
+
+    aucs = Parallel(n_jobs=n_jobs)(delayed(_fit_eval_fold)(X, y, tr, te) for _, tr, te in jobs)
+    scores = {w: [] for w in masks}
+    for (w, _, _), auc in zip(jobs, aucs):
+        if not np.isnan(auc):
+            scores[w].append(auc)
+    return {w: float(np.mean(s)) if s else np.nan for w, s in scores.items()}
 
-    if best_window is None:
+
+def record_window_results(best_window, summary, path=METADATA_PATH):
+    """Write best_W and windows_summary into artifacts/metadata.txt, keeping the other keys."""
+    path = Path(path)
+    try:
+        metadata = json.loads(path.read_text())
+    except (OSError, ValueError):
+        metadata = {}
+    metadata['best_W'] = int(best_window)
+    metadata['windows_summary'] = {str(w): auc for w, auc in summary.items() if not np.isnan(auc)}
+    path.write_text(json.dumps(metadata, indent=2))
+
+
+def select_best_window(df, windows=[5, 7, 9], target_col=TARGET_COL, n_folds=5, n_jobs=-1,
+                       metadata_path=None):
+    df = df.sort_values(['player_name', 'game_date'], kind='mergesort').reset_index(drop=True)
+    y = df[target_col].fillna(0).astype(int).to_numpy()
+    X = df.drop(columns=set(NON_FEATURE_COLS) | {target_col}, errors='ignore').select_dtypes(include='number')
+    X = X.to_numpy(dtype=np.float64)
+
+    masks = window_masks(games_from_end(df), windows)
+    summary = evaluate_windows(X, y, df['player_name'].to_numpy(), masks, n_folds=n_folds, n_jobs=n_jobs)
+    for w, auc in summary.items():
+        print(f"W={w} ROC AUC (val): {'NA (too few positives)' if np.isnan(auc) else f'{auc:.3f}'}")
+
+    valid = {w: auc for w, auc in summary.items() if not np.isnan(auc)}
+    if not valid:
         raise RuntimeError("No valid window produced a usable split.")
+    best_window = max(valid, key=valid.get)
+    print(f"Best window: W={best_window} with ROC AUC={valid[best_window]:.3f}")
+    if metadata_path is not None:
+        record_window_results(best_window, summary, metadata_path)
+    return best_window, df[masks[best_window]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pick the per-player history window W on held-out player folds')
+    parser.add_argument('--path', required=True)
+    parser.add_argument('--windows', type=int, nargs='+', default=[3, 5, 7, 9, 12, 15, 20, 30])
+    parser.add_argument('--target_col', default=TARGET_COL)
+    parser.add_argument('--n_folds', type=int, default=5)
+    parser.add_argument('--n_jobs', type=int, default=-1)
+    parser.add_argument('--metadata_path', default=str(METADATA_PATH))
+    args = parser.parse_args()
+
+    df = enrich_features(load_game_frame(args.path, lean=True))
+    df = df.dropna(subset=[args.target_col])
+    select_best_window(df, args.windows, args.target_col, args.n_folds, args.n_jobs, args.metadata_path)
+    print(f"Updated {args.metadata_path}")
+
 
-    print(f"Best window: W={best_window} with ROC AUC={best_auc:.3f}")
-    return best_window, best_subset
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+# WSGI entry point: gunicorn -c gunicorn.conf.py wsgi:app
+# Importing app.py only defines the factory; the app (logging, warm model) is built here.
+from app import create_app
+
+app = create_app()
@@ -578,6 +578,121 @@ describe('AddGameRecordUseCase', () => {
     });
   });
 
+  describe('ML Scoring', () => {
+    const savedRecord = {
+      record_id: 3,
+      player_id: 100,
+      player_name: 'Cole, Gerrit',
+      game_date: '2024-05-01',
+      pitch_type: 'FF',
+      release_speed: 97.1,
+      spin_rate: 2400
+    };
+    const scoreRow = { player_name: 'Cole, Gerrit', game_date: '2024-05-01', release_speed_mean_all: 97.1 };
+    let mockCsvUpdater;
+    let mockMLDataAccess;
+
+    beforeEach(() => {
+      mockCsvUpdater = {
+        toScoreRow: jest.fn().mockReturnValue(scoreRow),
+        appendRecord: jest.fn().mockResolvedValue('row'),
+        appendRecordAndRun: jest.fn()
+      };
+      mockMLDataAccess = {
+        scoreGameRows: jest.fn().mockResolvedValue([
+          { player_name: 'Cole, Gerrit', game_date: '2024-05-01', injury_risk_prob: 0.42, risk_level: 'high' }
+        ])
+      };
+      mockGameDataAccess.addGameRecord.mockResolvedValue(savedRecord);
+    });
+
+    it('should score the new game from the request instead of re-running on the CSV', async () => {
+      useCase = new AddGameRecordUseCase(mockGameDataAccess, mockOutputBoundary, mockCsvUpdater, null,
+        mockMLDataAccess, { historyPath: '/data/history.csv' });
+
+      await useCase.execute(new GameInputData(100, '2024-05-01', 'FF', 97.1, 2400));
+
+      expect(mockMLDataAccess.scoreGameRows).toHaveBeenCalledWith([scoreRow], { historyPath: '/data/history.csv' });
+      expect(mockCsvUpdater.appendRecordAndRun).not.toHaveBeenCalled();
+      await new Promise(resolve => setImmediate(resolve));
+      expect(mockCsvUpdater.appendRecord).toHaveBeenCalledWith(expect.objectContaining({ player_name: 'Cole, Gerrit' }));
+      expect(mockOutputBoundary.presentSuccess).toHaveBeenCalledWith(
+        expect.objectContaining({
+          injuryRiskData: {
+            'Cole, Gerrit': {
+              player_name: 'Cole, Gerrit',
+              injury_risk_prob: 0.42,
+              risk_level: 'high',
+              game_date: '2024-05-01'
+            }
+          }
+        })
+      );
+    });
+
+    it('should not fail the request when the CSV append fails', async () => {
+      mockCsvUpdater.appendRecord.mockRejectedValue(new Error('disk full'));
+      useCase = new AddGameRecordUseCase(mockGameDataAccess, mockOutputBoundary, mockCsvUpdater, null,
+        mockMLDataAccess);
+
+      await useCase.execute(new GameInputData(100, '2024-05-01', 'FF', 97.1, 2400));
+      await new Promise(resolve => setImmediate(resolve));
+
+      expect(mockOutputBoundary.presentSuccess).toHaveBeenCalled();
+      expect(mockOutputBoundary.presentError).not.toHaveBeenCalled();
+    });
+
+    it('should present the response before the CSV append starts', async () => {
+      let presentedFirst = null;
+      // An append that never finishes: the request must not wait for it
+      mockCsvUpdater.appendRecord.mockImplementation(() => {
+        presentedFirst = mockOutputBoundary.presentSuccess.mock.calls.length === 1;
+        return new Promise(() => {});
+      });
+      useCase = new AddGameRecordUseCase(mockGameDataAccess, mockOutputBoundary, mockCsvUpdater, null,
+        mockMLDataAccess);
+
+      await useCase.execute(new GameInputData(100, '2024-05-01', 'FF', 97.1, 2400));
+
+      expect(mockOutputBoundary.presentSuccess).toHaveBeenCalled();
+      expect(mockCsvUpdater.appendRecord).not.toHaveBeenCalled();
+      await new Promise(resolve => setImmediate(resolve));
+      expect(presentedFirst).toBe(true);
+    });
+
+    it('should write the CSV row asynchronously after the response', async () => {
+      const fs = require('fs');
+      const os = require('os');
+      const path = require('path');
+      const MLCsvUpdater = require('../../../../frameworks-drivers/data/implementations/mlCsvUpdater');
+      const csvPath = path.join(fs.mkdtempSync(path.join(os.tmpdir(), 'ml-csv-')), 'history.csv');
+      const before = 'player_name,game_date,result,total_pitches\n"Cole, Gerrit",4/20/2024,0,95';
+      fs.writeFileSync(csvPath, before);
+      const updater = new MLCsvUpdater({ localCsvPath: csvPath });
+      useCase = new AddGameRecordUseCase(mockGameDataAccess, mockOutputBoundary, updater, null,
+        mockMLDataAccess);
+
+      await useCase.execute(new GameInputData(100, '2024-05-01', 'FF', 97.1, 2400));
+
+      // A synchronous write would already be on disk here
+      expect(mockOutputBoundary.presentSuccess).toHaveBeenCalled();
+      expect(fs.readFileSync(csvPath, 'utf8')).toBe(before);
+      await new Promise(resolve => setImmediate(resolve));
+      await updater.appendQueue;
+      expect(fs.readFileSync(csvPath, 'utf8').split('\n').length).toBe(3);
+    });
+
+    it('should fall back to the CSV re-run without an ML data access', async () => {
+      mockCsvUpdater.appendRecordAndRun.mockResolvedValue([]);
+      useCase = new AddGameRecordUseCase(mockGameDataAccess, mockOutputBoundary, mockCsvUpdater);
+
+      await useCase.execute(new GameInputData(100, '2024-05-01', 'FF', 97.1, 2400));
+
+      expect(mockCsvUpdater.appendRecordAndRun).toHaveBeenCalled();
+      expect(mockMLDataAccess.scoreGameRows).not.toHaveBeenCalled();
+    });
+  });
+
   describe('Input Validation Method', () => {
     it('should throw error with validation message', () => {
       const invalidInputData = new GameInputData(
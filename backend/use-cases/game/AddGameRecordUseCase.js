@@ -2,12 +2,17 @@
 const { AddGameRecordInputBoundary } = require('./interfaces/AddGameRecordInputBoundary');
 
 class AddGameRecordUseCase extends AddGameRecordInputBoundary {
-  constructor(gameDataAccess, outputBoundary, mlCsvUpdater = null, playerDataAccess = null) {
+  // mlDataAccess (MLDataAccessHTTP) scores the new game directly; historyPath is the dataset on the
+  // ML container holding each player's previous games. Without it the CSV append + re-run path is used.
+  constructor(gameDataAccess, outputBoundary, mlCsvUpdater = null, playerDataAccess = null,
+              mlDataAccess = null, { historyPath = null } = {}) {
     super();
     this.gameDataAccess = gameDataAccess;
     this.outputBoundary = outputBoundary;
     this.mlCsvUpdater = mlCsvUpdater;
     this.playerDataAccess = playerDataAccess;
+    this.mlDataAccess = mlDataAccess;
+    this.historyPath = historyPath;
   }
 
   async execute(inputData) {
@@ -30,7 +35,7 @@ class AddGameRecordUseCase extends AddGameRecordInputBoundary {
       // Save to database
       const savedRecord = await this.gameDataAccess.addGameRecord(gameRecord);
 
-      // Optionally append to CSV and re-run ML to get updated predictions
+      // Optionally score the new game with the ML service and record it in the ML CSV
       let mlData = null;
       if (this.mlCsvUpdater) {
         try {
@@ -57,7 +62,22 @@ class AddGameRecordUseCase extends AddGameRecordInputBoundary {
             game_date: savedRecord.game_date,
             total_pitches: savedRecord.total_pitches || ''
           });
-          const results = await this.mlCsvUpdater.appendRecordAndRun(rec);
+          let results;
+          if (this.mlDataAccess) {
+            // Score the game from the request itself. The CSV (the ML history) is updated once this
+            // turn of the event loop, which presents the response, is over; the append's file I/O
+            // is asynchronous and nothing waits for it
+            results = await this.mlDataAccess.scoreGameRows([this.mlCsvUpdater.toScoreRow(rec)], {
+              historyPath: this.historyPath
+            });
+            setImmediate(() => {
+              this.mlCsvUpdater.appendRecord(rec).catch(err => {
+                console.error('ML CSV append error:', err.message);
+              });
+            });
+          } else {
+            results = await this.mlCsvUpdater.appendRecordAndRun(rec);
+          }
           // convert results (array) into player-keyed map like use-case normally produces
           mlData = {};
           (results || []).forEach(pred => {